@@ -45,12 +45,16 @@ def _build_pipeline(provider: str) -> IngestionPipeline:
         ollama_base_url=settings.OLLAMA_BASE_URL,
         ollama_model=settings.OLLAMA_EMBED_MODEL,
         ollama_batch_size=settings.OLLAMA_BATCH_SIZE,
+        ollama_max_in_flight=settings.OLLAMA_MAX_IN_FLIGHT,
+        cache_path=settings.EMBEDDING_CACHE_PATH,
+        cache_max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
         ollama_dimension=settings.VECTOR_DIMENSION,
     )
 
     vector_store = HttpVectorStore(
         base_url=settings.VECTOR_STORE_SERVICE_URL,
         provider=provider,
+        collection=settings.VECTOR_COLLECTION,
     )
 
     return IngestionPipeline(
@@ -118,6 +122,10 @@ def _background_ingest_repo(
 
         logger.debug(f"[{ingestion_id}] Total entities: {len(repo_graph.all_entities())}")
         # --- Persist Nodes & Relationships ---
+        # Nodes are upserted in place (document_ids kept), so the repo's
+        # chunks are not deleted up front: re-sent chunks merge with the
+        # stored ones in vector_store_service and only changed ones are
+        # rewritten.
         persistence = CodebaseGraphPersistence(session=session)
         nodes = repo_graph.all_entities()  # ✅ CORRECT method
         logger.debug(f"[{ingestion_id}] Sample node keys: {nodes[0].keys() if nodes else 'NO NODES'}")
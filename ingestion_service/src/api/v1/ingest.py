@@ -55,9 +55,14 @@ def _build_pipeline(provider: str) -> IngestionPipeline:
         ollama_base_url=settings.OLLAMA_BASE_URL,
         ollama_model=settings.OLLAMA_EMBED_MODEL,
         ollama_batch_size=settings.OLLAMA_BATCH_SIZE,
+        ollama_max_in_flight=settings.OLLAMA_MAX_IN_FLIGHT,
+        cache_path=settings.EMBEDDING_CACHE_PATH,
+        cache_max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
     )
     vector_store = HttpVectorStore(
-        base_url=settings.VECTOR_STORE_SERVICE_URL, provider=provider
+        base_url=settings.VECTOR_STORE_SERVICE_URL,
+        provider=provider,
+        collection=settings.VECTOR_COLLECTION,
     )
     return IngestionPipeline(
         validator=NoOpValidator(),
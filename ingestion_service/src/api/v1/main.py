@@ -1,12 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from shared.embedders.factory import aclose_embedders
 from src.api.health import router as health_router
 from src.api.v1 import router as v1_router
 from src.api.errors import register_error_handlers
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the embedders' pooled HTTP connections and cache files
+    await aclose_embedders()
+
+
 # Register handlers before routers
 app = FastAPI(title="Rag Foundry"  ,  docs_url="/docs",  # ← ADD THIS
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 register_error_handlers(app)
@@ -11,6 +11,7 @@ Requires:
 """
 
 from typing import List, Optional, Tuple
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -71,6 +72,13 @@ class CodebaseGraphPersistence:
         """
         Upsert a list of nodes (functions, classes, modules) into document_nodes.
 
+        Nodes are matched on repo_id + canonical_id: an existing node is
+        updated in place and keeps its document_id, so its vector chunks
+        (FK ON DELETE CASCADE) survive a re-ingest and the vector store can
+        merge the re-sent chunks instead of rewriting them. Nodes that are no
+        longer in the repo are deleted (cascading their chunks), and the
+        repo's relationships are cleared for upsert_relationships to rebuild.
+
         Each node dict must include:
         - relative_path: path relative to repo root
         - symbol_path: optional symbol path (for functions/methods)
@@ -79,69 +87,89 @@ class CodebaseGraphPersistence:
         - source: source file path
         - summary: optional summary
         """
+        for node in nodes:
+            self._fill_node_defaults(node)
 
-        # ----------------------
-        # MS12 Repo-Level Deletion
-        # ----------------------
         try:
-            with self._session.begin():  # atomic transaction
-                deleted_count = (
-                    self._session.query(DocumentNode)
-                    .filter(DocumentNode.repo_id == repo_id)
-                    .delete(synchronize_session=False)
+            existing = {
+                n.canonical_id: n
+                for n in self._session.query(DocumentNode).filter(
+                    DocumentNode.repo_id == repo_id
                 )
-                logger.info(f"[MS12] Repo {repo_id}: deleted {deleted_count} old document nodes")
-        except SQLAlchemyError as e:
-            logger.error(f"Failed to delete old nodes for repo {repo_id}: {e}")
-            self._session.rollback()
-            raise
+            }
 
-        # ----------------------
-        # Insert New Nodes
-        # ----------------------
-        for node in nodes:
-            try:
-                if "title" not in node:
-                    node["title"] = "Untitled"
-                if "doc_type" not in node:
-                    node["doc_type"] = "unknown"
-                if "source" not in node:
-                    node["source"] = node.get("relative_path", "unknown_source")
-                if "relative_path" not in node:
-                    node["relative_path"] = "Unknown"
-                if "canonical_id" not in node:
-                    node["canonical_id"] = build_canonical_id(node["relative_path"], node.get("symbol_path"))
+            # ----------------------
+            # MS12 Repo-Level Cleanup: nodes gone from the repo, old edges
+            # ----------------------
+            kept = {node["canonical_id"] for node in nodes}
+            removed = [n.document_id for cid, n in existing.items() if cid not in kept]
+            if removed:
+                self._session.query(DocumentNode).filter(
+                    DocumentNode.document_id.in_(removed)
+                ).delete(synchronize_session=False)
+            repo_nodes = select(DocumentNode.document_id).where(
+                DocumentNode.repo_id == repo_id
+            )
+            self._session.query(DocumentRelationship).filter(
+                DocumentRelationship.from_document_id.in_(repo_nodes)
+            ).delete(synchronize_session=False)
+            logger.info(
+                f"[MS12] Repo {repo_id}: deleted {len(removed)} old document nodes"
+            )
+
+            # ----------------------
+            # Update / Insert Nodes
+            # ----------------------
+            for node in nodes:
                 canonical_id = node["canonical_id"]
                 logger.debug(f"upsert_nodes canonical_id = {canonical_id}")
-                document_node_data = {
-                    'repo_id': repo_id,
-                    'canonical_id': canonical_id,
-                    'relative_path': node.get('relative_path', 'unknown'),
-                    'symbol_path': node.get('symbol_path'),
-                    'title': node.get('title', 'Untitled'),
-                    'summary': node.get('summary', ''),
-                    'source': node.get('source', node.get('relative_path', 'unknown')),
-                    'ingestion_id': str(node.get('ingestion_id')),
-                    'doc_type': node.get('doc_type', 'unknown'),
-                    'text': node.get('text', ''),
-                }
-                new_node = DocumentNode(**document_node_data)
-                self._session.add(new_node)
-                logger.debug(f"[MS12] Inserted DocumentNode with canonical_id : {canonical_id}")
-
-            except SQLAlchemyError as e:
-                logger.error(f"Error upserting node {node.get('canonical_id', 'unknown')}: {e}")
-                self._session.rollback()
-                raise
+                document_node_data = self._node_fields(repo_id, node)
+                current = existing.get(canonical_id)
+                if current is not None:
+                    for field, value in document_node_data.items():
+                        setattr(current, field, value)
+                    logger.debug(f"[MS12] Updated DocumentNode {canonical_id}")
+                else:
+                    self._session.add(DocumentNode(**document_node_data))
+                    logger.debug(f"[MS12] Inserted DocumentNode {canonical_id}")
 
-        # Commit all inserts
-        try:
             self._session.commit()
         except SQLAlchemyError as e:
-            logger.error(f"Error committing new nodes for repo {repo_id}: {e}")
+            logger.error(f"Error upserting nodes for repo {repo_id}: {e}")
             self._session.rollback()
             raise
 
+    @staticmethod
+    def _fill_node_defaults(node: dict) -> None:
+        if "title" not in node:
+            node["title"] = "Untitled"
+        if "doc_type" not in node:
+            node["doc_type"] = "unknown"
+        if "source" not in node:
+            node["source"] = node.get("relative_path", "unknown_source")
+        if "relative_path" not in node:
+            node["relative_path"] = "Unknown"
+        if "canonical_id" not in node:
+            node["canonical_id"] = build_canonical_id(
+                node["relative_path"], node.get("symbol_path")
+            )
+
+    @staticmethod
+    def _node_fields(repo_id: str, node: dict) -> dict:
+        """DocumentNode column values for a graph node."""
+        return {
+            'repo_id': repo_id,
+            'canonical_id': node["canonical_id"],
+            'relative_path': node.get('relative_path', 'unknown'),
+            'symbol_path': node.get('symbol_path'),
+            'title': node.get('title', 'Untitled'),
+            'summary': node.get('summary', ''),
+            'source': node.get('source', node.get('relative_path', 'unknown')),
+            'ingestion_id': str(node.get('ingestion_id')),
+            'doc_type': node.get('doc_type', 'unknown'),
+            'text': node.get('text', ''),
+        }
+
     # -----------------------------
     # Document Relationships
     # -----------------------------
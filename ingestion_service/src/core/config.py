@@ -13,7 +13,16 @@ class Settings(BaseSettings):
     # Coderag upgrade
     OLLAMA_EMBED_MODEL: str = "mxbai-embed-large:latest"
     OLLAMA_BATCH_SIZE: int = 50
+    # Embedding batches sent to Ollama concurrently
+    OLLAMA_MAX_IN_FLIGHT: int = 2
+    # Persistent embedding cache (SQLite file, keyed by model + text);
+    # None disables it. Least recently used vectors are evicted beyond the cap.
+    EMBEDDING_CACHE_PATH: str | None = None
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 500_000
     VECTOR_DIMENSION: int = 1024
+    # vector_store_service collection the embeddings go to (name, or
+    # "provider/model"); None = its default collection
+    VECTOR_COLLECTION: str | None = None
 
     # Universal feature
     DOCLING_ENABLED: bool = True   # When False → PyMuPDF fallback for PDF
@@ -76,6 +76,8 @@ def get_chunk_texts_by_ingestion_id(ingestion_id: str) -> List[str]:
     """
     Return all chunk texts for a given ingestion_id.
     Used by llm_service summarization — no vector math involved.
+    Reads vector_chunks (VectorChunk), which holds every chunk since the
+    legacy vectors table was retired.
 
     ADR compliance: ingestion_db is owned exclusively by ingestion_service.
     llm_service calls GET /v1/chunks/{ingestion_id} which calls this function.
@@ -87,6 +89,7 @@ def get_chunk_texts_by_ingestion_id(ingestion_id: str) -> List[str]:
         rows = (
             session.query(VectorChunk.chunk_text)
             .filter(VectorChunk.ingestion_id == ingestion_id)
+            .order_by(VectorChunk.id)
             .all()
         )
         texts = [row.chunk_text for row in rows]
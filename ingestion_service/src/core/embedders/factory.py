@@ -29,6 +29,7 @@ def get_embedder(provider: str | None = None):
             base_url=settings.OLLAMA_BASE_URL,
             model=settings.OLLAMA_EMBED_MODEL,
             batch_size=settings.OLLAMA_BATCH_SIZE,
+            max_in_flight=settings.OLLAMA_MAX_IN_FLIGHT,
         )
     elif provider_str == "mock":  # ← EXPLICIT
         return MockEmbedder()
@@ -1,30 +1,5 @@
-from __future__ import annotations
-from typing import List
+# ingestion_service/src/core/embedders/mock.py
+"""Kept for existing imports: the mock embedder lives in shared.embedders.mock."""
+from shared.embedders.mock import MockEmbedder
 
-from shared.chunks import Chunk
-from shared.embedders.base import BaseEmbedder
-
-
-class MockEmbedder(BaseEmbedder):
-    """
-    Deterministic embedder for tests.
-    Produces stable vectors based on chunk content length.
-    """
-
-    name = "mock"
-    dimension = 1024
-
-    def embed(self, chunks: List[Chunk]) -> List[List[float]]:
-        embeddings: List[List[float]] = []
-
-        for chunk in chunks:
-            length = len(str(chunk.content))
-            embeddings.append(
-                [
-                    float(length),
-                    float(length % 10),
-                    1.0,
-                ]
-            )
-
-        return embeddings
+__all__ = ["MockEmbedder"]
@@ -1,6 +1,6 @@
 # ingestion_service/src/core/http_vectorstore.py
 import requests
-from typing import List, Any
+from typing import List, Any, Optional
 import logging
 
 from shared.chunks import Chunk
@@ -8,13 +8,18 @@ from shared.chunks import Chunk
 logger = logging.getLogger(__name__)
 
 class HttpVectorStore:
-    def __init__(self, base_url: str, provider: str = "ollama"):
+    def __init__(
+        self, base_url: str, provider: str = "ollama", collection: Optional[str] = None
+    ):
         """
         :param base_url: Base URL of vector_store_service API
         :param provider: Embedding provider name
+        :param collection: Vector collection (name or "provider/model") matching
+            the embedder; None = the service's default collection
         """
         self.base_url = base_url.rstrip("/")
         self.provider = provider
+        self.collection = collection
         logger.debug("ttpVectorStore init")
 
     def persist(
@@ -25,7 +30,8 @@ class HttpVectorStore:
         document_id: str = None,  # MS6-IS1: NEW - Link to DocumentNode
     ) -> None:
         """
-        Dual-write: legacy vectors + new vector_chunks (MS6).
+        Persist chunks via vector_store_service (vector_chunks; the legacy
+        vectors table too when it runs with VECTOR_WRITE_MODE=dual).
         """
         logger.debug("HttpVectorStore persist")
         records = []
@@ -58,10 +64,16 @@ class HttpVectorStore:
         self.add_vectors(records)
         logger.info(f"Persisted {len(records)} vectors for ingestion {ingestion_id}  with document_id  {document_id}")
 
+    @property
+    def _params(self) -> dict:
+        return {"collection": self.collection} if self.collection else {}
+
     def add_vectors(self, records: List[dict]):
         """Send a batch of vectors to vector_store_service."""
         url = f"{self.base_url}/v1/vectors/batch"
-        resp = requests.post(url, json={"records": records},  timeout=90)
+        resp = requests.post(
+            url, json={"records": records}, params=self._params, timeout=90
+        )
         resp.raise_for_status()
         return resp.json()
 
@@ -69,7 +81,10 @@ class HttpVectorStore:
         """Search the vector store for top-k similar vectors."""
         url = f"{self.base_url}/v1/vectors/search"
         resp = requests.post(
-            url, json={"query_vector": query_vector, "k": k},  timeout=90
+            url,
+            json={"query_vector": query_vector, "k": k},
+            params=self._params,
+            timeout=90,
         )
         resp.raise_for_status()
         return resp.json()
@@ -77,6 +92,16 @@ class HttpVectorStore:
     def delete_by_ingestion_id(self, ingestion_id: str):
         """Delete all vectors for an ingestion_id."""
         url = f"{self.base_url}/v1/vectors/by-ingestion/{ingestion_id}"
-        resp = requests.delete(url,  timeout=90)
+        resp = requests.delete(url, params=self._params, timeout=90)
         resp.raise_for_status()
         return resp.status_code == 200
+
+    def delete_by_repo_id(self, repo_id: str):
+        """
+        Delete all vector chunks for a repository (partition drop when
+        partitioned).
+        """
+        url = f"{self.base_url}/v1/vectors/by-repo/{repo_id}"
+        resp = requests.delete(url, params=self._params, timeout=90)
+        resp.raise_for_status()
+        return resp.json()
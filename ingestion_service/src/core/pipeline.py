@@ -96,6 +96,10 @@ class IngestionPipeline:
             relative_path=relative_path,              # ADD
             canonical_id=canonical_id,                # ADD
         )
+        for chunk in chunks:
+            # Same namespace as the DocumentNode, so both store backends key
+            # a re-sent chunk on (repo_id, canonical_id, chunk_index)
+            chunk.metadata["repo_id"] = str(ingestion_id)
         embeddings = self._embed(chunks)
         logger.debug(f"📦 MS6 run() Persisting {len(chunks)} chunks with document_id={document_id}")
         self._persist(chunks, embeddings, ingestion_id, str(document_id))
@@ -152,6 +156,7 @@ class IngestionPipeline:
             chunk.metadata.setdefault("provider", "unknown")
             chunk.metadata.setdefault("relative_path", relative_path)      # ADD
             chunk.metadata.setdefault("canonical_id", canonical_id)        # ADD
+            chunk.metadata.setdefault("repo_id", str(ingestion_id))
             chunk.metadata.setdefault("chunk_strategy", 
             chunk.metadata.get("chunk_strategy", "unknown"))
         
@@ -356,9 +361,10 @@ class IngestionPipeline:
                     "source_type": "file",
                     "doc_type": artifact.get("doc_type", doc_type),
                     "canonical_id": artifact["id"],
+                    "repo_id": str(ingestion_id),
                     "relative_path": filename,
                     "artifact_type": artifact.get("artifact_type", ""),
-                    "provider": self._embedder.__class__.__name__,
+                    "provider": self._embedder.provider_name,
                 }
             )
             chunks_to_embed.append(chunk)
@@ -0,0 +1,46 @@
+# ingestion_service/tests/core/embedders/test_embedder_factory.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from shared.embedders import factory
+from shared.embedders.cache import CachedEmbedder
+
+
+@pytest.fixture(autouse=True)
+def _fresh_embedders():
+    factory.close_embedders()
+    yield
+    factory.close_embedders()
+
+
+def _ollama(model="m"):
+    return factory.get_embedder(
+        provider="ollama", ollama_base_url="http://ollama:11434", ollama_model=model
+    )
+
+
+def test_one_instance_per_configuration_across_threads():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        embedders = list(pool.map(lambda _: _ollama(), range(32)))
+
+    assert all(e is embedders[0] for e in embedders)
+    assert _ollama("other") is not embedders[0]
+    embedder = factory.get_embedder(provider="mock")
+    assert factory.get_embedder(provider="mock") is embedder
+
+
+def test_close_embedders_releases_clients(tmp_path):
+    embedder = _ollama()
+    cached = factory.get_embedder(
+        provider="mock", cache_path=str(tmp_path / "e.sqlite")
+    )
+    assert isinstance(cached, CachedEmbedder)
+
+    with patch.object(embedder._session, "close") as close:
+        asyncio.run(factory.aclose_embedders())
+    close.assert_called_once()
+
+    assert _ollama() is not embedder
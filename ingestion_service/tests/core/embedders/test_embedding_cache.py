@@ -0,0 +1,80 @@
+# ingestion_service/tests/core/embedders/test_embedding_cache.py
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from shared.chunks import Chunk
+from shared.embedders.cache import CachedEmbedder, EmbeddingCache
+from shared.embedders.mock import MockEmbedder
+
+
+def _chunks(*texts):
+    return [
+        Chunk(chunk_id=f"c{i}", content=t, metadata={}) for i, t in enumerate(texts)
+    ]
+
+
+def test_cached_embedder_only_embeds_misses_and_persists(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite")
+    inner = MockEmbedder(dimension=4)
+    embedder = CachedEmbedder(inner, EmbeddingCache(path))
+
+    with patch.object(inner, "embed", wraps=inner.embed) as embed:
+        first = embedder.embed(_chunks("a", "bb", "a"))
+        assert embed.call_args.args[0][0].content == "a"
+        assert len(embed.call_args.args[0]) == 2          # duplicate embedded once
+        second = embedder.embed(_chunks("bb", "ccc"))
+        assert [c.content for c in embed.call_args.args[0]] == ["ccc"]
+
+    assert first == inner.embed(_chunks("a", "bb", "a"))
+    assert second == inner.embed(_chunks("bb", "ccc"))
+    assert embedder.dimension == 4 and embedder.provider_name == "MockEmbedder"
+    embedder.close()
+
+    # Survives a restart; a different model does not share entries
+    reopened = EmbeddingCache(path)
+    keys = [EmbeddingCache.key(inner.model_id, t) for t in ("a", "bb", "ccc")]
+    assert len(reopened.get_many(keys)) == 3
+    assert reopened.get_many([EmbeddingCache.key("mock/mock/8", "a")]) == {}
+    assert reopened.stats()["hit_ratio"] == 0.75
+
+
+def test_cached_embedder_aembed_awaits_misses_only(tmp_path):
+    inner = MockEmbedder(dimension=4)
+    embedder = CachedEmbedder(inner, EmbeddingCache(str(tmp_path / "e.sqlite")))
+    embedder.embed(_chunks("a"))
+
+    with patch.object(inner, "aembed", wraps=inner.aembed) as aembed:
+        vectors = asyncio.run(embedder.aembed(_chunks("a", "bb")))
+
+    assert [c.content for c in aembed.call_args.args[0]] == ["bb"]
+    assert vectors == inner.embed(_chunks("a", "bb"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "e.sqlite"), max_entries=2)
+    with patch("shared.embedders.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+        cache.put_many({"a": [1.0]})
+        cache.put_many({"b": [2.0]})
+        cache.get_many(["a"])                             # a is now newer than b
+        cache.put_many({"c": [3.0]})
+
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+
+
+def test_cache_counts_entries_without_scanning_and_evicts_in_batches(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "e.sqlite"), max_entries=200)
+    cache.put_many({f"k{i}": [float(i)] for i in range(200)})
+    conn = cache._conn
+    cache._conn = MagicMock(wraps=conn)
+
+    cache.put_many({f"k{i}": [0.0] for i in range(10)})       # replaced, not new
+    statements = [c.args[0] for c in cache._conn.execute.call_args_list]
+    assert "SELECT count(*) FROM embeddings" not in statements
+    assert cache.stats()["evictions"] == 0
+
+    cache.put_many({"new": [1.0]})                            # over the limit
+    stats = cache.stats()
+    # evicted down to 1% below max_entries in one go
+    assert (stats["entries"], stats["evictions"]) == (198, 3)
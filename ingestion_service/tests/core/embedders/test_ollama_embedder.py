@@ -0,0 +1,160 @@
+# ingestion_service/tests/core/embedders/test_ollama_embedder.py
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from shared.chunks import Chunk
+from shared.embedders.ollama import OllamaEmbedder
+from shared.embedders.query import aembed_query
+
+
+def _chunks(n):
+    return [Chunk(chunk_id=f"c{i}", content=str(i), metadata={}) for i in range(n)]
+
+
+def _embedder(batch_size, max_in_flight):
+    embedder = OllamaEmbedder(
+        base_url="http://ollama:11434/", model="m",
+        batch_size=batch_size, max_in_flight=max_in_flight,
+    )
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def post(url, json, timeout):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        # Earlier batches answer last, so completion order != input order
+        time.sleep(0.02 / (1 + int(json["input"][0])))
+        with lock:
+            in_flight["now"] -= 1
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"embeddings": [[float(t)] for t in json["input"]]}
+        return response
+
+    embedder._session = MagicMock()
+    embedder._session.post.side_effect = post
+    return embedder, in_flight
+
+
+def test_embed_batches_concurrently_and_keeps_order():
+    embedder, in_flight = _embedder(batch_size=3, max_in_flight=3)
+
+    vectors = embedder.embed(_chunks(10))
+
+    assert vectors == [[float(i)] for i in range(10)]
+    assert embedder._session.post.call_count == 4
+    posted = embedder._session.post.call_args_list
+    assert [len(c.kwargs["json"]["input"]) for c in posted] == [3, 3, 3, 1]
+    assert in_flight["max"] > 1
+    assert embedder._session.post.call_args.args[0] == "http://ollama:11434/api/embed"
+    stats = embedder.stats()
+    assert (stats["texts"], stats["batches"]) == (10, 4)
+    assert stats["texts_per_second"] > 0
+
+
+def test_embed_single_flight_and_errors():
+    embedder, in_flight = _embedder(batch_size=2, max_in_flight=1)
+    assert embedder.embed(_chunks(5)) == [[float(i)] for i in range(5)]
+    assert in_flight["max"] == 1
+    assert embedder.embed([]) == []
+
+    embedder._session.post.side_effect = None
+    embedder._session.post.return_value = MagicMock(status_code=500, text="boom")
+    with pytest.raises(RuntimeError, match="status=500"):
+        embedder.embed(_chunks(1))
+
+
+def test_aembed_gathers_batches_in_order():
+    embedder = OllamaEmbedder(
+        base_url="http://ollama:11434", model="m", batch_size=2, max_in_flight=2
+    )
+    posted = []
+
+    async def post(url, json):
+        posted.append(json["input"])
+        await asyncio.sleep(0.01 / (1 + int(json["input"][0])))
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"embeddings": [[float(t)] for t in json["input"]]}
+        return response
+
+    client = MagicMock()
+    client.post.side_effect = post
+    client.aclose = AsyncMock()
+
+    async def run():
+        embedder._async_clients[asyncio.get_running_loop()] = client
+        vectors = await embedder.aembed(_chunks(5))
+        query_vector = await aembed_query("7", embedder)
+        await embedder.aclose()
+        return vectors, query_vector
+
+    vectors, query_vector = asyncio.run(run())
+
+    assert vectors == [[float(i)] for i in range(5)]
+    assert query_vector == [7.0]
+    assert sorted(posted) == [["0", "1"], ["2", "3"], ["4"], ["7"]]
+    client.aclose.assert_awaited_once()
+    assert len(embedder._async_clients) == 0
+
+
+def _ok_response(texts):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"embeddings": [[float(t)] for t in texts]}
+    return response
+
+
+def test_aembed_uses_one_client_per_event_loop(monkeypatch):
+    import httpx
+
+    clients = []
+
+    def client_factory(**kwargs):
+        client = MagicMock()
+        client.post = AsyncMock(
+            side_effect=lambda url, json: _ok_response(json["input"])
+        )
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+    embedder = OllamaEmbedder(base_url="http://ollama:11434", model="m")
+
+    # e.g. a worker thread's asyncio.run() after the app's loop
+    assert asyncio.run(embedder.aembed(_chunks(1))) == [[0.0]]
+    assert asyncio.run(embedder.aembed(_chunks(1))) == [[0.0]]
+
+    assert len(clients) == 2
+    assert [c.post.await_count for c in clients] == [1, 1]
+
+
+def test_aembed_cancels_other_batches_when_one_fails():
+    embedder = OllamaEmbedder(
+        base_url="http://ollama:11434", model="m", batch_size=1, max_in_flight=3
+    )
+    cancelled = []
+
+    async def post(url, json):
+        if json["input"] == ["0"]:
+            raise ConnectionError("ollama down")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(json["input"][0])
+            raise
+        return _ok_response(json["input"])
+
+    client = MagicMock()
+    client.post.side_effect = post
+
+    async def run():
+        embedder._async_clients[asyncio.get_running_loop()] = client
+        with pytest.raises(RuntimeError, match="ollama down"):
+            await embedder.aembed(_chunks(3))
+        # stopped before aembed() returned, not left for the loop's shutdown
+        assert sorted(cancelled) == ["1", "2"]
+
+    asyncio.run(run())
@@ -0,0 +1,71 @@
+# ingestion_service/tests/core/embedders/test_query_embedding_cache.py
+import asyncio
+import pytest
+
+from shared.embedders.mock import MockEmbedder
+from shared.embedders.query_cache import QueryEmbeddingCache
+
+
+class CountingEmbedder(MockEmbedder):
+    def __init__(self, delay=0.0):
+        super().__init__(dimension=3)
+        self.delay = delay
+        self.calls = 0
+
+    async def aembed(self, chunks):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.embed(chunks)
+
+
+def test_concurrent_identical_queries_embed_once():
+    cache = QueryEmbeddingCache()
+    embedder = CountingEmbedder(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            cache.aembed_query("what is  RAG?", embedder),
+            cache.aembed_query(" what is RAG? ", embedder),
+            cache.aembed_query("what is RAG?", embedder),
+        )
+
+    vectors = asyncio.run(run())
+    assert embedder.calls == 1
+    # the first caller's text is embedded as sent (13 chars, not normalised)
+    assert vectors[0] == vectors[1] == vectors[2] == [13.0, 3.0, 1.0]
+
+    assert asyncio.run(cache.aembed_query("what is RAG?", embedder)) == vectors[0]
+    stats = cache.stats()
+    # waiters on the in-flight call are coalesced, not misses
+    assert (stats["hits"], stats["misses"], stats["coalesced"]) == (1, 1, 2)
+    assert stats["hit_ratio"] == 0.25
+
+
+def test_lru_ttl_model_key_and_errors():
+    cache = QueryEmbeddingCache(max_entries=1, ttl_seconds=60.0)
+    embedder = CountingEmbedder()
+
+    async def run():
+        await cache.aembed_query("a", embedder)
+        await cache.aembed_query("a", MockEmbedder(dimension=4))    # other model
+        await cache.aembed_query("a", embedder)                      # evicted
+        assert embedder.calls == 2
+        await cache.aembed_query("a", embedder)                      # cached
+        assert embedder.calls == 2
+
+        cache.ttl_seconds = 0.0
+        await cache.aembed_query("b", embedder)
+        await cache.aembed_query("b", embedder)                      # expired
+        assert embedder.calls == 4
+
+    asyncio.run(run())
+
+    async def fail(chunks):
+        raise RuntimeError("ollama down")
+
+    embedder.aembed = fail
+    with pytest.raises(RuntimeError, match="ollama down"):
+        asyncio.run(cache.aembed_query("c", embedder))
+    assert cache._inflight == {}
+    assert cache.stats()["evictions"] == 3
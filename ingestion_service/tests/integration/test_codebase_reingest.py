@@ -0,0 +1,73 @@
+# ingestion_service/tests/integration/test_codebase_reingest.py
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from src.api.v1.codebase_ingest import _background_ingest_repo
+from src.core.codebase.identity import build_repo_id
+from src.core.status_manager import StatusManager
+
+MODULE = '''
+def add(a, b):
+    """Add two numbers."""
+    return a + b
+
+
+class Greeter:
+    def greet(self, name):
+        return f"hello {name}"
+'''
+
+CHUNKS_SQL = text("""
+    SELECT id, document_id, content_hash
+    FROM ingestion_service.vector_chunks
+    WHERE repo_id = CAST(:repo_id AS uuid)
+    ORDER BY id
+""")
+
+
+def _ingest(session, repo_path):
+    ingestion_id = uuid.uuid4()
+    StatusManager(session).create_request(
+        ingestion_id=ingestion_id,
+        source_type="repo",
+        metadata={"git_url": None, "local_path": str(repo_path), "provider": None},
+    )
+    _background_ingest_repo(
+        ingestion_id=ingestion_id,
+        git_url=None,
+        local_path=str(repo_path),
+        provider=None,
+    )
+    return ingestion_id
+
+
+@pytest.mark.integration
+def test_reingesting_an_unchanged_repo_keeps_its_chunks(session, tmp_path):
+    """
+    Re-ingesting a repo through the real path (graph → document_nodes upsert
+    → chunk → embed → vector_store_service) must merge with the stored
+    chunks, not delete and rewrite them.
+
+    Uses real Postgres, Ollama and vector_store_service (Docker).
+    """
+    (tmp_path / "mod.py").write_text(MODULE)
+    repo_id = build_repo_id(str(tmp_path.resolve()))
+
+    _ingest(session, tmp_path)
+    first = session.execute(CHUNKS_SQL, {"repo_id": repo_id}).fetchall()
+    assert first
+
+    second_ingestion = _ingest(session, tmp_path)
+    second = session.execute(CHUNKS_SQL, {"repo_id": repo_id}).fetchall()
+
+    # Same rows (ids, document nodes, content), re-pointed at the new ingestion
+    assert len(second) == len(first)
+    assert second == first
+    ingestions = session.execute(text("""
+        SELECT DISTINCT ingestion_id
+        FROM ingestion_service.vector_chunks
+        WHERE repo_id = CAST(:repo_id AS uuid)
+    """), {"repo_id": repo_id}).scalars().all()
+    assert ingestions == [str(second_ingestion)]
@@ -0,0 +1,34 @@
+"""Recreate the ANN index on vector_chunks.vector (HNSW, cosine)
+
+20260301_vector_dim dropped the vector indexes to change the column type
+and never recreated them, so every similarity_search was a sequential scan.
+This restores a cosine HNSW index matching the <=> operator used by
+PgVectorStore. IVFFlat is not created here (it needs data to train its
+lists); build it on demand through POST /v1/vectors/admin/indexes.
+
+Revision ID: 20260310_ann_idx
+Revises: 20260301_vector_dim
+Create Date: 2026-03-10
+"""
+from alembic import op
+
+revision = "20260310_ann_idx"
+down_revision = "20260301_vector_dim"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS vector_chunks_vector_hnsw_idx
+        ON ingestion_service.vector_chunks
+        USING hnsw (vector vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP INDEX IF EXISTS ingestion_service.vector_chunks_vector_ivfflat_idx"
+    )
+    op.execute("DROP INDEX IF EXISTS ingestion_service.vector_chunks_vector_hnsw_idx")
@@ -0,0 +1,73 @@
+"""Promote repo_id / doc_type / source_type to indexed vector_chunks columns
+
+Searches filtered on source_metadata->>'doc_type' could not use an index and
+ran across every repository. doc_type and source_type become STORED
+generated columns over source_metadata (filled for existing rows by the
+ALTER itself); repo_id is a plain column written by PgVectorStore and
+backfilled here from source_metadata, falling back to the owning
+document node.
+
+Revision ID: 20260320_scope_cols
+Revises: 20260310_ann_idx
+Create Date: 2026-03-20
+"""
+from alembic import op
+
+revision = "20260320_scope_cols"
+down_revision = "20260310_ann_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD COLUMN IF NOT EXISTS repo_id UUID,
+        ADD COLUMN IF NOT EXISTS doc_type TEXT
+            GENERATED ALWAYS AS (source_metadata->>'doc_type') STORED,
+        ADD COLUMN IF NOT EXISTS source_type TEXT
+            GENERATED ALWAYS AS (source_metadata->>'source_type') STORED
+    """)
+
+    # Backfill repo_id: source_metadata (code ingestion) when it holds a UUID,
+    # otherwise the document node's repo_id.
+    op.execute("""
+        UPDATE ingestion_service.vector_chunks vc
+        SET repo_id = COALESCE(
+            CASE
+                WHEN vc.source_metadata->>'repo_id'
+                     ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+                THEN (vc.source_metadata->>'repo_id')::uuid
+            END,
+            dn.repo_id
+        )
+        FROM ingestion_service.document_nodes dn
+        WHERE dn.document_id = vc.document_id
+          AND vc.repo_id IS NULL
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_repo_doc_type
+        ON ingestion_service.vector_chunks (repo_id, doc_type)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_source_type
+        ON ingestion_service.vector_chunks (source_type)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_ingestion_id
+        ON ingestion_service.vector_chunks (ingestion_id)
+    """)
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_ingestion_id")
+    op.execute("DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_source_type")
+    op.execute("DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_repo_doc_type")
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        DROP COLUMN IF EXISTS source_type,
+        DROP COLUMN IF EXISTS doc_type,
+        DROP COLUMN IF EXISTS repo_id
+    """)
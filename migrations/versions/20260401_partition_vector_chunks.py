@@ -0,0 +1,184 @@
+"""Optional: LIST-partition vector_chunks by repo_id
+
+Opt-in layout for large deployments. With one partition per repository,
+re-ingesting or removing a repo drops a partition instead of DELETEing (and
+later vacuuming) its rows, and ANN indexes are built per partition.
+Rows without a repo_id go to vector_chunks_default.
+
+The conversion only runs when requested:
+
+    alembic -x partition_vector_chunks=true upgrade head
+    # or VECTOR_CHUNKS_PARTITIONED=true in the environment
+
+and the vector store must then run with VECTOR_CHUNKS_PARTITIONED=true.
+Without the flag this revision is a no-op; to convert later, downgrade to
+20260320_scope_cols and upgrade again with the flag. The table is copied
+under an exclusive lock, so run it in a maintenance window.
+
+Revision ID: 20260401_partition_chunks
+Revises: 20260320_scope_cols
+Create Date: 2026-04-01
+"""
+import os
+
+from alembic import context, op
+from sqlalchemy import text
+
+revision = "20260401_partition_chunks"
+down_revision = "20260320_scope_cols"
+branch_labels = None
+depends_on = None
+
+# Columns copied between layouts (doc_type / source_type are generated).
+COLUMNS = """
+    id, vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+    chunk_text, source_metadata, provider, document_id, repo_id
+"""
+
+
+def _requested() -> bool:
+    flag = (
+        context.get_x_argument(as_dictionary=True).get("partition_vector_chunks")
+        or os.environ.get("VECTOR_CHUNKS_PARTITIONED", "")
+    )
+    return flag.lower() in ("1", "true", "yes")
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().scalar(text("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'ingestion_service' AND c.relname = 'vector_chunks'
+    """)))
+
+
+def _create_indexes() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_repo_doc_type
+        ON ingestion_service.vector_chunks (repo_id, doc_type)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_source_type
+        ON ingestion_service.vector_chunks (source_type)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_ingestion_id
+        ON ingestion_service.vector_chunks (ingestion_id)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS vector_chunks_vector_hnsw_idx
+        ON ingestion_service.vector_chunks
+        USING hnsw (vector vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def _drop_indexes() -> None:
+    # Index names are per schema; free them for the replacement table.
+    for index in (
+        "vector_chunks_vector_hnsw_idx",
+        "vector_chunks_vector_ivfflat_idx",
+        "ix_vector_chunks_repo_doc_type",
+        "ix_vector_chunks_source_type",
+        "ix_vector_chunks_ingestion_id",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS ingestion_service.{index}")
+
+
+def upgrade() -> None:
+    if not _requested() or _is_partitioned():
+        return
+
+    _drop_indexes()
+    op.execute(
+        "ALTER TABLE ingestion_service.vector_chunks"
+        " RENAME TO vector_chunks_unpartitioned"
+    )
+
+    # LIKE keeps column types (vector dimension), the id sequence default
+    # and the generated columns.
+    op.execute("""
+        CREATE TABLE ingestion_service.vector_chunks (
+            LIKE ingestion_service.vector_chunks_unpartitioned
+            INCLUDING DEFAULTS INCLUDING GENERATED
+        ) PARTITION BY LIST (repo_id)
+    """)
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD FOREIGN KEY (document_id)
+            REFERENCES ingestion_service.document_nodes(document_id)
+            ON DELETE CASCADE
+    """)
+    op.execute("""
+        CREATE TABLE ingestion_service.vector_chunks_default
+        PARTITION OF ingestion_service.vector_chunks DEFAULT
+    """)
+    # Same naming as PgVectorQueries._partition_name
+    op.execute("""
+        DO $$
+        DECLARE r uuid;
+        BEGIN
+            FOR r IN
+                SELECT DISTINCT repo_id
+                FROM ingestion_service.vector_chunks_unpartitioned
+                WHERE repo_id IS NOT NULL
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE ingestion_service.%I '
+                    'PARTITION OF ingestion_service.vector_chunks FOR VALUES IN (%L)',
+                    'vector_chunks_r_' || replace(r::text, '-', ''), r
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO ingestion_service.vector_chunks ({COLUMNS})
+        SELECT {COLUMNS} FROM ingestion_service.vector_chunks_unpartitioned
+    """)
+    op.execute("""
+        ALTER SEQUENCE ingestion_service.vector_chunks_id_seq
+        OWNED BY ingestion_service.vector_chunks.id
+    """)
+    op.execute("DROP TABLE ingestion_service.vector_chunks_unpartitioned")
+
+    # Created on the parent, so every partition (present and future) gets one.
+    _create_indexes()
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    if not _is_partitioned():
+        return
+
+    _drop_indexes()
+    op.execute(
+        "ALTER TABLE ingestion_service.vector_chunks"
+        " RENAME TO vector_chunks_partitioned"
+    )
+    op.execute("""
+        CREATE TABLE ingestion_service.vector_chunks (
+            LIKE ingestion_service.vector_chunks_partitioned
+            INCLUDING DEFAULTS INCLUDING GENERATED
+        )
+    """)
+    op.execute("ALTER TABLE ingestion_service.vector_chunks ADD PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD FOREIGN KEY (document_id)
+            REFERENCES ingestion_service.document_nodes(document_id)
+            ON DELETE CASCADE
+    """)
+    op.execute(f"""
+        INSERT INTO ingestion_service.vector_chunks ({COLUMNS})
+        SELECT {COLUMNS} FROM ingestion_service.vector_chunks_partitioned
+    """)
+    op.execute("""
+        ALTER SEQUENCE ingestion_service.vector_chunks_id_seq
+        OWNED BY ingestion_service.vector_chunks.id
+    """)
+    op.execute("DROP TABLE ingestion_service.vector_chunks_partitioned CASCADE")
+
+    _create_indexes()
+    op.execute("ANALYZE ingestion_service.vector_chunks")
@@ -0,0 +1,99 @@
+"""Retire the legacy vectors table; vector_chunks becomes the only store
+
+Until now every record was written twice: to vectors (all chunks) and to
+vector_chunks (chunks linked to a document node). The vector store now runs
+with VECTOR_WRITE_MODE=chunks_only, writing every record to vector_chunks
+(document_id NULL when there is no node), and /v1/chunks reads
+vector_chunks too.
+
+Upgrade backfills the vectors rows that never reached vector_chunks (no
+document node), with repo_id taken from source_metadata when it holds a
+UUID. On the partitioned layout the missing repo partitions are created
+first so backfilled rows do not land in vector_chunks_default. vectors
+itself is kept; migration 20260610_drop_vectors drops it once every row
+is accounted for in vector_chunks. Downgrade leaves the backfilled rows
+in place (dual mode writes them to vector_chunks as well).
+
+Revision ID: 20260410_retire_vectors
+Revises: 20260401_partition_chunks
+Create Date: 2026-04-10
+"""
+from alembic import op
+from sqlalchemy import text
+
+revision = "20260410_retire_vectors"
+down_revision = "20260401_partition_chunks"
+branch_labels = None
+depends_on = None
+
+COLUMNS = """
+    vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+    chunk_text, source_metadata, provider
+"""
+
+# Same rule as migration 20260320_scope_cols / PgVectorQueries._metadata_repo_id
+METADATA_REPO_ID = """
+    CASE
+        WHEN v.source_metadata->>'repo_id'
+             ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        THEN (v.source_metadata->>'repo_id')::uuid
+    END
+"""
+
+# vectors rows with no vector_chunks counterpart
+MISSING_ROWS = """
+    FROM ingestion_service.vectors v
+    WHERE NOT EXISTS (
+        SELECT 1 FROM ingestion_service.vector_chunks vc
+        WHERE vc.ingestion_id = v.ingestion_id
+          AND vc.chunk_id = v.chunk_id
+    )
+"""
+
+
+def _table_exists(name: str) -> bool:
+    return bool(op.get_bind().scalar(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": f"ingestion_service.{name}"},
+    ))
+
+
+def upgrade() -> None:
+    if not _table_exists("vectors"):
+        return
+
+    # Partitioned layout: one partition per backfilled repo (naming as in
+    # PgVectorQueries._partition_name). No-op on a plain table.
+    op.execute(f"""
+        DO $$
+        DECLARE r uuid;
+        BEGIN
+            IF (SELECT c.relkind FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'ingestion_service'
+                  AND c.relname = 'vector_chunks') <> 'p' THEN
+                RETURN;
+            END IF;
+            FOR r IN
+                SELECT DISTINCT {METADATA_REPO_ID} AS repo_id {MISSING_ROWS}
+            LOOP
+                CONTINUE WHEN r IS NULL;
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS ingestion_service.%I '
+                    'PARTITION OF ingestion_service.vector_chunks FOR VALUES IN (%L)',
+                    'vector_chunks_r_' || replace(r::text, '-', ''), r
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO ingestion_service.vector_chunks ({COLUMNS}, repo_id)
+        SELECT {COLUMNS}, {METADATA_REPO_ID}
+        {MISSING_ROWS}
+    """)
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    pass
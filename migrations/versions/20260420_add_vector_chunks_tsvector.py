@@ -0,0 +1,39 @@
+"""Add a generated chunk_tsv tsvector column (GIN-indexed) to vector_chunks
+
+Backs lexical and hybrid (vector + full-text, RRF-fused) search in the
+vector store. The 'simple' config does no stemming or stop-word removal,
+so identifiers are indexed as written; it must match
+PgVectorQueries.TEXT_SEARCH_CONFIG. Adding a STORED column rewrites the
+table, so run it in a maintenance window on large deployments.
+
+Revision ID: 20260420_chunk_tsv
+Revises: 20260410_retire_vectors
+Create Date: 2026-04-20
+"""
+from alembic import op
+
+revision = "20260420_chunk_tsv"
+down_revision = "20260410_retire_vectors"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD COLUMN IF NOT EXISTS chunk_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, chunk_text)) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_chunk_tsv
+        ON ingestion_service.vector_chunks USING gin (chunk_tsv)
+    """)
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_chunk_tsv")
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        DROP COLUMN IF EXISTS chunk_tsv
+    """)
@@ -0,0 +1,40 @@
+"""Index vector_chunks.source_metadata for filtered search
+
+FilterCompiler turns metadata equality / in / exists filters into jsonb
+containment (@>) and key-existence (?) tests, which a GIN index on
+source_metadata serves; relative_path prefix filters (LIKE 'dir/%') use a
+text_pattern_ops expression index. They are built without CONCURRENTLY so
+they stay inside the migration transaction; on large deployments create
+them by hand with CREATE INDEX CONCURRENTLY first (IF NOT EXISTS then
+skips them here).
+
+Revision ID: 20260501_metadata_gin
+Revises: 20260420_chunk_tsv
+Create Date: 2026-05-01
+"""
+from alembic import op
+
+revision = "20260501_metadata_gin"
+down_revision = "20260420_chunk_tsv"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_source_metadata
+        ON ingestion_service.vector_chunks USING gin (source_metadata jsonb_ops)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_vector_chunks_relative_path
+        ON ingestion_service.vector_chunks
+        ((source_metadata->>'relative_path') text_pattern_ops)
+    """)
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_relative_path")
+    op.execute(
+        "DROP INDEX IF EXISTS ingestion_service.ix_vector_chunks_source_metadata"
+    )
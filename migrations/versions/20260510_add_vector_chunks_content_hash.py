@@ -0,0 +1,76 @@
+"""Add vector_chunks.content_hash and a unique chunk key for idempotent writes
+
+The vector store now merges each write on (document_id, chunk_index,
+content_hash): re-sending a chunk is a no-op and changed content replaces
+the row at its position, instead of every re-ingest appending a new copy.
+content_hash is the sha256 hex of chunk_text (shared.models.vector.content_hash),
+backfilled here. Exact duplicates already in the table are removed (the
+newest row is kept) so the key can be created. A partitioned table's
+unique key must include the partition column, so it also carries repo_id
+there; PgVectorQueries._content_key builds the matching ON CONFLICT target.
+
+Revision ID: 20260510_chunk_content_hash
+Revises: 20260501_metadata_gin
+Create Date: 2026-05-10
+"""
+from alembic import op
+from sqlalchemy import text
+
+revision = "20260510_chunk_content_hash"
+down_revision = "20260501_metadata_gin"
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().scalar(text("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'ingestion_service' AND c.relname = 'vector_chunks'
+    """)))
+
+
+def upgrade() -> None:
+    columns = ["document_id", "chunk_index", "content_hash"]
+    if _is_partitioned():
+        columns.append("repo_id")
+    key = ", ".join(columns)
+
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD COLUMN IF NOT EXISTS content_hash TEXT
+    """)
+    op.execute("""
+        UPDATE ingestion_service.vector_chunks
+        SET content_hash = encode(sha256(convert_to(chunk_text, 'UTF8')), 'hex')
+        WHERE content_hash IS NULL
+    """)
+    op.execute(f"""
+        DELETE FROM ingestion_service.vector_chunks vc
+        USING ingestion_service.vector_chunks newer
+        WHERE vc.document_id IS NOT NULL
+          AND ({", ".join("vc." + c for c in columns)})
+            = ({", ".join("newer." + c for c in columns)})
+          AND newer.id > vc.id
+    """)
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        ALTER COLUMN content_hash SET NOT NULL
+    """)
+    op.execute(f"""
+        ALTER TABLE ingestion_service.vector_chunks
+        ADD CONSTRAINT uq_vector_chunks_content UNIQUE ({key})
+    """)
+    op.execute("ANALYZE ingestion_service.vector_chunks")
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        DROP CONSTRAINT IF EXISTS uq_vector_chunks_content
+    """)
+    op.execute("""
+        ALTER TABLE ingestion_service.vector_chunks
+        DROP COLUMN IF EXISTS content_hash
+    """)
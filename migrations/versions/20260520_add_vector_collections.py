@@ -0,0 +1,57 @@
+"""Add the vector_collections registry
+
+Chunks embedded by different models live in separate tables, one per named
+collection (vector_store_service src/core/vectorstore/collections.py), so a
+second embedding model with another dimension can run next to the first.
+vector_chunks stays the "default" collection and is registered here with
+its current vector dimension; the vector store creates and registers the
+tables of other collections (vector_chunks_c_<name>) on startup, from
+VECTOR_COLLECTIONS.
+
+Revision ID: 20260520_vector_collections
+Revises: 20260510_chunk_content_hash
+Create Date: 2026-05-20
+"""
+import os
+
+from alembic import op
+from sqlalchemy import text
+
+revision = "20260520_vector_collections"
+down_revision = "20260510_chunk_content_hash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_service.vector_collections (
+            name TEXT PRIMARY KEY,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            dimension INTEGER NOT NULL,
+            table_name TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMPTZ DEFAULT now()
+        )
+    """)
+    # pgvector keeps the dimension in the column's type modifier
+    op.get_bind().execute(
+        text("""
+            INSERT INTO ingestion_service.vector_collections
+                (name, provider, model, dimension, table_name)
+            SELECT 'default', :provider, :model, a.atttypmod, 'vector_chunks'
+            FROM pg_attribute a
+            WHERE a.attrelid = 'ingestion_service.vector_chunks'::regclass
+              AND a.attname = 'vector'
+            ON CONFLICT (name) DO NOTHING
+        """),
+        {
+            "provider": os.environ.get("EMBEDDING_PROVIDER", "mock"),
+            "model": os.environ.get("OLLAMA_EMBED_MODEL", "mxbai-embed-large:latest"),
+        },
+    )
+
+
+def downgrade() -> None:
+    # Collection tables other than vector_chunks are left in place
+    op.execute("DROP TABLE IF EXISTS ingestion_service.vector_collections")
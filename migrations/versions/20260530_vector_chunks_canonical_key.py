@@ -0,0 +1,92 @@
+"""Key idempotent chunk writes on the chunk's source instead of its document_id
+
+Every ingestion creates new document nodes, so a key on document_id never
+matched a chunk written by an earlier ingestion. vector_chunks gets a
+canonical_id column (source_metadata->>'canonical_id', the document node's
+stable identity within its repo, backfilled here) and the content key
+becomes (repo_id, canonical_id, chunk_index, content_hash); repo_id is in
+it on both layouts, as partitioning requires. Rows already duplicated
+under the new key are removed (the newest row is kept). Collection tables
+registered in vector_collections get the same column and key.
+
+Revision ID: 20260530_chunk_canonical_key
+Revises: 20260520_vector_collections
+Create Date: 2026-05-30
+"""
+from alembic import op
+from sqlalchemy import text
+
+revision = "20260530_chunk_canonical_key"
+down_revision = "20260520_vector_collections"
+branch_labels = None
+depends_on = None
+
+NEW_KEY = ["repo_id", "canonical_id", "chunk_index", "content_hash"]
+OLD_KEY = ["document_id", "chunk_index", "content_hash"]
+
+
+def _chunk_tables() -> list[str]:
+    tables = op.get_bind().scalars(text(
+        "SELECT table_name FROM ingestion_service.vector_collections "
+        "WHERE table_name <> 'vector_chunks'"
+    )).all()
+    return ["vector_chunks", *tables]
+
+
+def _is_partitioned(table: str) -> bool:
+    return bool(op.get_bind().scalar(text("""
+        SELECT c.relkind = 'p'
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'ingestion_service' AND c.relname = :table
+    """), {"table": table}))
+
+
+def _drop_key(table: str) -> None:
+    # vector_chunks carries a constraint, collection tables a unique index
+    op.execute(f"""
+        ALTER TABLE ingestion_service.{table}
+        DROP CONSTRAINT IF EXISTS uq_{table}_content
+    """)
+    op.execute(f"DROP INDEX IF EXISTS ingestion_service.uq_{table}_content")
+
+
+def _add_key(table: str, columns: list[str]) -> None:
+    op.execute(f"""
+        DELETE FROM ingestion_service.{table} vc
+        USING ingestion_service.{table} newer
+        WHERE ({", ".join("vc." + c for c in columns)})
+            = ({", ".join("newer." + c for c in columns)})
+          AND newer.id > vc.id
+    """)
+    op.execute(f"""
+        ALTER TABLE ingestion_service.{table}
+        ADD CONSTRAINT uq_{table}_content UNIQUE ({", ".join(columns)})
+    """)
+
+
+def upgrade() -> None:
+    for table in _chunk_tables():
+        op.execute(f"""
+            ALTER TABLE ingestion_service.{table}
+            ADD COLUMN IF NOT EXISTS canonical_id TEXT
+        """)
+        op.execute(f"""
+            UPDATE ingestion_service.{table}
+            SET canonical_id = NULLIF(source_metadata->>'canonical_id', '')
+            WHERE canonical_id IS NULL
+        """)
+        _drop_key(table)
+        _add_key(table, NEW_KEY)
+        op.execute(f"ANALYZE ingestion_service.{table}")
+
+
+def downgrade() -> None:
+    for table in _chunk_tables():
+        _drop_key(table)
+        columns = OLD_KEY + (["repo_id"] if _is_partitioned(table) else [])
+        _add_key(table, columns)
+        op.execute(f"""
+            ALTER TABLE ingestion_service.{table}
+            DROP COLUMN IF EXISTS canonical_id
+        """)
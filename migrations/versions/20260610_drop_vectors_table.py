@@ -0,0 +1,122 @@
+"""Drop the legacy vectors table once vector_chunks holds all of its rows
+
+Migration 20260410_retire_vectors backfilled the vectors rows that never
+reached vector_chunks; this one drops vectors, but only after checking
+that nothing would be lost. A vectors row is accounted for when
+vector_chunks has the same (ingestion_id, chunk_id) or, since the
+idempotent-write migrations removed duplicate chunks, a row with the same
+chunk text (content_hash). If any row is not, the upgrade stops and
+vectors is left untouched: run the store with VECTOR_WRITE_MODE=dual, or
+backfill the reported rows, and upgrade again.
+
+Dropping the table cannot be undone without a restore, so it only runs
+when requested:
+
+    alembic -x drop_vectors=true upgrade head
+    # or DROP_VECTORS_TABLE=true in the environment
+
+and never while the store is configured to dual-write
+(VECTOR_WRITE_MODE=dual): switch it to chunks_only first. Without the
+flag this revision is a no-op; to drop later, downgrade to
+20260530_chunk_canonical_key and upgrade again with the flag.
+
+Downgrade recreates vectors from vector_chunks; run the store with
+VECTOR_WRITE_MODE=dual before going back.
+
+Revision ID: 20260610_drop_vectors
+Revises: 20260530_chunk_canonical_key
+Create Date: 2026-06-10
+"""
+import os
+
+from alembic import context, op
+from sqlalchemy import text
+
+revision = "20260610_drop_vectors"
+down_revision = "20260530_chunk_canonical_key"
+branch_labels = None
+depends_on = None
+
+COLUMNS = """
+    vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+    chunk_text, source_metadata, provider
+"""
+
+# vectors rows with no vector_chunks counterpart
+UNACCOUNTED_ROWS = """
+    SELECT count(*)
+    FROM ingestion_service.vectors v
+    WHERE NOT EXISTS (
+        SELECT 1 FROM ingestion_service.vector_chunks vc
+        WHERE vc.ingestion_id = v.ingestion_id
+          AND vc.chunk_id = v.chunk_id
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM ingestion_service.vector_chunks vc
+        WHERE vc.content_hash = encode(sha256(convert_to(v.chunk_text, 'UTF8')), 'hex')
+    )
+"""
+
+
+def _table_exists(name: str) -> bool:
+    return bool(op.get_bind().scalar(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": f"ingestion_service.{name}"},
+    ))
+
+
+def _requested() -> bool:
+    flag = (
+        context.get_x_argument(as_dictionary=True).get("drop_vectors")
+        or os.environ.get("DROP_VECTORS_TABLE", "")
+    )
+    return flag.lower() in ("1", "true", "yes")
+
+
+def upgrade() -> None:
+    if not _requested() or not _table_exists("vectors"):
+        return
+    if os.environ.get("VECTOR_WRITE_MODE", "").lower() == "dual":
+        raise RuntimeError(
+            "VECTOR_WRITE_MODE=dual still writes ingestion_service.vectors; "
+            "switch the store to chunks_only before dropping it"
+        )
+
+    missing = op.get_bind().scalar(text(UNACCOUNTED_ROWS))
+    if missing:
+        raise RuntimeError(
+            f"ingestion_service.vectors has {missing} rows that are not in "
+            "vector_chunks; not dropping it (see this migration's docstring)"
+        )
+    op.execute("DROP TABLE ingestion_service.vectors")
+
+
+def downgrade() -> None:
+    if _table_exists("vectors"):
+        return
+
+    # Keep the vector dimension in step with vector_chunks (see 20260301).
+    vector_type = op.get_bind().scalar(text("""
+        SELECT format_type(a.atttypid, a.atttypmod)
+        FROM pg_attribute a
+        WHERE a.attrelid = 'ingestion_service.vector_chunks'::regclass
+          AND a.attname = 'vector'
+    """))
+    op.execute(f"""
+        CREATE TABLE ingestion_service.vectors (
+            id SERIAL PRIMARY KEY,
+            vector {vector_type} NOT NULL,
+            ingestion_id UUID NOT NULL,
+            chunk_id TEXT NOT NULL,
+            chunk_index INT NOT NULL,
+            chunk_strategy TEXT NOT NULL,
+            chunk_text TEXT NOT NULL,
+            source_metadata JSONB NOT NULL DEFAULT '{{}}',
+            provider TEXT NOT NULL DEFAULT 'ollama'
+        )
+    """)
+    # In dual mode vectors held every record, so restore all of them.
+    op.execute(f"""
+        INSERT INTO ingestion_service.vectors ({COLUMNS})
+        SELECT {COLUMNS} FROM ingestion_service.vector_chunks ORDER BY id
+    """)
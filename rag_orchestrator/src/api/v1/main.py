@@ -1,7 +1,19 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from shared.embedders.factory import aclose_embedders
 from src.api.v1.routes import router
+from src.core.config import get_query_embedding_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the embedder's pooled HTTP connections on shutdown
+    await aclose_embedders()
 
-app = FastAPI(title="RAG Orchestrator")
+
+app = FastAPI(title="RAG Orchestrator", lifespan=lifespan)
 
 app.include_router(router, prefix="/v1")
 
@@ -9,3 +21,9 @@ app.include_router(router, prefix="/v1")
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/stats")
+def stats():
+    """Query embedding cache hits / misses / hit ratio."""
+    return {"query_embedding_cache": get_query_embedding_cache().stats()}
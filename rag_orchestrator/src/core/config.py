@@ -4,6 +4,8 @@ from __future__ import annotations
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from shared.embedders.query_cache import QueryEmbeddingCache
+
 
 class Settings(BaseSettings):
     # -------------------------------------------------
@@ -16,6 +18,11 @@ class Settings(BaseSettings):
 
     OLLAMA_BATCH_SIZE: int = 50
 
+    # Query embeddings reused across requests (LRU, entries expire after
+    # the TTL); 0 disables the cache
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL: float = 3600.0
+
     # -------------------------------------------------
     # Service URLs (Docker service names)
     # -------------------------------------------------
@@ -35,6 +42,16 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Process-wide query embedding cache shared by run_rag / run_simple_rag."""
+    settings = get_settings()
+    return QueryEmbeddingCache(
+        max_entries=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL,
+    )
+
+
 def reset_settings_cache():
     """Clear cached settings for testing or reload."""
     get_settings.cache_clear()
@@ -8,8 +8,7 @@ import httpx
 from fastapi import HTTPException
 from pydantic import BaseModel
 
-from src.core.config import get_settings
-from shared.embedders.query import embed_query
+from src.core.config import get_query_embedding_cache, get_settings
 from shared.embedders.factory import get_embedder
 
 from shared.retrieval.retrieval_plan import RetrievalPlan
@@ -131,9 +130,12 @@ async def hybrid_retrieve(
     settings = get_settings()
     logger.info(f"🔄 Hybrid retrieval | repo={repo_id[:8]} | q='{query[:50]}...'")
 
+    # Both searches are scoped to this repo (indexed repo_id column), so
+    # chunks from other repositories are neither scanned nor returned. The
+    # unfiltered one only runs when the code search finds nothing.
     search_url = f"{settings.VECTOR_STORE_URL}/v1/vectors/search"
-    payload = {"query_vector": query_embedding, "k": top_k,
-                "metadata_filter": {"doc_type": "code"}}
+    payload = {"query_vector": query_embedding, "k": top_k, "repo_id": repo_id,
+               "metadata_filter": {"doc_type": "code"}}
 
     async with httpx.AsyncClient(timeout=200) as client:
         resp = await client.post(search_url, json=payload)
@@ -180,14 +182,16 @@ async def hybrid_retrieve(
     seed_doc_ids = set(retrieved_chunks_by_document.keys())
     missing_doc_ids = all_document_ids - seed_doc_ids
 
-    async with httpx.AsyncClient(timeout=200) as client:
-        for doc_id in missing_doc_ids:
+    if missing_doc_ids:
+        # One batched fetch for all expanded docs instead of one POST per doc
+        docs_url = f"{settings.VECTOR_STORE_URL}/v1/vectors/search-by-docs"
+        docs_payload = {"document_ids": sorted(missing_doc_ids), "k": 10}
+        async with httpx.AsyncClient(timeout=200) as client:
             try:
-                doc_url = f"{settings.VECTOR_STORE_URL}/v1/vectors/search-by-doc"
-                doc_payload = {"document_id": doc_id, "k": 10}
-                resp = await client.post(doc_url, json=doc_payload)
-                if resp.status_code == 200:
-                    for r in resp.json().get("results", []):
+                resp = await client.post(docs_url, json=docs_payload)
+                resp.raise_for_status()
+                for doc_id, results in resp.json().get("results", {}).items():
+                    for r in results:
                         chunk = RetrievedChunk(
                             document_id=doc_id,
                             chunk_id=r["chunk_id"],
@@ -197,7 +201,9 @@ async def hybrid_retrieve(
                         )
                         retrieved_chunks_by_document.setdefault(doc_id, []).append(chunk)
             except Exception as e:
-                logger.warning(f"Failed fetching expanded doc {doc_id[:8]}: {e}")
+                logger.warning(
+                    f"Failed fetching {len(missing_doc_ids)} expanded docs: {e}"
+                )
 
     retrieval_plan_dict = {
         "seed_canonical_ids": sorted(seed_canonical_ids),
@@ -235,7 +241,7 @@ async def run_rag(
         ollama_model=settings.OLLAMA_EMBED_MODEL,
         ollama_batch_size=settings.OLLAMA_BATCH_SIZE,
     )
-    query_embedding = embed_query(query, embedder)
+    query_embedding = await get_query_embedding_cache().aembed_query(query, embedder)
 
     retrieved_chunks_by_document, retrieval_plan_dict = await hybrid_retrieve(
         query, resolved_repo_id, query_embedding, top_k
@@ -19,8 +19,7 @@ import requests as req_lib
 from fastapi import HTTPException
 from pydantic import BaseModel
 
-from src.core.config import get_settings
-from shared.embedders.query import embed_query
+from src.core.config import get_query_embedding_cache, get_settings
 from shared.embedders.factory import get_embedder
 from shared.retrieval.retrieval_plan import RetrievalPlan
 from rag_orchestrator.src.retrieval.execute_plan import execute_retrieval_plan
@@ -60,7 +59,7 @@ async def run_simple_rag(
         ollama_model=settings.OLLAMA_EMBED_MODEL,
         ollama_batch_size=settings.OLLAMA_BATCH_SIZE,
     )
-    query_embedding = embed_query(query, embedder)
+    query_embedding = await get_query_embedding_cache().aembed_query(query, embedder)
 
     # ------------------------------------------------------------------
     # Step 2: Vector search — exclude code chunks
@@ -166,37 +165,34 @@ async def run_simple_rag(
         ]
 
         if missing_doc_ids:
-            search_by_doc_url = (
-                f"{settings.VECTOR_STORE_URL}/v1/vectors/search-by-doc"
+            search_by_docs_url = (
+                f"{settings.VECTOR_STORE_URL}/v1/vectors/search-by-docs"
             )
             async with httpx.AsyncClient(timeout=60) as client:
-                for doc_id in missing_doc_ids:
-                    try:
-                        resp = await client.post(
-                            search_by_doc_url,
-                            json={"document_id": doc_id, "k": 3},
-                        )
-                        if resp.status_code == 200:
-                            for result in resp.json().get("results", []):
-                                chunk = RetrievedChunk(
-                                    document_id=doc_id,
-                                    chunk_id=result["chunk_id"],
-                                    text=result["text"],
-                                    score=result.get("score"),
-                                    metadata=result.get("metadata", {}),
-                                )
-                                retrieved_chunks_by_document.setdefault(
-                                    doc_id, []
-                                ).append(chunk)
-                        else:
-                            logger.warning(
-                                "search-by-doc failed: doc=%s status=%s",
-                                doc_id[:8], resp.status_code
+                try:
+                    resp = await client.post(
+                        search_by_docs_url,
+                        json={"document_ids": missing_doc_ids, "k": 3},
+                    )
+                    resp.raise_for_status()
+                    by_doc = resp.json().get("results", {})
+                    for doc_id, results in by_doc.items():
+                        for result in results:
+                            chunk = RetrievedChunk(
+                                document_id=doc_id,
+                                chunk_id=result["chunk_id"],
+                                text=result["text"],
+                                score=result.get("score"),
+                                metadata=result.get("metadata", {}),
                             )
-                    except Exception as e:
-                        logger.warning(
-                            "search-by-doc error for %s: %s", doc_id[:8], e
-                        )
+                            retrieved_chunks_by_document.setdefault(
+                                doc_id, []
+                            ).append(chunk)
+                except Exception as e:
+                    logger.warning(
+                        "search-by-docs error for %d docs: %s",
+                        len(missing_doc_ids), e
+                    )
 
             logger.info(
                 "Simple RAG: fetched chunks for %d expanded docs",
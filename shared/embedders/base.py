@@ -1,6 +1,7 @@
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List
 
 from shared.chunks import Chunk
 
@@ -19,3 +20,37 @@ class BaseEmbedder(ABC):
         :return: List of embedding vectors
         """
         raise NotImplementedError
+
+    async def aembed(self, chunks: List[Chunk]) -> List[List[float]]:
+        """
+        Async embed(). The default runs embed() in a worker thread so a
+        blocking embedder does not stall the event loop; embedders with a
+        native async client override it.
+        """
+        return await asyncio.to_thread(self.embed, chunks)
+
+    def embedding_text(self, chunk: Chunk) -> str:
+        """Text actually embedded for a chunk (after any truncation)."""
+        return str(chunk.content)
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the vector space this embedder produces: name/model/dimension."""
+        model = getattr(self, "model", self.name)
+        return f"{self.name}/{model}/{getattr(self, 'dimension', '')}"
+
+    @property
+    def provider_name(self) -> str:
+        """Recorded as chunk provider metadata."""
+        return type(self).__name__
+
+    def stats(self) -> Dict[str, Any]:
+        """Embedder-specific counters (throughput, cache hits); none by default."""
+        return {}
+
+    def close(self) -> None:
+        """Release held clients / files; nothing to release by default."""
+
+    async def aclose(self) -> None:
+        """Async close(), for embedders holding an async client."""
+        self.close()
@@ -0,0 +1,270 @@
+# shared/embedders/cache.py
+"""
+Content-addressed, persistent embedding cache.
+
+CachedEmbedder wraps any BaseEmbedder. Each chunk is keyed by
+sha256(model_id + text actually embedded), so re-ingesting a repository
+only sends new or changed artifacts to the wrapped embedder; unchanged
+ones are read back from a local SQLite file. Vectors are stored as
+float32 blobs. The cache holds about max_entries vectors: once a
+running count passes it, the least recently used ones are evicted in
+one batch, down to 1% below the limit.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from shared.chunks import Chunk
+from shared.embedders.base import BaseEmbedder
+
+DEFAULT_MAX_ENTRIES = 500_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key       TEXT PRIMARY KEY,
+    vector    BLOB NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+_LAST_USED_INDEX = (
+    "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+)
+
+# SQLite's default limit on host parameters per statement is 999
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed key -> vector store, bounded to max_entries (LRU)."""
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_LAST_USED_INDEX)
+        self._conn.commit()
+        # Approximate row count (other processes may share the file),
+        # re-read from the table before evicting
+        self._entries = self._count()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the keys found; refreshes their recency."""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[i:i + _LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+            hits = sum(1 for key in keys if key in found)
+            self._hits += hits
+            self._misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: Mapping[str, Sequence[float]]) -> None:
+        """Store vectors, then evict least recently used ones over max_entries."""
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (key, array("f", vector).tobytes(), now) for key, vector in items.items()
+        ]
+        with self._lock:
+            added = len(rows) - self._stored(list(items))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used)"
+                " VALUES (?, ?, ?)",
+                rows,
+            )
+            self._entries += added
+            if self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _stored(self, keys: Sequence[str]) -> int:
+        """How many of these keys are already cached (primary key lookups)."""
+        stored = 0
+        for i in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[i:i + _LOOKUP_BATCH]
+            (count,) = self._conn.execute(
+                "SELECT count(*) FROM embeddings WHERE key IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            ).fetchone()
+            stored += count
+        return stored
+
+    def _evict(self) -> None:
+        """Drop least recently used vectors down to 1% below max_entries."""
+        self._entries = self._count()
+        excess = self._entries - self.max_entries
+        if excess <= 0:
+            return
+        excess += self.max_entries // 100
+        deleted = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,),
+        ).rowcount
+        self._entries -= deleted
+        self._evictions += deleted
+
+    def _count(self) -> int:
+        (count,) = self._conn.execute("SELECT count(*) FROM embeddings").fetchone()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._count()
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder(BaseEmbedder):
+    """
+    Embeds through `embedder`, reading and writing an EmbeddingCache.
+    Only cache misses reach the wrapped embedder (in one embed() call, in
+    input order); duplicate texts within a call are embedded once.
+    """
+
+    def __init__(self, embedder: BaseEmbedder, cache: EmbeddingCache) -> None:
+        self.embedder = embedder
+        self.cache = cache
+        self.name = embedder.name
+
+    def __getattr__(self, attr: str) -> Any:
+        # model / dimension / batch_size ... of the wrapped embedder
+        if attr == "embedder":
+            raise AttributeError(attr)
+        return getattr(self.embedder, attr)
+
+    def embedding_text(self, chunk: Chunk) -> str:
+        return self.embedder.embedding_text(chunk)
+
+    @property
+    def model_id(self) -> str:
+        return self.embedder.model_id
+
+    @property
+    def provider_name(self) -> str:
+        return self.embedder.provider_name
+
+    def embed(self, chunks: List[Chunk]) -> List[List[float]]:
+        if not chunks:
+            return []
+        keys, vectors, missing = self._lookup(chunks)
+        if missing:
+            self._store(vectors, missing, self.embedder.embed(list(missing.values())))
+        return self._result(keys, vectors, missing)
+
+    async def aembed(self, chunks: List[Chunk]) -> List[List[float]]:
+        # Cache reads / writes are local SQLite; only misses go out, awaited
+        if not chunks:
+            return []
+        keys, vectors, missing = self._lookup(chunks)
+        if missing:
+            embedded = await self.embedder.aembed(list(missing.values()))
+            self._store(vectors, missing, embedded)
+        return self._result(keys, vectors, missing)
+
+    def _lookup(
+        self, chunks: List[Chunk]
+    ) -> Tuple[List[str], Dict[str, List[float]], Dict[str, Chunk]]:
+        """Cache keys, cached vectors by key and the chunks still to embed by key."""
+        model_id = self.model_id
+        keys = [
+            self.cache.key(model_id, self.embedding_text(chunk)) for chunk in chunks
+        ]
+        vectors: Dict[str, List[float]] = self.cache.get_many(keys)
+
+        missing: Dict[str, Chunk] = {}
+        for key, chunk in zip(keys, chunks):
+            if key not in vectors:
+                missing.setdefault(key, chunk)
+        return keys, vectors, missing
+
+    def _store(
+        self,
+        vectors: Dict[str, List[float]],
+        missing: Dict[str, Chunk],
+        embedded: List[List[float]],
+    ) -> None:
+        if len(embedded) != len(missing):
+            raise RuntimeError(
+                f"{self.name} returned {len(embedded)} embeddings"
+                f" for {len(missing)} chunks"
+            )
+        new = dict(zip(missing, embedded))
+        self.cache.put_many(new)
+        vectors.update(new)
+
+    @staticmethod
+    def _result(
+        keys: List[str], vectors: Dict[str, List[float]], missing: Dict[str, Chunk]
+    ) -> List[List[float]]:
+        logging.debug(
+            "CachedEmbedder: %d chunks, %d embedded", len(keys), len(missing),
+        )
+        return [vectors[key] for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"cache": self.cache.stats()}
+        inner = self.embedder.stats()
+        if inner:
+            stats["embedder"] = inner
+        return stats
+
+    def close(self) -> None:
+        self.cache.close()
+        self.embedder.close()
+
+    async def aclose(self) -> None:
+        self.cache.close()
+        await self.embedder.aclose()
@@ -1,8 +1,18 @@
 # shared/embedders/factory.py
 
+import threading
+from typing import Dict, Tuple
+
+from shared.embedders.base import BaseEmbedder
+from shared.embedders.cache import DEFAULT_MAX_ENTRIES, CachedEmbedder, EmbeddingCache
 from shared.embedders.mock import MockEmbedder
 from shared.embedders.ollama import OllamaEmbedder
 
+# One embedder per configuration and process, so its pooled HTTP session
+# (and cache file) is reused across requests / ingestions
+_embedders: Dict[Tuple, BaseEmbedder] = {}
+_embedders_lock = threading.Lock()
+
 
 def get_embedder(
     *,
@@ -11,7 +21,87 @@ def get_embedder(
     ollama_model: str | None = None,
     ollama_batch_size: int = 50,
     ollama_dimension: int | None = None,   # merged support
+    ollama_max_in_flight: int = 2,
+    cache_path: str | None = None,
+    cache_max_entries: int = DEFAULT_MAX_ENTRIES,
 ):
+    """
+    The process-wide embedder for `provider` and this configuration,
+    created on first use. With cache_path set it is wrapped in a
+    CachedEmbedder backed by that SQLite file. Release them on shutdown
+    with close_embedders / aclose_embedders.
+    """
+    key = (
+        provider, ollama_base_url, ollama_model, ollama_dimension,
+        ollama_batch_size, ollama_max_in_flight, cache_path, cache_max_entries,
+    )
+    with _embedders_lock:
+        embedder = _embedders.get(key)
+        if embedder is None:
+            embedder = _embedders[key] = _create_embedder(
+                provider=provider,
+                ollama_base_url=ollama_base_url,
+                ollama_model=ollama_model,
+                ollama_batch_size=ollama_batch_size,
+                ollama_dimension=ollama_dimension,
+                ollama_max_in_flight=ollama_max_in_flight,
+                cache_path=cache_path,
+                cache_max_entries=cache_max_entries,
+            )
+    return embedder
+
+
+def close_embedders() -> None:
+    """Close every cached embedder (sync apps / shutdown hooks)."""
+    with _embedders_lock:
+        embedders = list(_embedders.values())
+        _embedders.clear()
+    for embedder in embedders:
+        embedder.close()
+
+
+async def aclose_embedders() -> None:
+    """Close every cached embedder, async clients included (FastAPI lifespan)."""
+    with _embedders_lock:
+        embedders = list(_embedders.values())
+        _embedders.clear()
+    for embedder in embedders:
+        await embedder.aclose()
+
+
+def _create_embedder(
+    *,
+    provider: str,
+    ollama_base_url: str | None,
+    ollama_model: str | None,
+    ollama_batch_size: int,
+    ollama_dimension: int | None,
+    ollama_max_in_flight: int,
+    cache_path: str | None,
+    cache_max_entries: int,
+) -> BaseEmbedder:
+    embedder = _build_embedder(
+        provider=provider,
+        ollama_base_url=ollama_base_url,
+        ollama_model=ollama_model,
+        ollama_batch_size=ollama_batch_size,
+        ollama_dimension=ollama_dimension,
+        ollama_max_in_flight=ollama_max_in_flight,
+    )
+    if cache_path:
+        return CachedEmbedder(embedder, EmbeddingCache(cache_path, cache_max_entries))
+    return embedder
+
+
+def _build_embedder(
+    *,
+    provider: str,
+    ollama_base_url: str | None,
+    ollama_model: str | None,
+    ollama_batch_size: int,
+    ollama_dimension: int | None,
+    ollama_max_in_flight: int,
+) -> BaseEmbedder:
     if provider == "ollama":
         if not ollama_base_url or not ollama_model:
             raise ValueError("Ollama config required for ollama embedder")
@@ -21,9 +111,10 @@ def get_embedder(
             model=ollama_model,
             batch_size=ollama_batch_size,
             dimension=ollama_dimension,  # safe if None
+            max_in_flight=ollama_max_in_flight,
         )
 
     if provider == "mock":
-        return MockEmbedder()
+        return MockEmbedder(dimension=ollama_dimension or 1024)
 
     raise ValueError(f"Unknown embedder provider: {provider}")
\ No newline at end of file
@@ -8,23 +8,29 @@ from shared.embedders.base import BaseEmbedder
 class MockEmbedder(BaseEmbedder):
     """
     Deterministic embedder for tests.
-    Produces stable vectors based on chunk content length.
+    Produces stable vectors based on chunk content length, zero-padded to
+    `dimension` so they fit the vector collection they are written to.
     """
 
     name = "mock"
-    dimension = 768
+
+    def __init__(self, dimension: int = 1024):
+        self.dimension = dimension
 
     def embed(self, chunks: List[Chunk]) -> List[List[float]]:
         embeddings: List[List[float]] = []
 
         for chunk in chunks:
             length = len(str(chunk.content))
-            embeddings.append(
-                [
-                    float(length),
-                    float(length % 10),
-                    1.0,
-                ]
-            )
+            features = [
+                float(length),
+                float(length % 10),
+                1.0,
+            ]
+            padding = [0.0] * max(self.dimension - len(features), 0)
+            embeddings.append((features + padding)[: self.dimension])
 
         return embeddings
+
+    async def aembed(self, chunks: List[Chunk]) -> List[List[float]]:
+        return self.embed(chunks)
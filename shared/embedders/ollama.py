@@ -1,6 +1,13 @@
+import asyncio
 import requests
 import logging
-from typing import List
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from requests.adapters import HTTPAdapter
 from shared.embedders.base import BaseEmbedder
 from shared.chunks import Chunk
 
@@ -30,18 +37,52 @@ def _truncate(text: str, max_words: int = MAX_EMBEDDING_WORDS) -> str:
 
 
 class OllamaEmbedder(BaseEmbedder):
+    """
+    Embeds through Ollama's /api/embed.
+
+    Inputs are sent in batches of `batch_size` texts, with up to
+    `max_in_flight` batches in flight at once over one pooled
+    requests.Session, so a large document is neither one giant request nor
+    a strictly sequential stream of small ones. Embeddings come back in
+    input order. aembed() does the same over an httpx.AsyncClient (one per
+    event loop) for callers on an event loop.
+    """
+
     name = "ollama"
 
     def __init__(self, base_url: str, model: str, batch_size: int = 50,
-                  dimension: int | None = None,):
+                  dimension: int | None = None, max_in_flight: int = 2,
+                  timeout: float = 120.0):
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("batch_size and max_in_flight must be positive")
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.batch_size = batch_size
         self.dimension = dimension or 1024
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+
+        # One keep-alive connection per in-flight batch
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # httpx.AsyncClient per event loop, created on its first aembed():
+        # a client's connections belong to the loop that opened them
+        self._async_clients: "weakref.WeakKeyDictionary[Any, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self._lock = threading.Lock()
+        self._text_count = 0
+        self._batch_count = 0
+        self._seconds = 0.0
 
         logging.debug(
-            "OllamaEmbedder base_url=%s model=%s dimension=%d",
-            self.base_url, self.model, self.dimension
+            "OllamaEmbedder base_url=%s model=%s dimension=%d batch_size=%d"
+            " max_in_flight=%d",
+            self.base_url, self.model, self.dimension, self.batch_size,
+            self.max_in_flight,
         )
 
     def embed(self, chunks: List[Chunk]) -> List[List[float]]:
@@ -49,27 +90,140 @@ class OllamaEmbedder(BaseEmbedder):
             "OllamaEmbedder received %d items",
             len(chunks),
         )
+        if not chunks:
+            return []
 
-        texts = [_truncate(chunk.content) for chunk in chunks]
-
+        batches = self._batches(chunks)
+        start = time.perf_counter()
         try:
-            payload = {"model": self.model, "input": texts}
+            workers = min(self.max_in_flight, len(batches))
+            if workers == 1:
+                results = [self._embed_batch(batch) for batch in batches]
+            else:
+                # map() yields in submission order, whatever order batches finish in
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="ollama-embed"
+                ) as pool:
+                    results = list(pool.map(self._embed_batch, batches))
+        except Exception as e:
+            raise RuntimeError(f"Ollama embedder error: {e}") from e
+
+        self._record(len(chunks), len(batches), workers, time.perf_counter() - start)
+        return [embedding for batch in results for embedding in batch]
 
-            response = requests.post(f"{self.base_url}/api/embed", json=payload)
+    async def aembed(self, chunks: List[Chunk]) -> List[List[float]]:
+        if not chunks:
+            return []
 
-            if response.status_code != 200:
-                raise RuntimeError(
-                    f"Ollama embedding failed "
-                    f"(status={response.status_code}): {response.text}"
+        batches = self._batches(chunks)
+        workers = min(self.max_in_flight, len(batches))
+        in_flight = asyncio.Semaphore(workers)
+
+        async def embed_batch(texts: List[str]) -> List[List[float]]:
+            async with in_flight:
+                response = await self._get_async_client().post(
+                    f"{self.base_url}/api/embed",
+                    json={"model": self.model, "input": texts},
                 )
+            return self._parse_response(response, texts)
 
-            result = response.json()
+        start = time.perf_counter()
+        tasks = [asyncio.ensure_future(embed_batch(batch)) for batch in batches]
+        try:
+            # gather() returns results in argument order
+            results = await asyncio.gather(*tasks)
+        except Exception as e:
+            # gather() leaves the other batches running: stop them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise RuntimeError(f"Ollama embedder error: {e}") from e
+
+        self._record(len(chunks), len(batches), workers, time.perf_counter() - start)
+        return [embedding for batch in results for embedding in batch]
+
+    def embedding_text(self, chunk: Chunk) -> str:
+        return _truncate(chunk.content)
+
+    def _batches(self, chunks: List[Chunk]) -> List[List[str]]:
+        texts = [self.embedding_text(chunk) for chunk in chunks]
+        return [
+            texts[i:i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        payload = {"model": self.model, "input": texts}
+
+        response = self._session.post(
+            f"{self.base_url}/api/embed", json=payload, timeout=self.timeout
+        )
+        return self._parse_response(response, texts)
+
+    @staticmethod
+    def _parse_response(response: Any, texts: List[str]) -> List[List[float]]:
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Ollama embedding failed "
+                f"(status={response.status_code}): {response.text}"
+            )
 
-            return (
-                result.get("embeddings", [result["embeddings"]])
-                if isinstance(texts, list)
-                else [result["embeddings"]]
+        embeddings = response.json()["embeddings"]
+        if len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+            )
+        return embeddings
+
+    def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import httpx  # only needed by async callers
+
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
             )
+        return client
+
+    def _record(self, texts: int, batches: int, workers: int, elapsed: float) -> None:
+        with self._lock:
+            self._text_count += texts
+            self._batch_count += batches
+            self._seconds += elapsed
+        logging.info(
+            "OllamaEmbedder: %d texts in %d batches (%d in flight) in %.2fs,"
+            " %.1f texts/s",
+            texts, batches, workers, elapsed,
+            texts / elapsed if elapsed > 0 else 0.0,
+        )
 
-        except Exception as e:
-            raise RuntimeError(f"Ollama embedder error: {e}") from e
\ No newline at end of file
+    def stats(self) -> Dict[str, Any]:
+        """Texts / batches embedded since construction and overall throughput."""
+        with self._lock:
+            seconds = self._seconds
+            return {
+                "texts": self._text_count,
+                "batches": self._batch_count,
+                "seconds": round(seconds, 3),
+                "texts_per_second": (self._text_count / seconds) if seconds else 0.0,
+            }
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections (see aclose for the async client)."""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """
+        Release the sync client's and this event loop's async client's
+        connections; clients of other (finished) loops are dropped.
+        """
+        self.close()
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        self._async_clients.clear()
+        if client is not None:
+            await client.aclose()
@@ -9,6 +9,20 @@ from shared.chunks import Chunk
 from shared.embedders.base import BaseEmbedder
 
 
+def _query_chunk(query: str) -> Chunk:
+    return Chunk(
+        chunk_id=f"query:{uuid.uuid4()}",
+        content=query,
+        metadata={"type": "query"},
+    )
+
+
+def _single(embeddings: List[List[float]]) -> List[float]:
+    if not embeddings or len(embeddings) != 1:
+        raise RuntimeError(f"Expected 1 embedding for query, got {len(embeddings)}")
+    return embeddings[0]
+
+
 def embed_query(query: str, embedder: BaseEmbedder) -> List[float]:
     """
     Embed a single query string using the provided embedder.
@@ -20,15 +34,9 @@ def embed_query(query: str, embedder: BaseEmbedder) -> List[float]:
 
     No persistence, no chunking, no side effects.
     """
-    query_chunk = Chunk(
-        chunk_id=f"query:{uuid.uuid4()}",
-        content=query,
-        metadata={"type": "query"},
-    )
+    return _single(embedder.embed([_query_chunk(query)]))
 
-    embeddings = embedder.embed([query_chunk])
 
-    if not embeddings or len(embeddings) != 1:
-        raise RuntimeError(f"Expected 1 embedding for query, got {len(embeddings)}")
-
-    return embeddings[0]
+async def aembed_query(query: str, embedder: BaseEmbedder) -> List[float]:
+    """embed_query for async callers: awaits embedder.aembed()."""
+    return _single(await embedder.aembed([_query_chunk(query)]))
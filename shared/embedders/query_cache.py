@@ -0,0 +1,132 @@
+# shared/embedders/query_cache.py
+"""
+In-memory LRU / TTL cache of query embeddings with a single-flight guard.
+
+Repeated questions (UI retries, dashboards polling the same prompt) are
+served without calling the embedder again. Keys are the embedder's
+model_id plus the query with whitespace collapsed and Unicode NFC
+normalised; case is kept, since embedders are case sensitive. Vectors
+are held as array('f') (4 bytes per dimension instead of a list of
+Python floats). Concurrent lookups of the same key share one embedding
+call: the first caller's query text is embedded as sent, the others
+await its result and are counted as coalesced, not as misses.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from shared.embedders.base import BaseEmbedder
+from shared.embedders.query import aembed_query
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600.0
+
+
+def normalize_query(query: str) -> str:
+    return unicodedata.normalize("NFC", " ".join(query.split()))
+
+
+class QueryEmbeddingCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (expires_at, vector), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, array]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[List[float]]"] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(query: str, model_id: str) -> str:
+        return f"{model_id}\0{normalize_query(query)}"
+
+    async def aembed_query(self, query: str, embedder: BaseEmbedder) -> List[float]:
+        """aembed_query through the cache."""
+        if not self.enabled:
+            return await aembed_query(query, embedder)
+
+        key = self.key(query, embedder.model_id)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            with self._lock:
+                self._coalesced += 1
+            # shield: a cancelled waiter must not cancel the shared call
+            return list(await asyncio.shield(pending))
+
+        with self._lock:
+            self._misses += 1
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[List[float]]" = loop.create_future()
+        self._inflight[key] = future
+        try:
+            vector = await aembed_query(query, embedder)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here when nobody else was waiting
+            raise
+        else:
+            self._put(key, vector)
+            future.set_result(vector)
+            return vector
+        finally:
+            self._inflight.pop(key, None)
+
+    def _get(self, key: str) -> List[float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1].tolist()
+
+    def _put(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl_seconds
+            self._entries[key] = (expires_at, array("f", vector))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+            }
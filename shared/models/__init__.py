@@ -4,13 +4,16 @@ from .base import Base
 from .document_node import DocumentNode
 from .document_relationship import DocumentRelationship
 from .vector_chunk import VectorChunk
-from .vector import VectorRecord, VectorMetadata
+from .vector_collection import VectorCollection
+from .vector import VectorRecord, VectorMetadata, VectorQuery
 
 __all__ = [
     "Base",
     "DocumentNode",
     "DocumentRelationship",
     "VectorChunk",
+    "VectorCollection",
     "VectorRecord",
     "VectorMetadata",
+    "VectorQuery",
 ]
\ No newline at end of file
@@ -1,8 +1,22 @@
 # shared/models/vector.py
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass, field
-from typing import Sequence, Dict, Optional
+from typing import Sequence, Dict, List, Optional
+
+
+def content_hash(chunk_text: str) -> str:
+    """sha256 hex of the chunk text; vector_chunks.content_hash (idempotent writes)."""
+    return hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+
+
+def canonical_id(source_metadata: Optional[Dict]) -> Optional[str]:
+    """
+    The chunk's source identity (DocumentNode.canonical_id, e.g.
+    "pkg/mod.py#func"), stable across ingestions; vector_chunks.canonical_id.
+    """
+    return (source_metadata or {}).get("canonical_id") or None
 
 
 @dataclass
@@ -21,5 +35,31 @@ class VectorMetadata:
 
 @dataclass
 class VectorRecord:
-    vector: Sequence[float]
+    vector: Optional[Sequence[float]]   # None when a search's projection left it out
     metadata: VectorMetadata
+
+
+@dataclass
+class VectorQuery:
+    """One query in a multi-query (batch) similarity search."""
+    query_vector: Sequence[float]
+    k: int = 5
+    metadata_filter: Optional[Dict] = None
+    repo_id: Optional[str] = None                # restrict to one repository
+    ingestion_ids: Optional[List[str]] = None    # restrict to these ingestions
+
+
+@dataclass
+class WriteCounts:
+    """
+    Outcome of a vector write, per record. Chunks are keyed on
+    (repo_id, canonical_id, chunk_index, content_hash); records without a
+    repo_id or canonical_id are always new.
+    """
+    new: int = 0         # nothing stored at (repo_id, canonical_id, chunk_index) yet
+    unchanged: int = 0   # same content already stored; left as is
+    replaced: int = 0    # different content at that position was swapped out
+
+    @property
+    def written(self) -> int:
+        return self.new + self.replaced
@@ -1,14 +1,16 @@
 # shared\models\vector_chunk.py
 """
-ORM model for VectorChunks table using pgvector.
-Represents embedding chunks linked to a DocumentNode.
+ORM model for the vector_chunks table using pgvector.
+Represents embedding chunks, linked to a DocumentNode when there is one.
 """
 
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, JSON, Integer, ForeignKey
+from sqlalchemy import (
+    Column, Computed, String, JSON, Integer, ForeignKey, UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship
 from shared.models.base import Base
-import uuid
 
 from pgvector.sqlalchemy import Vector  # pgvector type for SQLAlchemy
 
@@ -22,7 +24,7 @@ class VectorChunk(Base):
 
     Attributes:
         id: Primary key of the chunk.
-        vector: 768-dimensional embedding vector stored as pgvector.
+        vector: 1024-dimensional embedding vector stored as pgvector.
         ingestion_id: The ingestion request that produced this chunk.
         chunk_id: Unique identifier for the chunk within the ingestion.
         chunk_index: Sequential index of the chunk.
@@ -30,11 +32,26 @@ class VectorChunk(Base):
         chunk_text: The text content of the chunk.
         source_metadata: JSON metadata about the source.
         provider: The embedding provider or source system.
-        document_id: Foreign key linking to the parent DocumentNode.
+        document_id: Foreign key linking to the parent DocumentNode (NULL when
+            the chunk has no node).
+        repo_id: Repository the chunk belongs to (indexed search scope).
+        doc_type: Generated from source_metadata["doc_type"].
+        source_type: Generated from source_metadata["source_type"].
+        chunk_tsv: Generated full-text vector over chunk_text (lexical search).
+        content_hash: sha256 hex of chunk_text.
+        canonical_id: source_metadata["canonical_id"], the source's identity
+            within its repo; with repo_id, chunk_index and content_hash the
+            unique key idempotent writes merge on.
         document_node: SQLAlchemy relationship to DocumentNode.
     """
-    __tablename__ = "vectors"
-    __table_args__ = {"schema": "ingestion_service"}
+    __tablename__ = "vector_chunks"
+    __table_args__ = (
+        UniqueConstraint(
+            "repo_id", "canonical_id", "chunk_index", "content_hash",
+            name="uq_vector_chunks_content",
+        ),
+        {"schema": "ingestion_service"},
+    )
 
     # -----------------------------
     # Primary Key
@@ -44,7 +61,7 @@ class VectorChunk(Base):
     # -----------------------------
     # Embedding & Ingestion Metadata
     # -----------------------------
-    vector: list[float] = Column(Vector(768), nullable=False)  # pgvector column
+    vector: list[float] = Column(Vector(1024), nullable=False)  # pgvector column
     ingestion_id: str = Column(String, nullable=False)
     chunk_id: str = Column(String, nullable=False)
     chunk_index: int = Column(Integer, nullable=False)
@@ -53,6 +70,23 @@ class VectorChunk(Base):
     source_metadata: dict = Column(JSON, nullable=False, default=dict)  # fixed mutable default
     provider: str = Column(String, nullable=False, default="ollama")
 
+    # -----------------------------
+    # Search scope (see migration 20260320_scope_cols)
+    # -----------------------------
+    repo_id: str = Column(UUID(as_uuid=False), nullable=True)
+    doc_type: str = Column(String, Computed("source_metadata->>'doc_type'"))
+    source_type: str = Column(String, Computed("source_metadata->>'source_type'"))
+    chunk_tsv = Column(
+        TSVECTOR, Computed("to_tsvector('simple'::regconfig, chunk_text)")
+    )
+
+    # -----------------------------
+    # Idempotent writes (see migrations 20260510_chunk_content_hash and
+    # 20260530_chunk_canonical_key)
+    # -----------------------------
+    content_hash: str = Column(String, nullable=False)
+    canonical_id: str = Column(String, nullable=True)
+
     # -----------------------------
     # Relationship to DocumentNode
     # -----------------------------
@@ -0,0 +1,33 @@
+# shared\models\vector_collection.py
+"""
+ORM model for the vector_collections registry.
+One row per named vector collection and the chunk table holding it.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, func
+from shared.models.base import Base
+
+
+class VectorCollection(Base):
+    """
+    A named vector collection: chunks embedded by one (provider, model),
+    stored in their own table with a vector(dimension) column.
+
+    Attributes:
+        name: Collection name ("default" is vector_chunks).
+        provider: Embedding provider (e.g. 'ollama').
+        model: Embedding model name.
+        dimension: Vector dimension of the collection's table.
+        table_name: Chunk table in the ingestion_service schema.
+        created_at: When the collection was registered.
+    """
+    __tablename__ = "vector_collections"
+    __table_args__ = {"schema": "ingestion_service"}
+
+    name: str = Column(String, primary_key=True)
+    provider: str = Column(String, nullable=False)
+    model: str = Column(String, nullable=False)
+    dimension: int = Column(Integer, nullable=False)
+    table_name: str = Column(String, nullable=False, unique=True)
+    created_at: datetime = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,7 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from src.api.v1 import ingestions, vectors
+from src.core.config import (
+    close_async_vector_store,
+    close_vector_store,
+    open_async_vector_store,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_async_vector_store()
+    yield
+    # Release pooled DB connections on shutdown
+    await close_async_vector_store()
+    close_vector_store()
+
 
-app = FastAPI(title="Vector Store Service")
+app = FastAPI(title="Vector Store Service", lifespan=lifespan)
 
 app.include_router(ingestions.router)
 app.include_router(vectors.router)
@@ -1,16 +1,28 @@
 # vector_store_service/src/api/v1/vectors.py
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any, Literal, Optional
 import logging
 
-from src.core.vectorstore.pgvector_store import PgVectorStore
-from src.core.config import get_vector_store
-from shared.models.vector import VectorRecord, VectorMetadata
+from src.core.vectorstore.base import Projection
+from src.core.vectorstore.mmr import DEFAULT_FANOUT, DEFAULT_LAMBDA
+from src.core.vectorstore import ndjson
+from src.core.vectorstore.collections import find_collection
+from src.core.config import (
+    AsyncStore,
+    get_async_vector_store,
+    get_collections,
+    get_settings,
+)
+from shared.models.vector import VectorRecord, VectorMetadata, VectorQuery, WriteCounts
 
 router = APIRouter(prefix="/v1/vectors", tags=["vectors"])
 logger = logging.getLogger(__name__)
 
+# Largest k a search may ask for; MMR's k * fanout candidates too
+MAX_K = 1000
+
 class VectorMetadataAPI(BaseModel):
     ingestion_id: str
     chunk_id: str
@@ -30,18 +42,147 @@ class VectorBatchRequest(BaseModel):
 
 class VectorSearchRequest(BaseModel):
     query_vector: List[float]
-    k: int = 5
+    k: int = Field(default=5, ge=1, le=MAX_K)
+    metadata_filter: Optional[Dict[str, Any]] = None
+    # Per-query ANN recall knobs (SET LOCAL); None = server default
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000)
+    probes: Optional[int] = Field(default=None, ge=1)
+    # Embeddings are omitted from hits unless asked for
+    include_vectors: bool = False
+    # Scope: only this repository's / these ingestions' chunks are searched
+    repo_id: Optional[str] = None
+    ingestion_ids: Optional[List[str]] = Field(default=None, max_length=1000)
+    # Maximal marginal relevance: over-fetch k * fanout, keep k diverse hits;
+    # "lambda" = 1 is plain relevance order, lower favours diversity
+    mmr: bool = False
+    fanout: int = Field(default=DEFAULT_FANOUT, ge=1, le=20)
+    lambda_mult: float = Field(default=DEFAULT_LAMBDA, ge=0.0, le=1.0, alias="lambda")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class VectorBatchSearchQuery(BaseModel):
+    query_vector: List[float]
+    k: int = Field(default=5, ge=1, le=MAX_K)
+    metadata_filter: Optional[Dict[str, Any]] = None
+    repo_id: Optional[str] = None
+    ingestion_ids: Optional[List[str]] = Field(default=None, max_length=1000)
+
+class VectorBatchSearchRequest(BaseModel):
+    queries: List[VectorBatchSearchQuery] = Field(min_length=1, max_length=64)
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000)
+    probes: Optional[int] = Field(default=None, ge=1)
+    include_vectors: bool = False
+
+class HybridSearchRequest(BaseModel):
+    query_text: str = Field(min_length=1)
+    # Required for mode="hybrid"; ignored for mode="lexical"
+    query_vector: Optional[List[float]] = None
+    mode: Literal["hybrid", "lexical"] = "hybrid"
+    k: int = Field(default=5, ge=1, le=MAX_K)
+    # Candidates taken from each side before fusion (default: k)
+    vector_k: Optional[int] = Field(default=None, ge=1, le=1000)
+    lexical_k: Optional[int] = Field(default=None, ge=1, le=1000)
+    rrf_k: int = Field(default=60, ge=1)
     metadata_filter: Optional[Dict[str, Any]] = None
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000)
+    probes: Optional[int] = Field(default=None, ge=1)
+    include_vectors: bool = False
+    repo_id: Optional[str] = None
+    ingestion_ids: Optional[List[str]] = Field(default=None, max_length=1000)
 
 class VectorSearchByDocRequest(BaseModel):
     document_id: str
-    k: int = 3
+    k: int = Field(default=3, ge=1, le=MAX_K)
+    include_vectors: bool = False
+
+class VectorSearchByDocsRequest(BaseModel):
+    document_ids: List[str] = Field(max_length=1000)
+    k: int = Field(default=3, ge=1, le=MAX_K)  # chunks per document
+    include_vectors: bool = False
+
+class AnnIndexRequest(BaseModel):
+    method: Literal["hnsw", "ivfflat"] = "hnsw"
+    m: int = Field(default=16, ge=2, le=100)                  # hnsw
+    ef_construction: int = Field(default=64, ge=4, le=1000)   # hnsw
+    lists: int = Field(default=100, ge=1)                     # ivfflat
+    rebuild: bool = False
+
+def collection_store(
+    collection: Optional[str] = Query(
+        default=None,
+        description=(
+            "Vector collection: name or embedder (provider/model); "
+            "default collection if omitted"
+        ),
+    ),
+) -> AsyncStore:
+    """
+    Route dependency: the async store (VECTOR_STORE_BACKEND) of the
+    requested collection.
+    """
+    target = find_collection(get_collections(), collection)
+    if target is None:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown vector collection: {collection}"
+        )
+    return get_async_vector_store(target.name)
+
+
+def _check_dimension(store: AsyncStore, vectors: List[List[float]]) -> None:
+    """422 when a vector does not fit the collection (wrong embedder / collection)."""
+    for vector in vectors:
+        if len(vector) != store.dimension:
+            raise HTTPException(
+                status_code=422,
+                detail=(
+                    f"Vector has dimension {len(vector)}, "
+                    f"collection expects {store.dimension}"
+                ),
+            )
+
+
+def _projection(include_vectors: bool) -> Projection:
+    """Search routes read the embedding column only when the caller wants it."""
+    return Projection.FULL if include_vectors else Projection.METADATA
+
+
+def _search_result(
+    r: VectorRecord,
+    score: Optional[float] = None,
+    include_vectors: bool = False,
+) -> Dict[str, Any]:
+    """Shape one VectorRecord as a search hit in the HTTP response."""
+    hit = {
+        "chunk_id": r.metadata.chunk_id,
+        "text": r.metadata.chunk_text,
+        "document_id": r.metadata.document_id,
+        "score": r.metadata.score if score is None else score,
+        "metadata": {
+            "ingestion_id": r.metadata.ingestion_id,
+            "chunk_index": r.metadata.chunk_index,
+            "chunk_strategy": r.metadata.chunk_strategy,
+            "source_metadata": r.metadata.source_metadata,
+            "provider": r.metadata.provider,
+        },
+    }
+    if include_vectors and r.vector is not None:
+        # pgvector loads vectors as numpy arrays
+        hit["vector"] = [float(x) for x in r.vector]
+    return hit
+
 
 @router.post("/batch")
 async def add_vectors(
-    batch: VectorBatchRequest, store: PgVectorStore = Depends(get_vector_store)
+    batch: VectorBatchRequest,
+    store: AsyncStore = Depends(collection_store),
 ):
-    """Add a batch of vectors to the store."""
+    """
+    Add a batch of vectors to the store. Writes are idempotent per chunk
+    source (source_metadata repo_id + canonical_id, chunk_index, content
+    hash): the response counts records that were new, already stored
+    unchanged (re-pointed at this ingestion), or replaced changed content.
+    """
+    _check_dimension(store, [r.vector for r in batch.records])
     try:
         domain_records = []
         for api_record in batch.records:
@@ -59,9 +200,24 @@ async def add_vectors(
                 VectorRecord(vector=api_record.vector, metadata=metadata)
             )
 
-        store.add(domain_records)
-        logger.info(f"Added {len(domain_records)} vectors to store")
-        return {"status": "ok", "count": len(domain_records)}
+        if len(domain_records) >= get_settings().BULK_INSERT_THRESHOLD:
+            counts = await store.add_bulk(domain_records)
+            mode = "copy"
+        else:
+            counts = await store.add(domain_records)
+            mode = "insert"
+        logger.info(
+            f"Added {len(domain_records)} vectors to store ({mode}): {counts.new} new, "
+            f"{counts.unchanged} unchanged, {counts.replaced} replaced"
+        )
+        return {
+            "status": "ok",
+            "count": len(domain_records),
+            "mode": mode,
+            "new": counts.new,
+            "unchanged": counts.unchanged,
+            "replaced": counts.replaced,
+        }
     except Exception as e:
         logger.error(f"Error adding vectors: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -69,47 +225,263 @@ async def add_vectors(
 
 @router.post("/search")
 async def similarity_search(
-    request: VectorSearchRequest, store: PgVectorStore = Depends(get_vector_store)
+    request: VectorSearchRequest,
+    store: AsyncStore = Depends(collection_store),
 ):
-    """Search for similar vectors - MS6 RAG compatible."""
+    """
+    Search for similar vectors - MS6 RAG compatible. With mmr=true the
+    k * fanout nearest chunks are diversified down to k by maximal
+    marginal relevance (lambda trades relevance for diversity).
+    """
+    _check_dimension(store, [request.query_vector])
+    if request.mmr and request.k * request.fanout > MAX_K:
+        raise HTTPException(
+            status_code=422,
+            detail=f"mmr fetches k * fanout candidates; keep it at most {MAX_K}",
+        )
     try:
         logger.debug("similarity_search: searching vector store")
-        results = store.similarity_search(
-            request.query_vector,
-            request.k,
-            metadata_filter=request.metadata_filter,
-        )
+        projection = _projection(request.include_vectors)
+        if request.mmr:
+            results = await store.similarity_search_mmr(
+                request.query_vector,
+                request.k,
+                fanout=request.fanout,
+                lambda_mult=request.lambda_mult,
+                metadata_filter=request.metadata_filter,
+                ef_search=request.ef_search,
+                probes=request.probes,
+                projection=projection,
+                repo_id=request.repo_id,
+                ingestion_ids=request.ingestion_ids,
+            )
+        else:
+            results = await store.similarity_search(
+                request.query_vector,
+                request.k,
+                request.metadata_filter,
+                ef_search=request.ef_search,
+                probes=request.probes,
+                projection=projection,
+                repo_id=request.repo_id,
+                ingestion_ids=request.ingestion_ids,
+            )
 
+        # score is the real cosine similarity (1 - cosine_distance)
         return {
             "results": [
-                {
-                    "chunk_id": r.metadata.chunk_id,
-                    "text": r.metadata.chunk_text,
-                    "document_id": r.metadata.document_id,
-                    "score": r.metadata.score,          # real cosine similarity score
-                    "metadata": {
-                        "ingestion_id": r.metadata.ingestion_id,
-                        "chunk_index": r.metadata.chunk_index,
-                        "chunk_strategy": r.metadata.chunk_strategy,
-                        "source_metadata": r.metadata.source_metadata,
-                        "provider": r.metadata.provider,
-                    },
-                }
+                _search_result(r, include_vectors=request.include_vectors)
                 for r in results
             ]
         }
+    except ValueError as e:
+        # malformed metadata_filter (unknown operator, bad range bounds)
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching vectors: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/batch")
+async def similarity_search_batch(
+    request: VectorBatchSearchRequest,
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Run N similarity searches (each with its own k and metadata_filter)
+    in one DB round trip. results[i] holds the hits for queries[i].
+    """
+    _check_dimension(store, [q.query_vector for q in request.queries])
+    try:
+        queries = [
+            VectorQuery(
+                query_vector=q.query_vector,
+                k=q.k,
+                metadata_filter=q.metadata_filter,
+                repo_id=q.repo_id,
+                ingestion_ids=q.ingestion_ids,
+            )
+            for q in request.queries
+        ]
+        results = await store.similarity_search_batch(
+            queries,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            projection=_projection(request.include_vectors),
+        )
+        return {
+            "results": [
+                [
+                    _search_result(r, include_vectors=request.include_vectors)
+                    for r in hits
+                ]
+                for hits in results
+            ]
+        }
+    except ValueError as e:
+        # malformed metadata_filter (unknown operator, bad range bounds)
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in batch vector search: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/hybrid-search")
+async def hybrid_search(
+    request: HybridSearchRequest,
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Lexical (full-text on chunk_tsv) or hybrid search. In hybrid mode the
+    vector and lexical candidate lists are fused with reciprocal rank
+    fusion in one DB round trip; score is the RRF score (lexical mode:
+    the ts_rank_cd text rank).
+    """
+    if request.mode == "hybrid" and not request.query_vector:
+        raise HTTPException(
+            status_code=422, detail="query_vector is required for hybrid mode"
+        )
+    if request.mode == "hybrid":
+        _check_dimension(store, [request.query_vector])
+    try:
+        projection = _projection(request.include_vectors)
+        if request.mode == "lexical":
+            results = await store.lexical_search(
+                request.query_text,
+                request.k,
+                metadata_filter=request.metadata_filter,
+                projection=projection,
+                repo_id=request.repo_id,
+                ingestion_ids=request.ingestion_ids,
+            )
+        else:
+            results = await store.hybrid_search(
+                request.query_vector,
+                request.query_text,
+                request.k,
+                vector_k=request.vector_k,
+                lexical_k=request.lexical_k,
+                rrf_k=request.rrf_k,
+                metadata_filter=request.metadata_filter,
+                ef_search=request.ef_search,
+                probes=request.probes,
+                projection=projection,
+                repo_id=request.repo_id,
+                ingestion_ids=request.ingestion_ids,
+            )
+        return {
+            "mode": request.mode,
+            "results": [
+                _search_result(r, include_vectors=request.include_vectors)
+                for r in results
+            ],
+        }
+    except ValueError as e:
+        # malformed metadata_filter (unknown operator, bad range bounds)
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in hybrid search: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export")
+async def export_vectors(
+    ingestion_id: Optional[str] = None,
+    repo_id: Optional[str] = None,
+    batch_size: int = Query(default=1000, ge=1, le=10000),
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Stream an ingestion's / a repository's chunks, embeddings included, as
+    NDJSON (one /batch-shaped record per line; see ndjson). Rows come from
+    a server-side cursor batch_size at a time, so memory stays flat. Feed
+    the output to POST /import to restore or move vectors without
+    re-embedding.
+    """
+    if ingestion_id is None and repo_id is None:
+        raise HTTPException(
+            status_code=422, detail="ingestion_id or repo_id is required"
+        )
+
+    async def lines():
+        # Headers are already sent once streaming starts, so a failure can
+        # only end the body early; it is logged here.
+        exported = 0
+        try:
+            async for batch in store.export_chunks(
+                ingestion_id=ingestion_id, repo_id=repo_id, batch_size=batch_size
+            ):
+                exported += len(batch)
+                yield "".join(ndjson.encode_record(r) for r in batch)
+        except Exception as e:
+            logger.error(f"Error exporting vectors after {exported} records: {e}")
+            raise
+        logger.info(
+            f"Exported {exported} vectors (ingestion {ingestion_id}, repo {repo_id})"
+        )
+
+    return StreamingResponse(lines(), media_type=ndjson.MEDIA_TYPE)
+
+
+@router.post("/import")
+async def import_vectors(
+    request: Request,
+    batch_size: int = Query(default=1000, ge=1, le=10000),
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Load an NDJSON export (request body) through the bulk COPY write path,
+    batch_size records per transaction, parsing the body as it streams
+    in. Writes are idempotent, so a failed import can simply be re-sent;
+    batches before the failure stay committed.
+    """
+    totals = WriteCounts()
+    try:
+        async for batch in ndjson.decode_stream(request.stream(), batch_size):
+            if any(
+                r.vector is None or len(r.vector) != store.dimension for r in batch
+            ):
+                raise ValueError(
+                    f"record vectors do not have dimension {store.dimension}"
+                )
+            counts = await store.add_bulk(batch)
+            totals.new += counts.new
+            totals.unchanged += counts.unchanged
+            totals.replaced += counts.replaced
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"{e} ({totals.new + totals.unchanged + totals.replaced}"
+                " records imported)"
+            ),
+        )
+    except Exception as e:
+        logger.error(f"Error importing vectors: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    count = totals.new + totals.unchanged + totals.replaced
+    logger.info(
+        f"Imported {count} vectors: {totals.new} new, "
+        f"{totals.unchanged} unchanged, {totals.replaced} replaced"
+    )
+    return {
+        "status": "ok",
+        "count": count,
+        "new": totals.new,
+        "unchanged": totals.unchanged,
+        "replaced": totals.replaced,
+    }
+
+
 @router.delete("/by-ingestion/{ingestion_id}")
 async def delete_by_ingestion(
-    ingestion_id: str, store: PgVectorStore = Depends(get_vector_store)
+    ingestion_id: str,
+    store: AsyncStore = Depends(collection_store),
 ):
     """Delete all vectors for a given ingestion_id."""
     try:
-        store.delete_by_ingestion_id(ingestion_id)
+        await store.delete_by_ingestion_id(ingestion_id)
         logger.info(f"Deleted vectors for ingestion_id: {ingestion_id}")
         return {"status": "deleted", "ingestion_id": ingestion_id}
     except Exception as e:
@@ -117,32 +489,195 @@ async def delete_by_ingestion(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.delete("/by-repo/{repo_id}")
+async def delete_by_repo(
+    repo_id: str,
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Delete all vector_chunks of a repository before it is re-ingested —
+    a partition drop when vector_chunks is partitioned by repo.
+    """
+    try:
+        result = await store.delete_by_repo_id(repo_id)
+        logger.info(f"Deleted vector chunks for repo_id: {repo_id} ({result['mode']})")
+        return {"status": "deleted", **result}
+    except Exception as e:
+        logger.error(f"Error deleting vectors for repo {repo_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/search-by-doc")
 async def search_by_document(
     request: VectorSearchByDocRequest,
-    store: PgVectorStore = Depends(get_vector_store)
+    store: AsyncStore = Depends(collection_store)
 ):
     """Return chunks for a specific document_id — used for graph expansion."""
     try:
-        results = store.get_chunks_by_document_id(request.document_id, request.k)
+        results = await store.get_chunks_by_document_id(
+            request.document_id,
+            request.k,
+            projection=_projection(request.include_vectors),
+        )
+        # no similarity computed for doc fetch, treat as full match
         return {
             "results": [
-                {
-                    "chunk_id": r.metadata.chunk_id,
-                    "text": r.metadata.chunk_text,
-                    "document_id": r.metadata.document_id,
-                    "score": 1.0,   # no similarity computed for doc fetch, treat as full match
-                    "metadata": {
-                        "ingestion_id": r.metadata.ingestion_id,
-                        "chunk_index": r.metadata.chunk_index,
-                        "chunk_strategy": r.metadata.chunk_strategy,
-                        "source_metadata": r.metadata.source_metadata,
-                        "provider": r.metadata.provider,
-                    },
-                }
+                _search_result(r, score=1.0, include_vectors=request.include_vectors)
                 for r in results
             ]
         }
     except Exception as e:
         logger.error(f"Error fetching chunks by document_id: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search-by-docs")
+async def search_by_documents(
+    request: VectorSearchByDocsRequest,
+    store: AsyncStore = Depends(collection_store)
+):
+    """
+    Return up to k chunks for each of many document_ids in one query —
+    batched form of /search-by-doc for graph expansion.
+    results maps document_id → hits; documents without chunks are omitted.
+    """
+    try:
+        by_doc = await store.get_chunks_by_document_ids(
+            request.document_ids,
+            request.k,
+            projection=_projection(request.include_vectors),
+        )
+        return {
+            "results": {
+                doc_id: [
+                    _search_result(
+                        r, score=1.0, include_vectors=request.include_vectors
+                    )
+                    for r in records
+                ]
+                for doc_id, records in by_doc.items()
+            }
+        }
+    except Exception as e:
+        logger.error(f"Error fetching chunks by document_ids: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def vector_store_stats(
+    tables: bool = Query(
+        default=True, description="Include table / index / per-repo statistics"
+    ),
+    exact_repo_counts: bool = Query(
+        default=False,
+        description="Exact chunk counts per repo (scans the table), not estimates",
+    ),
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Connection pool metrics (size, in-use, wait time, timeouts), latency
+    histograms (p50 / p95 / p99 per operation and filter shape), query cache
+    hits / misses and, unless
+    tables=false, row counts per table / partition and repo, dead tuples,
+    sequential vs index scans and index types / sizes. Per-repo counts are
+    planner estimates unless exact_repo_counts=true.
+    """
+    try:
+        stats = {
+            "pool": store.pool_stats(),
+            "latency": store.latency_stats(),
+            "query_cache": store.query_cache_stats(),
+        }
+        if tables:
+            stats.update(await store.table_stats(exact_repo_counts=exact_repo_counts))
+        return stats
+    except Exception as e:
+        logger.error(f"Error collecting vector store stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/collections")
+async def list_collections():
+    """Configured vector collections: embedder, dimension and chunk table."""
+    return {
+        "collections": [
+            {
+                "name": c.name,
+                "provider": c.provider,
+                "model": c.model,
+                "dimension": c.dimension,
+                "table": c.table,
+            }
+            for c in get_collections().values()
+        ]
+    }
+
+
+@router.get("/health")
+async def vector_store_health(
+    store: AsyncStore = Depends(collection_store),
+):
+    """Pool health check — pings idle connections and drops broken ones."""
+    try:
+        await store.check_pool()
+        return {"status": "ok", "pool": store.pool_stats()}
+    except Exception as e:
+        logger.error(f"Vector store health check failed: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/admin/indexes")
+async def list_ann_indexes(
+    store: AsyncStore = Depends(collection_store),
+):
+    """List the ANN indexes on the collection's chunk table (method, validity, size)."""
+    try:
+        return {"indexes": await store.list_indexes()}
+    except Exception as e:
+        logger.error(f"Error listing ANN indexes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/admin/indexes", status_code=202)
+async def build_ann_index(
+    request: AnnIndexRequest,
+    background_tasks: BackgroundTasks,
+    store: AsyncStore = Depends(collection_store),
+):
+    """
+    Build or rebuild an ANN index with CREATE INDEX CONCURRENTLY.
+    Runs in the background; poll GET /admin/indexes until it shows valid.
+    """
+    async def _build() -> None:
+        try:
+            await store.build_index(
+                request.method,
+                m=request.m,
+                ef_construction=request.ef_construction,
+                lists=request.lists,
+                rebuild=request.rebuild,
+                maintenance_work_mem=get_settings().ANN_INDEX_MAINTENANCE_WORK_MEM,
+            )
+        except Exception as e:
+            logger.error(f"ANN index build failed ({request.method}): {e}")
+
+    background_tasks.add_task(_build)
+    return {
+        "status": "building",
+        "index": store.ann_index_name(request.method),
+        "method": request.method,
+    }
+
+
+@router.delete("/admin/indexes/{method}")
+async def drop_ann_index(
+    method: Literal["hnsw", "ivfflat"],
+    store: AsyncStore = Depends(collection_store),
+):
+    """Drop an ANN index (concurrently)."""
+    try:
+        await store.drop_index(method)
+        return {"status": "dropped", "index": store.ann_index_name(method)}
+    except Exception as e:
+        logger.error(f"Error dropping ANN index {method}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
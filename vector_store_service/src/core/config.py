@@ -1,10 +1,25 @@
 # vector_store_service/src/core/config.py
 from functools import lru_cache
+from typing import Any, Dict, Literal, Union
 import os
+import threading
 
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from src.core.vectorstore.pgvector_store import PgVectorStore
+from src.core.vectorstore.base import VectorStore
+from src.core.vectorstore.collections import (
+    DEFAULT_COLLECTION,
+    Collection,
+    build_collections,
+)
+from src.core.vectorstore.async_numpy_store import AsyncNumpyVectorStore
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from src.core.vectorstore.pgvector_store import PgVectorStore, configure_connection
+from src.core.vectorstore.async_pgvector_store import (
+    AsyncPgVectorStore,
+    configure_async_connection,
+)
 
 
 class Settings(BaseSettings):
@@ -16,6 +31,61 @@ class Settings(BaseSettings):
     OLLAMA_BATCH_SIZE: int = 50
     VECTOR_DIMENSION: int = 1024  # mxbai-embed-large; set in .env to override
 
+    # Extra named collections, one chunk table each (JSON):
+    # {"<name>": {"provider": ..., "model": ..., "dimension": ...}}. The
+    # default collection is vector_chunks with the embedder settings above.
+    VECTOR_COLLECTIONS: Dict[str, Dict[str, Any]] = {}
+
+    # -------------------------------------------------
+    # Connection pool (psycopg_pool)
+    # -------------------------------------------------
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 30.0      # seconds a request waits for a connection
+    DB_POOL_MAX_IDLE: float = 600.0    # seconds before an idle connection is closed
+    DB_POOL_CHECK: bool = True         # ping connections before handing them out
+
+    # /v1/vectors/batch switches to binary COPY at or above this many records
+    BULK_INSERT_THRESHOLD: int = 200
+
+    # maintenance_work_mem for ANN index builds (e.g. "1GB"); None = server default
+    ANN_INDEX_MAINTENANCE_WORK_MEM: str | None = None
+
+    # vector_chunks is LIST-partitioned by repo_id (migrate with
+    # `alembic -x partition_vector_chunks=true upgrade head` first)
+    VECTOR_CHUNKS_PARTITIONED: bool = False
+
+    # "chunks_only": write vector_chunks only (required once migration
+    # 20260610_drop_vectors has dropped the legacy vectors table).
+    # "dual": also write every record to vectors, for readers still on it.
+    VECTOR_WRITE_MODE: Literal["dual", "chunks_only"] = "chunks_only"
+
+    # ANN index / candidate precision: "halfvec" or "binary" index a
+    # quantized expression and rerank VECTOR_RERANK_FACTOR * k candidates on
+    # the float32 vectors (rebuild the index via /admin/indexes after changing)
+    VECTOR_QUANTIZATION: Literal["none", "halfvec", "binary"] = "none"
+    VECTOR_RERANK_FACTOR: int = 4
+
+    # Filtered search plan: "prefilter" (selective filter: its indexes first,
+    # or a wide iterative HNSW scan), "postfilter" (ANN scan with iterative
+    # filtering) or "auto" (prefilter when the filter is estimated to match
+    # <= VECTOR_PREFILTER_MAX_ROWS rows; decided once per filter shape)
+    VECTOR_FILTER_STRATEGY: Literal["auto", "prefilter", "postfilter"] = "auto"
+    VECTOR_PREFILTER_MAX_ROWS: int = 10000
+
+    # similarity_search result cache per collection (LRU, entries expire
+    # after the TTL; dropped on every write through this process). Opt-in:
+    # another worker's writes are only seen once the TTL expires, so it is
+    # off (0) unless a size is set.
+    VECTOR_QUERY_CACHE_SIZE: int = 0
+    VECTOR_QUERY_CACHE_TTL: float = 300.0
+
+    # Store backend of the routes and get_vector_store(): "pgvector" (Postgres)
+    # or "numpy" (in-process memory-mapped segment under NUMPY_STORE_PATH;
+    # laptops / CI — no database pool is opened)
+    VECTOR_STORE_BACKEND: Literal["pgvector", "numpy"] = "pgvector"
+    NUMPY_STORE_PATH: str = "./data/vector_store"
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -29,16 +99,175 @@ def get_settings() -> Settings:
 
 
 @lru_cache()
-def get_vector_store() -> PgVectorStore:
-    """Dependency that provides the vector store instance."""
+def get_collections() -> Dict[str, Collection]:
+    """Configured vector collections by name (the default one included)."""
+    settings = get_settings()
+    default = Collection(
+        name=DEFAULT_COLLECTION,
+        provider=settings.EMBEDDING_PROVIDER,
+        model=settings.OLLAMA_EMBED_MODEL,
+        dimension=settings.VECTOR_DIMENSION,
+    )
+    return build_collections(default, settings.VECTOR_COLLECTIONS)
+
+
+def _store_options(collection: Collection) -> Dict[str, Any]:
+    """PgVectorStore / AsyncPgVectorStore settings for one collection."""
+    settings = get_settings()
+    # The legacy vectors table only ever held the default embedder's rows
+    write_mode = settings.VECTOR_WRITE_MODE if collection.is_default else "chunks_only"
+    return {
+        "dimension": collection.dimension,
+        "provider": collection.provider,
+        "partitioned": settings.VECTOR_CHUNKS_PARTITIONED,
+        "write_mode": write_mode,
+        "quantization": settings.VECTOR_QUANTIZATION,
+        "rerank_factor": settings.VECTOR_RERANK_FACTOR,
+        "filter_strategy": settings.VECTOR_FILTER_STRATEGY,
+        "prefilter_max_rows": settings.VECTOR_PREFILTER_MAX_ROWS,
+        "collection": collection,
+        "query_cache_size": settings.VECTOR_QUERY_CACHE_SIZE,
+        "query_cache_ttl": settings.VECTOR_QUERY_CACHE_TTL,
+    }
+
+
+@lru_cache()
+def _sync_pool() -> ConnectionPool:
+    """Connection pool shared by the sync stores of every collection."""
+    settings = get_settings()
+    return ConnectionPool(
+        conninfo=settings.DATABASE_URL,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        timeout=settings.DB_POOL_TIMEOUT,
+        max_idle=settings.DB_POOL_MAX_IDLE,
+        check=ConnectionPool.check_connection if settings.DB_POOL_CHECK else None,
+        configure=configure_connection,
+        name="vector_store",
+        open=True,
+    )
+
+
+# Sync stores by collection name, built on first use
+_vector_stores: Dict[str, VectorStore] = {}
+_vector_stores_lock = threading.Lock()
+
+
+@lru_cache()
+def _numpy_store(collection: str) -> NumpyVectorStore:
+    """
+    NumpyVectorStore of a collection (one segment directory each), shared
+    by the sync getter and the routes' async wrapper: a segment has a
+    single writer per process.
+    """
     settings = get_settings()
+    target = get_collections()[collection]
+    path = settings.NUMPY_STORE_PATH
+    if not target.is_default:
+        path = os.path.join(path, target.name)
+    return NumpyVectorStore(
+        path=path, dimension=target.dimension, provider=target.provider
+    )
+
+
+def get_vector_store(collection: str = DEFAULT_COLLECTION) -> VectorStore:
+    """
+    Synchronous store singleton per collection (scripts / benchmarks; routes
+    use the async one). VECTOR_STORE_BACKEND picks PgVectorStore or the
+    in-process NumpyVectorStore (one segment directory per collection).
+    Raises KeyError for an unknown collection.
+    """
+    store = _vector_stores.get(collection)
+    if store is not None:
+        return store
+
+    with _vector_stores_lock:
+        store = _vector_stores.get(collection)
+        if store is not None:
+            return store
 
-    dsn = settings.DATABASE_URL
-    dimension = settings.VECTOR_DIMENSION
-    provider = settings.EMBEDDING_PROVIDER
+        settings = get_settings()
+        target = get_collections()[collection]
+        if settings.VECTOR_STORE_BACKEND == "numpy":
+            store = _numpy_store(target.name)
+        else:
+            pg_store = PgVectorStore(
+                dsn=settings.DATABASE_URL, pool=_sync_pool(), **_store_options(target)
+            )
+            pg_store.ensure_collection()
+            store = pg_store
 
-    return PgVectorStore(
-        dsn=dsn,
-        dimension=dimension,
-        provider=provider,
+        _vector_stores[collection] = store
+        return store
+
+
+def close_vector_store() -> None:
+    """Close the sync stores and their shared pool (app shutdown)."""
+    with _vector_stores_lock:
+        stores = list(_vector_stores.values())
+        _vector_stores.clear()
+    for store in stores:
+        store.close()
+    _numpy_store.cache_clear()
+    _sync_pool.cache_clear()
+
+
+@lru_cache()
+def _async_pool() -> AsyncConnectionPool:
+    """Connection pool shared by the async stores of every collection."""
+    settings = get_settings()
+    # Opened in the app lifespan (an async pool needs the running loop).
+    return AsyncConnectionPool(
+        conninfo=settings.DATABASE_URL,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        timeout=settings.DB_POOL_TIMEOUT,
+        max_idle=settings.DB_POOL_MAX_IDLE,
+        check=AsyncConnectionPool.check_connection if settings.DB_POOL_CHECK else None,
+        configure=configure_async_connection,
+        name="vector_store_async",
+        open=False,
     )
+
+
+# What the routes work with: same method surface on both backends
+AsyncStore = Union[AsyncPgVectorStore, AsyncNumpyVectorStore]
+
+
+@lru_cache()
+def get_async_vector_store(collection: str = DEFAULT_COLLECTION) -> AsyncStore:
+    """
+    Async store of a collection for the routes (they resolve ?collection=
+    to a name first), on the VECTOR_STORE_BACKEND backend. Raises KeyError
+    for an unknown collection.
+    """
+    settings = get_settings()
+    if settings.VECTOR_STORE_BACKEND == "numpy":
+        return AsyncNumpyVectorStore(_numpy_store(get_collections()[collection].name))
+    return AsyncPgVectorStore(
+        dsn=settings.DATABASE_URL,
+        pool=_async_pool(),
+        **_store_options(get_collections()[collection]),
+    )
+
+
+async def open_async_vector_store() -> None:
+    """
+    App startup, pgvector backend: open the shared async pool and create
+    missing collection tables. The numpy backend opens segments on first use.
+    """
+    if get_settings().VECTOR_STORE_BACKEND != "pgvector":
+        return
+    await _async_pool().open()
+    for name in get_collections():
+        store = get_async_vector_store(name)
+        if isinstance(store, AsyncPgVectorStore):
+            await store.ensure_collection()
+
+
+async def close_async_vector_store() -> None:
+    """Close the shared async pool, if it was opened (app shutdown)."""
+    if _async_pool.cache_info().currsize:
+        await _async_pool().close()
+    get_async_vector_store.cache_clear()
+    _async_pool.cache_clear()
@@ -3,17 +3,29 @@
 from shared.models.vector import (
     VectorRecord,
     VectorMetadata,
+    VectorQuery,
 )
 
 from src.core.vectorstore.base import (
+    AsyncVectorStore,
+    Projection,
     VectorStore,
 )
 
 from src.core.vectorstore.pgvector_store import PgVectorStore
+from src.core.vectorstore.async_pgvector_store import AsyncPgVectorStore
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from src.core.vectorstore.async_numpy_store import AsyncNumpyVectorStore
 
 __all__ = [
+    "AsyncVectorStore",
+    "Projection",
     "VectorStore",
     "VectorRecord",
     "VectorMetadata",
+    "VectorQuery",
     "PgVectorStore",
+    "AsyncPgVectorStore",
+    "NumpyVectorStore",
+    "AsyncNumpyVectorStore",
 ]
@@ -0,0 +1,209 @@
+# src/core/vectorstore/async_numpy_store.py
+"""
+AsyncVectorStore over a NumpyVectorStore, for the API routes when
+VECTOR_STORE_BACKEND=numpy.
+
+Every call runs on a worker thread (asyncio.to_thread), so an exhaustive
+scan over the segment does not hold the event loop. The method surface is
+AsyncPgVectorStore's; Postgres-only features (full-text / hybrid search,
+ANN index management) raise NotImplementedError.
+"""
+from __future__ import annotations
+import asyncio
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, List, NoReturn, Optional, Sequence,
+)
+
+from src.core.vectorstore.base import AsyncVectorStore, Projection
+from src.core.vectorstore.latency import LatencyRecorder, filter_shape
+from src.core.vectorstore.mmr import DEFAULT_FANOUT, DEFAULT_LAMBDA
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from shared.models.vector import VectorQuery, VectorRecord, WriteCounts
+
+
+def _unsupported(operation: str) -> NoReturn:
+    raise NotImplementedError(f"{operation} needs VECTOR_STORE_BACKEND=pgvector")
+
+
+class AsyncNumpyVectorStore(AsyncVectorStore):
+    def __init__(self, store: NumpyVectorStore) -> None:
+        self._store = store
+        # add / similarity_search / get_chunks_by_document_id latency (stats endpoint)
+        self._latency = LatencyRecorder()
+
+    @property
+    def dimension(self) -> int:
+        return self._store.dimension
+
+    async def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        with self._latency.time("add", "insert"):
+            return await asyncio.to_thread(self._store.add, list(records))
+
+    async def add_bulk(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        with self._latency.time("add", "copy"):
+            return await asyncio.to_thread(self._store.add_bulk, list(records))
+
+    async def persist(self, records: list[VectorRecord]) -> None:
+        await self.add(records)
+
+    async def similarity_search(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        shape = filter_shape(metadata_filter, repo_id, ingestion_ids)
+        with self._latency.time("similarity_search", shape):
+            return await asyncio.to_thread(
+                self._store.similarity_search,
+                query_vector, k, metadata_filter,
+                ef_search=ef_search, probes=probes, projection=projection,
+                repo_id=repo_id, ingestion_ids=ingestion_ids,
+            )
+
+    async def similarity_search_mmr(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        fanout: int = DEFAULT_FANOUT,
+        lambda_mult: float = DEFAULT_LAMBDA,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        return await asyncio.to_thread(
+            self._store.similarity_search_mmr,
+            query_vector, k, fanout, lambda_mult, metadata_filter,
+            ef_search=ef_search, probes=probes, projection=projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+
+    async def similarity_search_batch(
+        self,
+        queries: Sequence[VectorQuery],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+    ) -> List[List[VectorRecord]]:
+        return await asyncio.to_thread(
+            self._store.similarity_search_batch,
+            queries, ef_search=ef_search, probes=probes, projection=projection,
+        )
+
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        _unsupported("lexical search")
+
+    async def hybrid_search(
+        self,
+        query_vector: Sequence[float],
+        query_text: str,
+        k: int,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: Optional[int] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        _unsupported("hybrid search")
+
+    async def export_chunks(
+        self,
+        ingestion_id: Optional[str] = None,
+        repo_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[VectorRecord]]:
+        batches = self._store.export_chunks(ingestion_id, repo_id, batch_size)
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            yield batch
+
+    async def get_chunks_by_document_id(
+        self,
+        document_id: str,
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> List[VectorRecord]:
+        with self._latency.time("get_chunks_by_document_id", "document_id"):
+            return await asyncio.to_thread(
+                self._store.get_chunks_by_document_id, document_id, k, projection
+            )
+
+    async def get_chunks_by_document_ids(
+        self,
+        document_ids: Sequence[str],
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> Dict[str, List[VectorRecord]]:
+        return await asyncio.to_thread(
+            self._store.get_chunks_by_document_ids, document_ids, k, projection
+        )
+
+    async def delete_by_ingestion_id(self, ingestion_id: str) -> None:
+        await asyncio.to_thread(self._store.delete_by_ingestion_id, ingestion_id)
+
+    async def delete_by_repo_id(self, repo_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._store.delete_by_repo_id, repo_id)
+
+    # ------------------------------------------------------------------
+    # Stats / lifecycle (same surface as AsyncPgVectorStore)
+    # ------------------------------------------------------------------
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._store.pool_stats()
+
+    def latency_stats(self) -> Dict[str, Any]:
+        return self._latency.snapshot()
+
+    def query_cache_stats(self) -> Dict[str, Any]:
+        # Searches are in-process scans already; there is no result cache
+        return {"enabled": False}
+
+    async def table_stats(self, exact_repo_counts: bool = False) -> Dict[str, Any]:
+        return {"rows": len(self._store)}
+
+    async def check_pool(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._store.close)
+
+    async def list_indexes(self) -> List[Dict[str, Any]]:
+        # Exact search: there are no ANN indexes
+        return []
+
+    def ann_index_name(self, method: str) -> str:
+        _unsupported("ANN indexes")
+
+    async def build_index(
+        self,
+        method: str = "hnsw",
+        *,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        rebuild: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        _unsupported("ANN indexes")
+
+    async def drop_index(self, method: str) -> None:
+        _unsupported("ANN indexes")
@@ -0,0 +1,523 @@
+# src/core/vectorstore/async_pgvector_store.py
+from __future__ import annotations
+from contextlib import asynccontextmanager
+from typing import Sequence, Iterable, AsyncIterator, List, Optional, Dict, Any
+import psycopg
+from psycopg_pool import AsyncConnectionPool
+from pgvector.psycopg import register_vector_async
+import logging
+
+from src.core.vectorstore.base import AsyncVectorStore, Projection
+from src.core.vectorstore.latency import filter_shape
+from src.core.vectorstore.mmr import (
+    DEFAULT_FANOUT, DEFAULT_LAMBDA, candidate_projection, mmr_rerank,
+)
+from src.core.vectorstore.pg_queries import PgVectorQueries
+from shared.models.vector import VectorRecord, VectorQuery, WriteCounts
+
+
+async def configure_async_connection(conn: psycopg.AsyncConnection) -> None:
+    """Async twin of pgvector_store.configure_connection (pool configure callback)."""
+    if conn.adapters.types.get("vector") is None:
+        await register_vector_async(conn)
+
+
+class AsyncPgVectorStore(PgVectorQueries, AsyncVectorStore):
+    """
+    PgVectorStore on psycopg.AsyncConnection / AsyncConnectionPool.
+
+    Same SQL and semantics as PgVectorStore (both build statements through
+    PgVectorQueries); every database call is awaited, so a slow query only
+    holds its own request instead of the whole event loop.
+    """
+
+    _pool: Optional[AsyncConnectionPool]
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """
+        Borrow a connection from the pool, or open a one-off connection
+        when the store was built without a pool (scripts, tests).
+        Either way the block runs in a single transaction committed on exit.
+        """
+        if self._pool is not None:
+            async with self._pool.connection() as conn:
+                yield conn
+        else:
+            async with await psycopg.AsyncConnection.connect(self._dsn) as conn:
+                await configure_async_connection(conn)
+                yield conn
+
+    async def open(self) -> None:
+        """Open the pool and wait for min_size connections (app startup)."""
+        if self._pool is not None:
+            await self._pool.open(wait=True)
+
+    async def close(self) -> None:
+        """Close the connection pool, if any."""
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def table_stats(self, exact_repo_counts: bool = False) -> Dict[str, Any]:
+        """
+        Row counts, dead tuples, scans and index sizes (see
+        PgVectorStore.table_stats).
+        """
+        params = self._stats_params()
+        repo_query, repo_params = self._repo_counts_statement(exact_repo_counts)
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(self._TABLE_STATS_SQL, params)
+                tables = self._table_stats_rows(await cur.fetchall())
+                await cur.execute(self._INDEX_STATS_SQL, params)
+                indexes = self._index_stats_rows(await cur.fetchall())
+                await cur.execute(repo_query, repo_params)
+                repos = self._repo_count_rows(await cur.fetchall())
+        return {
+            "tables": tables,
+            "indexes": indexes,
+            "repos": repos,
+            "repo_counts": "exact" if exact_repo_counts else "estimate",
+        }
+
+    async def check_pool(self) -> None:
+        """Health check: verify idle pooled connections, dropping broken ones."""
+        if self._pool is not None:
+            await self._pool.check()
+
+    async def persist(self, records: list[VectorRecord]) -> None:
+        await self.add(records)
+
+    async def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """Idempotent per-record write path (see PgVectorStore.add)."""
+        records = list(records)
+        chunks = [r for r in records if self._writes_chunk(r)]
+        vectors_sql = self._insert_vectors_sql()
+        repo_ids = await self._prepare_partitions(records)
+
+        counts = WriteCounts(new=len(records) - len(chunks))
+        with self._latency.time("add", "insert"):
+            async with self._connection() as conn:
+                async with conn.cursor() as cur:
+                    if repo_ids is None:
+                        repo_ids = await self._resolve_repo_ids(cur, records)
+                    if self._dual_write:
+                        for record in records:
+                            await cur.execute(vectors_sql, self._insert_params(record))
+                    if chunks:
+                        await cur.execute(self._create_staging_sql())
+                        await cur.executemany(
+                            self._insert_chunks_sql(),
+                            [self._insert_chunk_params(r, repo_ids) for r in chunks],
+                        )
+                        await cur.execute(self._merge_chunks_sql())
+                        counts = self._write_counts(await cur.fetchone(), counts.new)
+        return self._finish_write("WRITE", records, counts)
+
+    async def add_bulk(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """Binary COPY write path for large batches (see PgVectorStore.add_bulk)."""
+        records = list(records)
+        if not records:
+            return WriteCounts()
+
+        copy_vectors = self._copy_sql("vectors", self._COPY_COLUMNS)
+        chunks = [r for r in records if self._writes_chunk(r)]
+
+        repo_ids = await self._prepare_partitions(records)
+
+        counts = WriteCounts(new=len(records) - len(chunks))
+        with self._latency.time("add", "copy"):
+            async with self._connection() as conn:
+                async with conn.cursor() as cur:
+                    if repo_ids is None:
+                        repo_ids = await self._resolve_repo_ids(cur, records)
+                    if self._dual_write:
+                        async with cur.copy(copy_vectors) as copy:
+                            copy.set_types(self._COPY_TYPES)
+                            for record in records:
+                                await copy.write_row(self._copy_row(record))
+
+                    if chunks:
+                        await cur.execute(self._create_staging_sql())
+                        async with cur.copy(self._copy_staging_sql()) as copy:
+                            copy.set_types(self._COPY_CHUNK_TYPES)
+                            for record in chunks:
+                                await copy.write_row(
+                                    self._copy_chunk_row(record, repo_ids)
+                                )
+                        await cur.execute(self._merge_chunks_sql())
+                        counts = self._write_counts(await cur.fetchone(), counts.new)
+        return self._finish_write("BULK COPY", records, counts)
+
+    async def similarity_search(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        Cosine similarity search over vector_chunks (see
+        PgVectorStore.similarity_search).
+        """
+        cache_key, cached, generation = self._cached_search(
+            query_vector, k, metadata_filter, ef_search, probes, projection,
+            repo_id, ingestion_ids,
+        )
+        if cached is not None:
+            return cached
+
+        search_sql, params = self._similarity_search_query(
+            query_vector, k, metadata_filter, projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+
+        with self._latency.time("similarity_search") as timing:
+            async with self._connection() as conn:
+                async with conn.cursor() as cur:
+                    plan = await self._search_plan(
+                        cur, metadata_filter, repo_id, ingestion_ids
+                    )
+                    timing.shape = filter_shape(
+                        metadata_filter, repo_id, ingestion_ids, plan
+                    )
+                    await self._apply_search_params(
+                        cur, ef_search=ef_search, probes=probes, plan=plan
+                    )
+                    await cur.execute(search_sql, params)
+                    results = self._records_from_rows(await cur.fetchall())
+        self._query_cache.put(cache_key, results, generation)
+        return results
+
+    async def similarity_search_mmr(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        fanout: int = DEFAULT_FANOUT,
+        lambda_mult: float = DEFAULT_LAMBDA,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        MMR-diversified similarity search (see
+        PgVectorStore.similarity_search_mmr).
+        """
+        candidates = await self.similarity_search(
+            query_vector, k * fanout, metadata_filter,
+            ef_search=ef_search, probes=probes,
+            projection=candidate_projection(projection),
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+        return mmr_rerank(query_vector, candidates, k, lambda_mult, projection)
+
+    async def lexical_search(
+        self,
+        query_text: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """Full-text search on chunk_tsv (see PgVectorStore.lexical_search)."""
+        search_sql, params = self._lexical_search_query(
+            query_text, k, metadata_filter, projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(search_sql, params)
+                return self._records_from_rows(await cur.fetchall())
+
+    async def hybrid_search(
+        self,
+        query_vector: Sequence[float],
+        query_text: str,
+        k: int,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: Optional[int] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """Vector + lexical search fused with RRF (see PgVectorStore.hybrid_search)."""
+        search_sql, params = self._hybrid_search_query(
+            query_vector, query_text, k,
+            vector_k=k if vector_k is None else vector_k,
+            lexical_k=k if lexical_k is None else lexical_k,
+            metadata_filter=metadata_filter, projection=projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids, rrf_k=rrf_k,
+        )
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                plan = await self._search_plan(
+                    cur, metadata_filter, repo_id, ingestion_ids
+                )
+                await self._apply_search_params(
+                    cur, ef_search=ef_search, probes=probes, plan=plan
+                )
+                await cur.execute(search_sql, params)
+                return self._records_from_rows(await cur.fetchall())
+
+    async def similarity_search_batch(
+        self,
+        queries: Sequence[VectorQuery],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+    ) -> List[List[VectorRecord]]:
+        """Several similarity searches in one round trip; one result list per query."""
+        if not queries:
+            return []
+
+        batch_sql, params = self._batch_search_query(queries, projection)
+
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                plan = self._batch_plan(queries)
+                await self._apply_search_params(
+                    cur, ef_search=ef_search, probes=probes, plan=plan
+                )
+                await cur.execute(batch_sql, params)
+                return self._batch_results(await cur.fetchall(), len(queries))
+
+    async def export_chunks(
+        self,
+        ingestion_id: Optional[str] = None,
+        repo_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[VectorRecord]]:
+        """Server-side-cursor export in batches (see PgVectorStore.export_chunks)."""
+        query, params = self._export_query(ingestion_id, repo_id)
+        async with self._connection() as conn:
+            async with conn.cursor(name=self.EXPORT_CURSOR) as cur:
+                cur.itersize = batch_size
+                await cur.execute(query, params)
+                while rows := await cur.fetchmany(batch_size):
+                    yield self._records_from_rows(rows)
+
+    async def _prepare_partitions(
+        self, records: Sequence[VectorRecord]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Partitioned layout only: resolve the batch's repo_ids and create any
+        missing repo partitions in a short transaction of their own, so the
+        parent table lock taken by CREATE TABLE ... PARTITION OF is not held
+        for the whole write. Returns the repo_id lookup (None if unpartitioned).
+        """
+        if not self._partitioned:
+            return None
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                repo_ids = await self._resolve_repo_ids(cur, records)
+                # IF NOT EXISTS returns before locking the parent when the
+                # partition is already there; no per-process cache, since
+                # another worker may have dropped it meanwhile.
+                for repo_id in sorted(self._chunk_repo_ids(records, repo_ids), key=str):
+                    await cur.execute(self._create_partition_sql(repo_id))
+        return repo_ids
+
+    async def _resolve_repo_ids(
+        self, cur: psycopg.AsyncCursor, records: Sequence[VectorRecord]
+    ) -> Dict[str, Any]:
+        """document_id → repo_id for chunks whose source_metadata has no repo_id."""
+        missing = self._documents_missing_repo_id(records)
+        if not missing:
+            return {}
+        await cur.execute(self._repo_ids_sql(), (missing,))
+        return self._repo_id_lookup(await cur.fetchall())
+
+    async def _apply_search_params(
+        self,
+        cur: psycopg.AsyncCursor,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        plan: Optional[str] = None,
+    ) -> None:
+        """
+        SET LOCAL the ANN recall knobs and the filter plan's settings; they
+        reset when the transaction ends.
+        """
+        set_sql = self._search_params_sql(ef_search=ef_search, probes=probes, plan=plan)
+        if set_sql is not None:
+            await cur.execute(set_sql)
+
+    async def _search_plan(
+        self,
+        cur: psycopg.AsyncCursor,
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str],
+        ingestion_ids: Optional[Sequence[str]],
+    ) -> Optional[str]:
+        """
+        prefilter / postfilter for a filtered search (None when unfiltered).
+        In auto mode the planner's row estimate for the filter decides, once
+        per filter shape (see FILTER_STRATEGIES).
+        """
+        if not self._needs_estimate(metadata_filter, repo_id, ingestion_ids):
+            return self._filter_plan(
+                self._is_filtered(metadata_filter, repo_id, ingestion_ids)
+            )
+        shape = filter_shape(metadata_filter, repo_id, ingestion_ids)
+        plan = self._known_plan(shape)
+        if plan is not None:
+            return plan
+        await cur.execute(
+            *self._filter_estimate_query(metadata_filter, repo_id, ingestion_ids)
+        )
+        estimated_rows = self._estimated_rows(await cur.fetchone())
+        return self._remember_plan(shape, self._auto_plan(estimated_rows))
+
+    async def ensure_collection(self) -> bool:
+        """Create and register this store's collection table (see PgVectorStore)."""
+        collection = self._collection_to_create()
+        if collection is None:
+            return False
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    self._TABLE_EXISTS_SQL, (f"{self.SCHEMA}.{self._table}",)
+                )
+                if self._table_exists(await cur.fetchone()):
+                    return False
+                for statement in self._create_collection_sql():
+                    await cur.execute(statement)
+                await cur.execute(
+                    self._register_collection_sql(),
+                    self._register_collection_params(collection),
+                )
+        logging.info(f"Created vector collection {collection.name} ({self._table})")
+        return True
+
+    # ------------------------------------------------------------------
+    # ANN index lifecycle (vector_chunks.vector, cosine ops)
+    # ------------------------------------------------------------------
+    async def list_indexes(self) -> List[Dict[str, Any]]:
+        """Return the vector indexes on vector_chunks with method, validity and size."""
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(self._LIST_INDEXES_SQL, (self.SCHEMA, self._table))
+                return self._index_rows(await cur.fetchall())
+
+    async def build_index(
+        self,
+        method: str = "hnsw",
+        *,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        rebuild: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """CREATE INDEX CONCURRENTLY build / rebuild (see PgVectorStore.build_index)."""
+        name = self.ann_index_name(method)
+        existing = {ix["name"]: ix for ix in await self.list_indexes()}
+        partitions = None
+        if self._partitioned:
+            async with self._connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        self._PARTITIONS_TO_INDEX_SQL,
+                        self._partitions_to_index_params(name, rebuild),
+                    )
+                    partitions = [row[0] for row in await cur.fetchall()]
+        status, statements = self._index_build_plan(
+            method,
+            existing.get(name),
+            m=m,
+            ef_construction=ef_construction,
+            lists=lists,
+            rebuild=rebuild,
+            maintenance_work_mem=maintenance_work_mem,
+            partitions=partitions,
+        )
+        if not statements:
+            return {"index": name, "method": method, "status": status}
+
+        # CONCURRENTLY cannot run inside a transaction block, so DDL uses a
+        # dedicated autocommit connection rather than a pooled one.
+        async with await psycopg.AsyncConnection.connect(
+            self._dsn, autocommit=True
+        ) as conn:
+            for statement in statements:
+                await conn.execute(statement)
+
+        logging.info(f"ANN index {name} ({method}) {status}")
+        return {"index": name, "method": method, "status": status}
+
+    async def drop_index(self, method: str) -> None:
+        """Drop the ANN index for the given method (concurrently)."""
+        async with await psycopg.AsyncConnection.connect(
+            self._dsn, autocommit=True
+        ) as conn:
+            await conn.execute(
+                self._index_drop_sql(
+                    self.ann_index_name(method), concurrently=not self._partitioned
+                )
+            )
+
+    async def delete_by_ingestion_id(self, ingestion_id: str) -> None:
+        # Every written table is cleared on one connection, in one transaction.
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                for table in self._write_tables():
+                    await cur.execute(self._delete_sql(table), (ingestion_id,))
+        self._query_cache.invalidate()
+
+    async def delete_by_repo_id(self, repo_id: str) -> Dict[str, Any]:
+        """
+        Remove every vector_chunks row of a repository (before re-ingesting it).
+
+        Partitioned layout: drops the repo's partition — O(1), no dead tuples
+        for vacuum. Otherwise a DELETE over the indexed repo_id column.
+        Legacy vectors rows are cleared per ingestion by delete_by_ingestion_id.
+        """
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(*self._delete_by_repo_statement(repo_id))
+                result = self._delete_by_repo_result(repo_id, cur.rowcount)
+        self._query_cache.invalidate()
+        return result
+
+    async def get_chunks_by_document_id(
+        self,
+        document_id: str,
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> List[VectorRecord]:
+        """Fetch chunks for a specific document_id — no vector similarity needed."""
+        search_sql = self._chunks_by_document_id_query(projection)
+        with self._latency.time("get_chunks_by_document_id", "document_id"):
+            async with self._connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(search_sql, (document_id, k))
+                    return self._records_from_rows(await cur.fetchall())
+
+    async def get_chunks_by_document_ids(
+        self,
+        document_ids: Sequence[str],
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> Dict[str, List[VectorRecord]]:
+        """Up to k chunks for each of many document_ids, in one query."""
+        if not document_ids:
+            return {}
+
+        search_sql = self._chunks_by_document_ids_query(projection)
+        async with self._connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(search_sql, ([str(d) for d in document_ids], k))
+                return self._records_by_document(await cur.fetchall())
@@ -1,10 +1,19 @@
 # src/core/vectorstore/base.py
 # vector_store_service/src/core/vectorstore/base.py
 from abc import ABC, abstractmethod
-from typing import Iterable, Sequence, List
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 # Import from shared
-from shared.models.vector import VectorRecord
+from shared.models.vector import VectorRecord, WriteCounts
+
+
+class Projection(str, Enum):
+    """Which parts of a stored record a read should return."""
+
+    METADATA = "metadata"  # ids, text, metadata, score — no embedding
+    VECTOR = "vector"      # ids, embedding, score — no text / metadata
+    FULL = "full"          # everything
 
 
 class VectorStore(ABC):
@@ -15,8 +24,8 @@ class VectorStore(ABC):
         ...
 
     @abstractmethod
-    def add(self, records: Iterable[VectorRecord]) -> None:
-        """Add a list of VectorRecords to the store."""
+    def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """Add a list of VectorRecords to the store (idempotent per chunk)."""
         ...
 
     @abstractmethod
@@ -24,11 +33,61 @@ class VectorStore(ABC):
         self,
         query_vector: Sequence[float],
         k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        projection: Projection = Projection.FULL,
     ) -> List[VectorRecord]:
-        """Return the top k most similar vectors."""
+        """
+        Return the top k most similar vectors, optionally restricted by
+        metadata_filter (syntax in filters.FilterCompiler).
+
+        projection lets callers skip the embedding (METADATA) or the
+        text/metadata payload (VECTOR) when they do not need it.
+        """
         ...
 
     @abstractmethod
     def delete_by_ingestion_id(self, ingestion_id: str) -> None:
         """Delete all vectors associated with a given ingestion_id."""
         ...
+
+    def close(self) -> None:
+        """Release pooled connections / open files; the store is unusable afterwards."""
+
+
+class AsyncVectorStore(ABC):
+    """
+    Awaitable counterpart of VectorStore, for callers running on an event
+    loop (the FastAPI routes) that must not block on database I/O.
+    """
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Return the dimension of the vectors."""
+        ...
+
+    @abstractmethod
+    async def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """Add a list of VectorRecords to the store (idempotent per chunk)."""
+        ...
+
+    @abstractmethod
+    async def similarity_search(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        projection: Projection = Projection.FULL,
+    ) -> List[VectorRecord]:
+        """Return the top k most similar vectors (see VectorStore.similarity_search)."""
+        ...
+
+    @abstractmethod
+    async def delete_by_ingestion_id(self, ingestion_id: str) -> None:
+        """Delete all vectors associated with a given ingestion_id."""
+        ...
+
+    async def close(self) -> None:
+        """Release pooled connections / open files; the store is unusable afterwards."""
@@ -0,0 +1,115 @@
+# src/core/vectorstore/collections.py
+"""
+Named vector collections: one chunk table per embedding model.
+
+A collection pins (provider, model, dimension). The default collection is
+the existing vector_chunks table (EMBEDDING_PROVIDER / OLLAMA_EMBED_MODEL /
+VECTOR_DIMENSION); every other one gets its own table,
+vector_chunks_c_<name>, with the same columns but a vector(<dimension>)
+column, its own unique / metadata / full-text indexes and its own ANN
+index (built per collection via /admin/indexes). Tables are created on
+startup and listed in ingestion_service.vector_collections (migration
+20260520_vector_collections).
+
+Extra collections come from VECTOR_COLLECTIONS, e.g.
+
+    VECTOR_COLLECTIONS='{"minilm": {"provider": "ollama",
+                                    "model": "all-minilm", "dimension": 384}}'
+
+and routes pick one with ?collection=<name or provider/model>, so a
+smaller model can be A/B tested next to the default one without touching it.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_COLLECTION = "default"
+DEFAULT_TABLE = "vector_chunks"
+
+# Postgres identifiers are capped at 63 bytes; derived index names add ~25
+_NAME = re.compile(r"^[a-z][a-z0-9_]{0,23}$")
+
+
+@dataclass(frozen=True)
+class Collection:
+    name: str
+    provider: str
+    model: str
+    dimension: int
+
+    def __post_init__(self) -> None:
+        if self.name != DEFAULT_COLLECTION and not _NAME.match(self.name):
+            raise ValueError(
+                f"Invalid collection name {self.name!r} "
+                "(lowercase letters, digits and _, at most 24 characters)"
+            )
+        if self.dimension < 1:
+            raise ValueError(f"Collection {self.name!r} needs a positive dimension")
+
+    @property
+    def is_default(self) -> bool:
+        return self.name == DEFAULT_COLLECTION
+
+    @property
+    def table(self) -> str:
+        return DEFAULT_TABLE if self.is_default else f"{DEFAULT_TABLE}_c_{self.name}"
+
+    @property
+    def embedder(self) -> str:
+        """Embedder name recorded with the collection: provider/model."""
+        return f"{self.provider}/{self.model}"
+
+
+def build_collections(
+    default: Collection, extra: Optional[Mapping[str, Mapping[str, Any]]] = None
+) -> Dict[str, Collection]:
+    """
+    Collections by name: the default one plus each VECTOR_COLLECTIONS entry.
+    Raises ValueError for a malformed entry or two collections sharing an
+    embedder (ingest and search would not know which one to use).
+    """
+    collections = {DEFAULT_COLLECTION: default}
+    for name, spec in (extra or {}).items():
+        if name in collections:
+            raise ValueError(f"Collection {name!r} is defined twice")
+        try:
+            collection = Collection(
+                name=name,
+                provider=str(spec["provider"]),
+                model=str(spec["model"]),
+                dimension=int(spec["dimension"]),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(
+                f"Collection {name!r} needs provider, model and dimension: {e}"
+            ) from e
+        collections[name] = collection
+
+    embedders: Dict[str, str] = {}
+    for collection in collections.values():
+        other = embedders.setdefault(collection.embedder, collection.name)
+        if other != collection.name:
+            raise ValueError(
+                f"Collections {other!r} and {collection.name!r} both use "
+                f"{collection.embedder}"
+            )
+    return collections
+
+
+def find_collection(
+    collections: Mapping[str, Collection], key: Optional[str]
+) -> Optional[Collection]:
+    """
+    Collection by name or by embedder ("provider/model", as recorded by
+    the ingestion side); None / "" is the default collection.
+    """
+    if not key:
+        return collections[DEFAULT_COLLECTION]
+    if key in collections:
+        return collections[key]
+    for collection in collections.values():
+        if collection.embedder == key:
+            return collection
+    return None
@@ -0,0 +1,265 @@
+# src/core/vectorstore/filters.py
+"""
+metadata_filter → SQL WHERE clause for vector_chunks.
+
+Filter syntax (keys AND together):
+    {"source_type": "code"}                           → equality
+    {"source_type": {"eq": "code"}}                   → equality
+    {"source_type": {"ne": "code"}}                   → not equal (also matches missing)
+    {"doc_type": {"in": ["file", "pdf"]}}             → any of
+    {"symbol": {"exists": true}}                      → key present (false: absent)
+    {"start_line": {"range": {"gte": 10, "lt": 50}}}  → gt / gte / lt / lte bounds
+    {"relative_path": {"prefix": "src/core/"}}        → starts with
+    {"relative_path": {"glob": "src/**/*.py"}}        → path glob (* within a
+                                                        segment, ** across, ?)
+
+repo_id / doc_type / source_type compare their indexed vector_chunks
+columns (btree). Every other key is compiled against source_metadata so the
+GIN index (migration 20260501_metadata_gin) can serve it: equality and in
+become @> containment, exists becomes the ? operator. range, prefix and
+glob read source_metadata->key; prefix on relative_path is served by its
+text_pattern_ops expression index.
+
+On source_metadata keys eq / ne / in compare JSON values, types included:
+{"start_line": "10"} does not match the number 10 (the ->> text
+comparison before the GIN index did). Scope columns compare as text /
+uuid, and NumpyVectorStore compares the stored Python values, which
+agrees with the jsonb semantics.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from psycopg import sql
+from psycopg.types.json import Jsonb
+
+
+class FilterCompiler:
+    # Filterable keys backed by a real (indexed) vector_chunks column, with
+    # the type their values are cast to. doc_type / source_type are generated
+    # from source_metadata; repo_id is written by the store.
+    SCOPE_COLUMNS = {"repo_id": "uuid", "doc_type": "text", "source_type": "text"}
+    _CAST_SQL = {"uuid": sql.SQL("uuid"), "text": sql.SQL("text")}
+
+    OPERATORS = ("eq", "ne", "in", "exists", "range", "prefix", "glob")
+    _RANGE_OPS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+    _COMPARISON_SQL = {
+        ">": sql.SQL(">"), ">=": sql.SQL(">="), "<": sql.SQL("<"), "<=": sql.SQL("<="),
+    }
+
+    @classmethod
+    def compile(
+        cls,
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+        extra_conditions: Sequence[sql.Composable] = (),
+    ) -> Tuple[sql.Composable, List[Any]]:
+        """
+        Returns (clause, values); clause is empty SQL when there is nothing
+        to filter. extra_conditions (parameterless SQL) are ANDed in first,
+        then the repo_id / ingestion_ids scope, then the filter keys.
+        Raises ValueError for an unknown operator or malformed operand.
+        """
+        conditions: List[sql.Composable] = list(extra_conditions)
+        values: List[Any] = []
+
+        if repo_id is not None:
+            conditions.append(sql.SQL("repo_id = {}::uuid").format(sql.Placeholder()))
+            values.append(str(repo_id))
+        if ingestion_ids:
+            conditions.append(
+                sql.SQL("ingestion_id = ANY({}::uuid[])").format(sql.Placeholder())
+            )
+            values.append([str(i) for i in ingestion_ids])
+
+        # Metadata equalities fold into one containment object
+        contains: Dict[str, Any] = {}
+        for key, value in (metadata_filter or {}).items():
+            operator, operand = cls.operator(key, value)
+            if operator == "eq" and key not in cls.SCOPE_COLUMNS:
+                contains[key] = operand
+                continue
+            condition, condition_values = cls._condition(key, operator, operand)
+            conditions.append(condition)
+            values.extend(condition_values)
+
+        if contains:
+            conditions.append(
+                sql.SQL("source_metadata @> {}::jsonb").format(sql.Placeholder())
+            )
+            values.append(Jsonb(contains))
+
+        if not conditions:
+            return sql.SQL(""), []
+        return sql.SQL("WHERE {}").format(sql.SQL(" AND ").join(conditions)), values
+
+    @classmethod
+    def operator(cls, key: str, value: Any) -> Tuple[str, Any]:
+        """(operator, operand) of one filter entry; bare values mean eq."""
+        if not isinstance(value, dict):
+            return "eq", value
+        if len(value) != 1:
+            raise ValueError(
+                f"Filter on {key!r} must have exactly one operator, got {value}"
+            )
+        operator, operand = next(iter(value.items()))
+        if operator not in cls.OPERATORS:
+            raise ValueError(
+                f"Unknown filter operator {operator!r} on {key!r} "
+                f"(expected one of {cls.OPERATORS})"
+            )
+        return operator, operand
+
+    @classmethod
+    def _condition(
+        cls, key: str, operator: str, operand: Any
+    ) -> Tuple[sql.Composable, List[Any]]:
+        if key in cls.SCOPE_COLUMNS:
+            return cls._column_condition(key, operator, operand)
+        return cls._metadata_condition(key, operator, operand)
+
+    # ------------------------------------------------------------------
+    # Scope columns (btree)
+    # ------------------------------------------------------------------
+    @classmethod
+    def _column_condition(
+        cls, key: str, operator: str, operand: Any
+    ) -> Tuple[sql.Composable, List[Any]]:
+        column = sql.Identifier(key)
+        cast = cls._CAST_SQL[cls.SCOPE_COLUMNS[key]]
+        value = sql.SQL("{}::{}").format(sql.Placeholder(), cast)
+
+        if operator == "eq":
+            return sql.SQL("{} = {}").format(column, value), [operand]
+        if operator == "ne":
+            return sql.SQL("({col} IS NULL OR {col} != {val})").format(
+                col=column, val=value
+            ), [operand]
+        if operator == "in":
+            return sql.SQL("{} = ANY({}::{}[])").format(
+                column, sql.Placeholder(), cast
+            ), [list(operand)]
+        if operator == "exists":
+            return sql.SQL("{} IS {}NULL").format(
+                column, sql.SQL("NOT " if operand else "")
+            ), []
+        if operator == "range":
+            bounds = cls.range_bounds(key, operand)
+            return sql.SQL(" AND ").join(
+                sql.SQL("{} {} {}").format(column, cls._COMPARISON_SQL[op], value)
+                for op, _ in bounds
+            ), [bound for _, bound in bounds]
+        # LIKE / ~ are text operators: match a uuid column's text form
+        if cls.SCOPE_COLUMNS[key] != "text":
+            column = sql.SQL("{}::text").format(column)
+        if operator == "prefix":
+            return sql.SQL("{} LIKE {}").format(column, sql.Placeholder()), [
+                cls._like_prefix(operand)
+            ]
+        return sql.SQL("{} ~ {}").format(column, sql.Placeholder()), [
+            cls.glob_regex(operand)
+        ]
+
+    # ------------------------------------------------------------------
+    # source_metadata keys (GIN / expression indexes)
+    # ------------------------------------------------------------------
+    @classmethod
+    def _metadata_condition(
+        cls, key: str, operator: str, operand: Any
+    ) -> Tuple[sql.Composable, List[Any]]:
+        text_value = sql.SQL("source_metadata->>{}").format(sql.Literal(key))
+
+        if operator == "ne":
+            # Missing keys (and NULL metadata) don't hold the value, so they
+            # match, as they did under the ->> comparison
+            return sql.SQL(
+                "(source_metadata IS NULL OR NOT (source_metadata @> {}::jsonb))"
+            ).format(sql.Placeholder()), [Jsonb({key: operand})]
+        if operator == "in":
+            operand = list(operand)
+            if not operand:
+                return sql.SQL("FALSE"), []
+            return sql.SQL("({})").format(
+                sql.SQL(" OR ").join(
+                    sql.SQL("source_metadata @> {}::jsonb").format(sql.Placeholder())
+                    for _ in operand
+                )
+            ), [Jsonb({key: v}) for v in operand]
+        if operator == "exists":
+            return sql.SQL("{}(source_metadata ? {})").format(
+                sql.SQL("" if operand else "NOT "), sql.Literal(key)
+            ), []
+        if operator == "range":
+            # jsonb compares numbers numerically and strings as text; the
+            # typeof guard keeps other JSON types (which sort around them)
+            # out of the range.
+            bounds = cls.range_bounds(key, operand)
+            json_type = "number" if isinstance(bounds[0][1], (int, float)) else "string"
+            field = sql.SQL("source_metadata->{}").format(sql.Literal(key))
+            parts = [
+                sql.SQL("jsonb_typeof({}) = {}").format(field, sql.Literal(json_type))
+            ] + [
+                sql.SQL("{} {} {}::jsonb").format(
+                    field, cls._COMPARISON_SQL[op], sql.Placeholder()
+                )
+                for op, _ in bounds
+            ]
+            return sql.SQL("({})").format(sql.SQL(" AND ").join(parts)), [
+                Jsonb(bound) for _, bound in bounds
+            ]
+        if operator == "prefix":
+            return sql.SQL("{} LIKE {}").format(text_value, sql.Placeholder()), [
+                cls._like_prefix(operand)
+            ]
+        return sql.SQL("{} ~ {}").format(text_value, sql.Placeholder()), [
+            cls.glob_regex(operand)
+        ]
+
+    # ------------------------------------------------------------------
+    # Operand helpers (also used by NumpyVectorStore's in-memory filter)
+    # ------------------------------------------------------------------
+    @classmethod
+    def range_bounds(cls, key: str, operand: Any) -> List[Tuple[str, Any]]:
+        """[(sql comparison, bound)] of a range operand, validated."""
+        if not isinstance(operand, dict) or not operand:
+            raise ValueError(
+                f"range on {key!r} needs bounds like {{'gte': 1, 'lt': 5}}"
+            )
+        unknown = set(operand) - set(cls._RANGE_OPS)
+        if unknown:
+            raise ValueError(f"Unknown range bound(s) {sorted(unknown)} on {key!r}")
+        numeric = {
+            isinstance(v, (int, float)) and not isinstance(v, bool)
+            for v in operand.values()
+        }
+        if len(numeric) != 1:
+            raise ValueError(
+                f"range bounds on {key!r} must be all numbers or all strings"
+            )
+        return [
+            (cls._RANGE_OPS[name], value) for name, value in sorted(operand.items())
+        ]
+
+    @staticmethod
+    def _like_prefix(prefix: str) -> str:
+        escaped = (
+            str(prefix).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        return escaped + "%"
+
+    @staticmethod
+    def glob_regex(pattern: str) -> str:
+        """Anchored POSIX regex: ** any path, * within a segment, ? one char."""
+        out = []
+        for token in re.split(r"(\*\*/?|\*|\?)", str(pattern)):
+            if token in ("**", "**/"):
+                out.append("(.*/)?" if token == "**/" else ".*")
+            elif token == "*":
+                out.append("[^/]*")
+            elif token == "?":
+                out.append("[^/]")
+            elif token:
+                out.append(re.escape(token))
+        return "^" + "".join(out) + "$"
@@ -0,0 +1,158 @@
+# src/core/vectorstore/latency.py
+"""
+In-process latency histograms for the vector store (served by /stats).
+
+LatencyHistogram is HDR-style: durations are counted in log-linear buckets
+(7 bits of mantissa per power of two, so any reported value is within 1%
+of the measured one) in a sparse dict. Memory is bounded by the value
+range, not the sample count, and percentiles are exact up to bucket width.
+
+LatencyRecorder keeps one histogram per (operation, shape). The shape of
+a search is its filter shape, e.g. "repo_id,doc_type:eq [prefilter]": the
+scope / metadata keys with their operators and, for pgvector searches, the
+plan chosen (see PgVectorQueries.FILTER_STRATEGIES), so the point where a
+filter shape starts paying for scans shows up as its own p95 / p99.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from src.core.vectorstore.filters import FilterCompiler
+
+UNFILTERED = "unfiltered"
+OTHER_SHAPES = "other"
+
+
+class LatencyHistogram:
+    SUB_BUCKET_BITS = 7
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self) -> None:
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self._total_us = 0
+        self._min_us: Optional[int] = None
+        self._max_us = 0
+
+    @classmethod
+    def _bucket(cls, value_us: int) -> int:
+        if value_us < (1 << cls.SUB_BUCKET_BITS):
+            return value_us
+        shift = value_us.bit_length() - cls.SUB_BUCKET_BITS
+        return (shift << cls.SUB_BUCKET_BITS) + (value_us >> shift)
+
+    @classmethod
+    def _bucket_high(cls, bucket: int) -> int:
+        """Highest value counted in a bucket."""
+        if bucket < (1 << cls.SUB_BUCKET_BITS):
+            return bucket
+        shift = bucket >> cls.SUB_BUCKET_BITS
+        mantissa = bucket & ((1 << cls.SUB_BUCKET_BITS) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value_us = max(int(seconds * 1_000_000), 0)
+        bucket = self._bucket(value_us)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self._total_us += value_us
+        self._min_us = value_us if self._min_us is None else min(self._min_us, value_us)
+        self._max_us = max(self._max_us, value_us)
+
+    def percentile(self, pct: float) -> float:
+        """Value (ms) at or below which pct% of the samples fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * pct // 100))   # ceil
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(self._bucket_high(bucket), self._max_us) / 1000.0
+        return self._max_us / 1000.0
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "mean_ms": (self._total_us / self.count / 1000.0) if self.count else 0.0,
+            "min_ms": (self._min_us or 0) / 1000.0,
+            "max_ms": self._max_us / 1000.0,
+        }
+        for pct in self.PERCENTILES:
+            summary[f"p{pct}_ms"] = self.percentile(pct)
+        return summary
+
+
+class LatencyRecorder:
+    """Thread-safe histograms by operation and shape."""
+
+    # Shapes carry filter keys, so their number is capped per operation;
+    # later shapes are pooled under OTHER_SHAPES.
+    MAX_SHAPES = 100
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, operation: str, shape: str, seconds: float) -> None:
+        with self._lock:
+            shapes = self._histograms.setdefault(operation, {})
+            if shape not in shapes and len(shapes) >= self.MAX_SHAPES:
+                shape = OTHER_SHAPES
+            shapes.setdefault(shape, LatencyHistogram()).record(seconds)
+
+    @contextmanager
+    def time(self, operation: str, shape: str = UNFILTERED) -> Iterator["_Timing"]:
+        """
+        Time the block; the yielded timing's shape may be refined inside it
+        (e.g. once the search plan is known). Failed calls are not recorded.
+        """
+        timing = _Timing(shape)
+        start = time.perf_counter()
+        yield timing
+        self.record(operation, timing.shape, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{operation: {shape: count / mean / min / max / p50 / p95 / p99}}."""
+        with self._lock:
+            return {
+                operation: {shape: h.summary() for shape, h in sorted(shapes.items())}
+                for operation, shapes in sorted(self._histograms.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+class _Timing:
+    __slots__ = ("shape",)
+
+    def __init__(self, shape: str) -> None:
+        self.shape = shape
+
+
+def filter_shape(
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    repo_id: Optional[str] = None,
+    ingestion_ids: Optional[Sequence[str]] = None,
+    plan: Optional[str] = None,
+) -> str:
+    """Shape label of a search: filtered keys with operators, values left out."""
+    parts = []
+    if repo_id is not None:
+        parts.append("repo_id")
+    if ingestion_ids:
+        parts.append("ingestion_ids")
+    for key, value in sorted((metadata_filter or {}).items()):
+        try:
+            operator, _ = FilterCompiler.operator(key, value)
+        except ValueError:
+            operator = "invalid"
+        parts.append(f"{key}:{operator}")
+    shape = ",".join(parts) or UNFILTERED
+    return f"{shape} [{plan}]" if plan and parts else shape
+
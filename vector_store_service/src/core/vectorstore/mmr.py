@@ -0,0 +1,93 @@
+# src/core/vectorstore/mmr.py
+"""
+Maximal marginal relevance (MMR) over an over-fetched candidate list.
+
+Near-duplicate chunks (e.g. a markdown section and its parent, which repeats
+its text) score almost the same against a query and crowd each other into
+the top k. MMR picks results one at a time, each maximising
+
+    lambda_mult * sim(query, d) - (1 - lambda_mult) * max sim(d, selected)
+
+so lambda_mult = 1 is plain relevance order and lower values favour
+diversity. Similarities are cosine; everything runs as NumPy matrix ops on
+the candidates' embeddings (k passes over a (candidates,) vector).
+"""
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from src.core.vectorstore.base import Projection
+from shared.models.vector import VectorRecord
+
+DEFAULT_FANOUT = 4
+DEFAULT_LAMBDA = 0.5
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    query_vector: Sequence[float],
+    candidate_vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = DEFAULT_LAMBDA,
+) -> List[int]:
+    """Indices of the k candidates MMR selects, in selection order."""
+    if not 0.0 <= lambda_mult <= 1.0:
+        raise ValueError(f"lambda_mult must be in [0, 1], got {lambda_mult}")
+    n = len(candidate_vectors)
+    if n == 0 or k <= 0:
+        return []
+
+    candidates = _unit_rows(np.asarray(candidate_vectors, dtype=np.float32))
+    query = _unit_rows(np.asarray(query_vector, dtype=np.float32))
+    relevance = candidates @ query
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to anything selected so far
+    redundancy = candidates @ candidates[selected[0]]
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(k, n):
+        score = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        score[~available] = -np.inf
+        pick = int(np.argmax(score))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(redundancy, candidates @ candidates[pick], out=redundancy)
+    return selected
+
+
+def candidate_projection(projection: Projection) -> Projection:
+    """Projection to over-fetch candidates with: MMR needs their embeddings."""
+    return Projection.VECTOR if projection == Projection.VECTOR else Projection.FULL
+
+
+def mmr_rerank(
+    query_vector: Sequence[float],
+    candidates: Sequence[VectorRecord],
+    k: int,
+    lambda_mult: float = DEFAULT_LAMBDA,
+    projection: Projection = Projection.FULL,
+) -> List[VectorRecord]:
+    """
+    The k records MMR selects from candidates (fetched with
+    candidate_projection), in selection order. Scores stay the query
+    similarity the store computed; with Projection.METADATA the vectors
+    are dropped afterwards.
+    """
+    if not candidates:
+        return []
+    vectors = np.asarray([r.vector for r in candidates], dtype=np.float32)
+    selected = [
+        candidates[i] for i in mmr_select(query_vector, vectors, k, lambda_mult)
+    ]
+    if projection == Projection.METADATA:
+        for record in selected:
+            record.vector = None
+    return selected
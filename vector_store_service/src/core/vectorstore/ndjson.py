@@ -0,0 +1,83 @@
+# src/core/vectorstore/ndjson.py
+"""
+NDJSON form of VectorRecords for export / import (one record per line).
+
+A line has the same shape as a /v1/vectors/batch record:
+
+    {"vector": [...], "metadata": {"ingestion_id": ..., "chunk_id": ...,
+     "chunk_index": ..., "chunk_strategy": ..., "chunk_text": ...,
+     "source_metadata": {...}, "provider": ..., "document_id": ...}}
+
+so an export can be re-imported as is (stored embeddings are reused, no
+re-embedding), and the import side reads the request body as it arrives.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from typing import AsyncIterator, List
+
+from shared.models.vector import VectorMetadata, VectorRecord
+
+MEDIA_TYPE = "application/x-ndjson"
+
+
+def encode_record(record: VectorRecord) -> str:
+    """One NDJSON line (newline included); search scores are not exported."""
+    metadata = asdict(record.metadata)
+    metadata.pop("score", None)
+    if metadata["document_id"] is not None:
+        metadata["document_id"] = str(metadata["document_id"])
+    metadata["ingestion_id"] = str(metadata["ingestion_id"])
+    if record.vector is None:
+        raise ValueError("cannot export a record without its vector")
+    # pgvector loads vectors as numpy arrays
+    vector = [float(x) for x in record.vector]
+    return json.dumps({"vector": vector, "metadata": metadata}) + "\n"
+
+
+def decode_record(line: str) -> VectorRecord:
+    """Parse one NDJSON line; ValueError when it is not a record."""
+    try:
+        data = json.loads(line)
+        return VectorRecord(
+            vector=data["vector"], metadata=VectorMetadata(**data["metadata"])
+        )
+    except (KeyError, TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"not a vector record: {e}") from e
+
+
+async def decode_stream(
+    chunks: AsyncIterator[bytes], batch_size: int
+) -> AsyncIterator[List[VectorRecord]]:
+    """
+    Records from a byte stream of NDJSON, in lists of up to batch_size.
+    Only one batch and one partial line are held at a time. Blank lines
+    are skipped; a malformed line raises ValueError naming its line number.
+    """
+    batch: List[VectorRecord] = []
+    line_number = 0
+
+    async def lines():
+        pending = b""
+        async for chunk in chunks:
+            pending += chunk
+            *complete, pending = pending.split(b"\n")
+            for line in complete:
+                yield line
+        if pending:
+            yield pending
+
+    async for raw in lines():
+        line_number += 1
+        if not raw.strip():
+            continue
+        try:
+            batch.append(decode_record(raw.decode("utf-8")))
+        except ValueError as e:  # UnicodeDecodeError included
+            raise ValueError(f"line {line_number}: {e}") from e
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
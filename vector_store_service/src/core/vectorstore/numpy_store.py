@@ -0,0 +1,646 @@
+# src/core/vectorstore/numpy_store.py
+"""
+In-process VectorStore backend: no Postgres required.
+
+Embeddings live in one memory-mapped float32 segment (``vectors.npy``);
+row metadata lives in an append-only sidecar log (``metadata.jsonl``) that
+is replayed into memory on open. Search is exact: one matmul over the
+segment, masked by the metadata filter, then ``argpartition`` for the
+top k. Meant for laptop-scale deployments and as a fast stand-in for
+PgVectorStore in CI — not for millions of rows.
+
+Sidecar log lines:
+    {"op": "add", ...VectorMetadata fields}     → next segment row
+    {"op": "delete", "rows": [3, 4, ...]}       → tombstones
+    {"op": "update", "row": 3, "ingestion_id": ...}  → re-pointed unchanged chunk
+Vectors are flushed before their metadata line is written, so a crash
+mid-add only leaves unreferenced rows at the end of the segment.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import operator
+import os
+import re
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple,
+)
+
+import numpy as np
+
+from src.core.vectorstore.base import Projection, VectorStore
+from src.core.vectorstore.filters import FilterCompiler
+from src.core.vectorstore.mmr import (
+    DEFAULT_FANOUT, DEFAULT_LAMBDA, candidate_projection, mmr_rerank,
+)
+from shared.models.vector import (
+    VectorMetadata, VectorQuery, VectorRecord, WriteCounts, canonical_id, content_hash,
+)
+
+
+class NumpyVectorStore(VectorStore):
+    VECTORS_FILE = "vectors.npy"
+    METADATA_FILE = "metadata.jsonl"
+    MIN_CAPACITY = 1024
+    # range bounds (FilterCompiler.range_bounds) → Python comparisons
+    _COMPARISONS = {
+        ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+    }
+
+    def __init__(self, path: str, dimension: int, provider: str = "mock") -> None:
+        self._path = Path(path)
+        self._dimension = dimension
+        self._provider = provider
+        self._lock = threading.RLock()
+
+        self._vectors: Optional[np.memmap] = None   # (capacity, dimension) float32
+        self._norms = np.zeros(0, dtype=np.float32)  # per row, for cosine scores
+        self._alive = np.zeros(0, dtype=bool)
+        self._metadata: List[Dict[str, Any]] = []   # per row, VectorMetadata fields
+        self._columns: Dict[str, np.ndarray] = {}   # filter key → per-row values
+        self._compactions = 0                        # row numbering generation
+
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def __len__(self) -> int:
+        """Number of live (not deleted) rows."""
+        return int(self._alive.sum())
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    @property
+    def _vectors_path(self) -> Path:
+        return self._path / self.VECTORS_FILE
+
+    @property
+    def _metadata_path(self) -> Path:
+        return self._path / self.METADATA_FILE
+
+    def _load(self) -> None:
+        """Open the segment and replay the metadata log."""
+        deleted: List[int] = []
+        if self._metadata_path.exists():
+            with self._metadata_path.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    op = entry.pop("op")
+                    if op == "delete":
+                        deleted.extend(entry["rows"])
+                    elif op == "update":
+                        self._metadata[entry.pop("row")].update(entry)
+                    else:
+                        self._metadata.append(entry)
+
+        rows = len(self._metadata)
+        if self._vectors_path.exists():
+            vectors = np.load(self._vectors_path, mmap_mode="r+")
+            if vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"{self._vectors_path} holds {vectors.shape[1]}-d vectors, "
+                    f"store configured for {self._dimension}"
+                )
+            if vectors.shape[0] < rows:
+                raise ValueError(
+                    f"{self._vectors_path} has {vectors.shape[0]} rows, "
+                    f"{self._metadata_path} references {rows}"
+                )
+        elif rows:
+            raise ValueError(
+                f"{self._metadata_path} references missing {self._vectors_path}"
+            )
+        else:
+            vectors = self._allocate(self._vectors_path, self.MIN_CAPACITY)
+
+        self._vectors = vectors
+        self._norms = np.linalg.norm(vectors[:rows], axis=1).astype(np.float32)
+        self._alive = np.ones(rows, dtype=bool)
+        self._alive[deleted] = False
+        logging.info(
+            f"NumpyVectorStore: opened {self._path} ({len(self)} live / {rows} rows)"
+        )
+
+    def _ensure_open(self) -> np.memmap:
+        """The vector segment; RuntimeError once the store is closed."""
+        if self._vectors is None:
+            raise RuntimeError(f"NumpyVectorStore at {self._path} is closed")
+        return self._vectors
+
+    def _allocate(self, path: Path, capacity: int) -> np.memmap:
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(capacity, self._dimension)
+        )
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the segment (doubling) so it can hold `rows` rows."""
+        vectors = self._ensure_open()
+        capacity = vectors.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        used = len(self._metadata)
+        tmp = self._vectors_path.with_suffix(".tmp.npy")
+        grown = self._allocate(tmp, capacity)
+        grown[:used] = vectors[:used]
+        grown.flush()
+        del grown
+        self._vectors = None
+        os.replace(tmp, self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+
+    def _append_log(self, entries: Iterable[Dict[str, Any]]) -> None:
+        with self._metadata_path.open("a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self) -> int:
+        """
+        Rewrite the segment and log without deleted rows.
+        Returns the number of rows reclaimed. The two files are swapped
+        one after the other, so run it while nothing else uses the path.
+        """
+        with self._lock:
+            vectors = self._ensure_open()
+            live = np.flatnonzero(self._alive)
+            reclaimed = len(self._metadata) - len(live)
+            if not reclaimed:
+                return 0
+
+            tmp_vectors = self._vectors_path.with_suffix(".tmp.npy")
+            compacted = self._allocate(tmp_vectors, max(self.MIN_CAPACITY, len(live)))
+            compacted[: len(live)] = vectors[live]
+            compacted.flush()
+            del compacted
+
+            metadata = [self._metadata[i] for i in live]
+            tmp_metadata = self._metadata_path.with_suffix(".tmp.jsonl")
+            with tmp_metadata.open("w", encoding="utf-8") as f:
+                for entry in metadata:
+                    f.write(json.dumps({"op": "add", **entry}) + "\n")
+
+            self._vectors = None
+            os.replace(tmp_vectors, self._vectors_path)
+            os.replace(tmp_metadata, self._metadata_path)
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+            self._norms = self._norms[live]
+            self._alive = np.ones(len(live), dtype=bool)
+            self._metadata = metadata
+            self._columns.clear()
+            self._compactions += 1
+            return reclaimed
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def persist(self, records: list[VectorRecord]) -> None:
+        self.add(records)
+
+    def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """
+        Append records, with PgVectorStore's idempotent chunk semantics: a
+        record whose (repo_id, canonical_id, chunk_index) already holds the
+        same text keeps its row, re-pointed at the record's ingestion_id /
+        document_id / chunk_id; one holding other text is replaced. Records
+        without a repo_id or canonical_id are always appended.
+        """
+        records = list(records)
+        if not records:
+            return WriteCounts()
+        block = np.asarray([r.vector for r in records], dtype=np.float32)
+        if block.ndim != 2 or block.shape[1] != self._dimension:
+            raise ValueError(
+                f"Expected {self._dimension}-d vectors, got shape {block.shape}"
+            )
+
+        with self._lock:
+            keep, stale, repoint, counts = self._merge_plan(records)
+            if stale:
+                mask = np.zeros(len(self._alive), dtype=bool)
+                mask[sorted(stale)] = True
+                self._delete_where(mask)
+            if repoint:
+                self._repoint(repoint)
+            if keep:
+                self._append([records[i] for i in keep], block[keep])
+        return counts
+
+    def _merge_plan(
+        self, records: List[VectorRecord]
+    ) -> Tuple[List[int], Set[int], Dict[int, VectorMetadata], WriteCounts]:
+        """
+        (indexes of records to append, stale rows to delete, unchanged rows
+        to re-point → their record's metadata, counts) for add().
+        """
+        stored = self._stored_chunks(records)
+        keep: List[int] = []
+        stale: Set[int] = set()
+        repoint: Dict[int, VectorMetadata] = {}
+        counts = WriteCounts()
+        for i, record in enumerate(records):
+            m = record.metadata
+            key = self._chunk_key(m.source_metadata, m.chunk_index)
+            rows = stored.get(key, {}) if key is not None else {}
+            digest = content_hash(m.chunk_text)
+            if digest in rows:
+                counts.unchanged += 1
+                repoint.update((row, m) for row in rows[digest])
+                continue
+            for row_ids in rows.values():
+                stale.update(row_ids)
+            if rows:
+                counts.replaced += 1
+            else:
+                counts.new += 1
+            keep.append(i)
+            if key is not None:
+                # a repeat later in the same batch is then unchanged
+                stored[key] = {digest: []}
+        return keep, stale, repoint, counts
+
+    @staticmethod
+    def _chunk_key(
+        source_metadata: Optional[Dict[str, Any]], chunk_index: int
+    ) -> Optional[tuple]:
+        """
+        (repo_id, canonical_id, chunk_index), None when the chunk has no
+        stable source.
+        """
+        repo_id = (source_metadata or {}).get("repo_id")
+        source = canonical_id(source_metadata)
+        if not repo_id or source is None:
+            return None
+        return (str(repo_id), source, chunk_index)
+
+    def _stored_chunks(
+        self, records: Sequence[VectorRecord]
+    ) -> Dict[tuple, Dict[str, List[int]]]:
+        """Chunk key → content hash → live rows, for the batch's sources."""
+        sources = {
+            canonical_id(r.metadata.source_metadata) for r in records
+        } - {None}
+        stored: Dict[tuple, Dict[str, List[int]]] = {}
+        if not sources:
+            return stored
+        mask = self._alive & self._isin(self._column("canonical_id"), sources)
+        for row in np.flatnonzero(mask):
+            entry = self._metadata[row]
+            key = self._chunk_key(entry["source_metadata"], entry["chunk_index"])
+            if key is not None:
+                stored.setdefault(key, {}).setdefault(
+                    content_hash(entry["chunk_text"]), []
+                ).append(int(row))
+        return stored
+
+    _REPOINTED = ("ingestion_id", "document_id", "chunk_id")
+
+    def _repoint(self, rows: Dict[int, VectorMetadata]) -> None:
+        """Move unchanged rows to the ingestion / document that re-sent them."""
+        updates = []
+        for row, m in sorted(rows.items()):
+            fields = {f: getattr(m, f) for f in self._REPOINTED}
+            if any(self._metadata[row][f] != v for f, v in fields.items()):
+                updates.append({"row": row, **fields})
+        if not updates:
+            return
+        self._append_log({"op": "update", **u} for u in updates)
+        for u in updates:
+            self._metadata[u["row"]].update({f: u[f] for f in self._REPOINTED})
+        self._columns.clear()
+
+    def _append(self, records: List[VectorRecord], block: np.ndarray) -> None:
+        entries = []
+        for record in records:
+            entry = asdict(record.metadata)
+            entry.pop("score", None)
+            entry["provider"] = entry["provider"] or self._provider
+            entries.append(entry)
+
+        start = len(self._metadata)
+        self._reserve(start + len(records))
+        vectors = self._ensure_open()
+        vectors[start: start + len(records)] = block
+        vectors.flush()
+        self._append_log({"op": "add", **entry} for entry in entries)
+
+        self._metadata.extend(entries)
+        self._norms = np.concatenate([self._norms, np.linalg.norm(block, axis=1)])
+        self._alive = np.concatenate([self._alive, np.ones(len(records), dtype=bool)])
+        self._columns.clear()
+
+    def add_bulk(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """Same as add() (there is no per-row round trip to save)."""
+        return self.add(records)
+
+    def _delete_where(self, mask: np.ndarray) -> int:
+        rows = np.flatnonzero(mask & self._alive)
+        if len(rows):
+            self._append_log([{"op": "delete", "rows": rows.tolist()}])
+            self._alive[rows] = False
+        return len(rows)
+
+    def delete_by_ingestion_id(self, ingestion_id: str) -> None:
+        with self._lock:
+            self._delete_where(self._column("ingestion_id") == str(ingestion_id))
+
+    def delete_by_repo_id(self, repo_id: str) -> Dict[str, Any]:
+        """Remove every row whose source_metadata["repo_id"] matches."""
+        with self._lock:
+            deleted = self._delete_where(self._column("repo_id") == str(repo_id))
+        return {"repo_id": repo_id, "mode": "delete", "deleted": deleted}
+
+    # ------------------------------------------------------------------
+    # Filters
+    # ------------------------------------------------------------------
+    _TOP_LEVEL = {"ingestion_id", "document_id"}
+
+    def _column(self, key: str) -> np.ndarray:
+        """
+        Per-row values of a filter key as an object array (cached until the
+        next write). ingestion_id / document_id are record fields, every
+        other key reads source_metadata, as in PgVectorStore.
+        """
+        if key not in self._columns:
+            if key in self._TOP_LEVEL:
+                values = [
+                    None if m[key] is None else str(m[key]) for m in self._metadata
+                ]
+            else:
+                values = [(m["source_metadata"] or {}).get(key) for m in self._metadata]
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            self._columns[key] = column
+        return self._columns[key]
+
+    @staticmethod
+    def _isin(column: np.ndarray, values: Iterable[Any]) -> np.ndarray:
+        allowed = set(values)
+        return np.fromiter(
+            (v in allowed for v in column), dtype=bool, count=len(column)
+        )
+
+    def _filter_mask(
+        self,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Boolean row mask for the same filter semantics as PgVectorStore
+        (operators and syntax in filters.FilterCompiler) plus the repo_id /
+        ingestion_ids scope. Deleted rows are never set.
+        """
+        mask = self._alive.copy()
+        if repo_id is not None:
+            mask &= self._column("repo_id") == str(repo_id)
+        if ingestion_ids:
+            mask &= self._isin(self._column("ingestion_id"), map(str, ingestion_ids))
+
+        for key, value in (metadata_filter or {}).items():
+            op, operand = FilterCompiler.operator(key, value)
+            column = self._column(key)
+            if op == "eq":
+                mask &= column == operand
+            elif op == "ne":
+                mask &= column != operand
+            elif op == "in":
+                mask &= self._isin(column, operand)
+            else:
+                mask &= self._match(column, self._predicate(key, op, operand))
+        return mask
+
+    @classmethod
+    def _predicate(cls, key: str, op: str, operand: Any) -> Callable[[Any], bool]:
+        """Per-value test for the exists / range / prefix / glob operators."""
+        if op == "exists":
+            return lambda v: (v is not None) == bool(operand)
+        if op == "range":
+            bounds = [
+                (cls._COMPARISONS[comparison], bound)
+                for comparison, bound in FilterCompiler.range_bounds(key, operand)
+            ]
+            # Like the jsonb_typeof guard: numbers compare with numbers,
+            # strings with strings, anything else is out of range.
+            kind = str if isinstance(bounds[0][1], str) else (int, float)
+            return lambda v: (
+                isinstance(v, kind) and not isinstance(v, bool)
+                and all(compare(v, bound) for compare, bound in bounds)
+            )
+        if op == "prefix":
+            return lambda v: isinstance(v, str) and v.startswith(str(operand))
+        pattern = re.compile(FilterCompiler.glob_regex(operand))
+        return lambda v: isinstance(v, str) and pattern.search(v) is not None
+
+    @staticmethod
+    def _match(column: np.ndarray, predicate: Callable[[Any], bool]) -> np.ndarray:
+        return np.fromiter(
+            (predicate(v) for v in column), dtype=bool, count=len(column)
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _record(
+        self, row: int, projection: Projection, score: Optional[float] = None
+    ) -> VectorRecord:
+        entry = self._metadata[row]
+        metadata = VectorMetadata(
+            **{**entry, "source_metadata": dict(entry["source_metadata"] or {})}
+        )
+        vector = None
+        if projection != Projection.METADATA:
+            vector = self._ensure_open()[row].tolist()
+        if projection == Projection.VECTOR:
+            metadata.chunk_strategy = ""
+            metadata.chunk_text = ""
+            metadata.source_metadata = None
+            metadata.provider = ""
+        if score is not None:
+            metadata.score = score
+        return VectorRecord(vector=vector, metadata=metadata)
+
+    def _top_k(
+        self, query_vector: Sequence[float], k: int, mask: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (rows, cosine similarities) of the k best rows allowed by mask, best
+        first.
+        """
+        candidates = np.flatnonzero(mask)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        vectors = self._ensure_open()
+        query = np.asarray(query_vector, dtype=np.float32)
+        rows = len(self._metadata)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if len(candidates) == rows:
+                # Unfiltered: one matmul straight over the mapped segment
+                scores = vectors[:rows] @ query / self._norms
+            else:
+                scores = vectors[candidates] @ query / self._norms[candidates]
+            scores = scores / np.linalg.norm(query)
+        scores = np.nan_to_num(scores, nan=-np.inf)
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return candidates[top], scores[top]
+
+    def similarity_search(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        Exact cosine top-k (score = cosine similarity, as PgVectorStore).
+        ef_search / probes are accepted for signature compatibility; the
+        scan is exhaustive, so they have no effect.
+        """
+        with self._lock:
+            mask = self._filter_mask(metadata_filter, repo_id, ingestion_ids)
+            rows, scores = self._top_k(query_vector, k, mask)
+            return [
+                self._record(row, projection, float(score))
+                for row, score in zip(rows, scores)
+            ]
+
+    def similarity_search_mmr(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        fanout: int = DEFAULT_FANOUT,
+        lambda_mult: float = DEFAULT_LAMBDA,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        MMR-diversified similarity search (see
+        PgVectorStore.similarity_search_mmr).
+        """
+        candidates = self.similarity_search(
+            query_vector, k * fanout, metadata_filter,
+            ef_search=ef_search, probes=probes,
+            projection=candidate_projection(projection),
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+        return mmr_rerank(query_vector, candidates, k, lambda_mult, projection)
+
+    def similarity_search_batch(
+        self,
+        queries: Sequence[VectorQuery],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+    ) -> List[List[VectorRecord]]:
+        """One result list per query, in input order."""
+        return [
+            self.similarity_search(
+                q.query_vector, q.k, q.metadata_filter,
+                projection=projection, repo_id=q.repo_id, ingestion_ids=q.ingestion_ids,
+            )
+            for q in queries
+        ]
+
+    def get_chunks_by_document_ids(
+        self,
+        document_ids: Sequence[str],
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> Dict[str, List[VectorRecord]]:
+        """Up to k chunks per document, in chunk_index order."""
+        results: Dict[str, List[VectorRecord]] = {}
+        with self._lock:
+            rows = np.flatnonzero(
+                self._alive
+                & self._isin(self._column("document_id"), map(str, document_ids))
+            )
+            rows = sorted(rows, key=lambda r: (self._metadata[r]["chunk_index"], r))
+            for row in rows:
+                chunks = results.setdefault(str(self._metadata[row]["document_id"]), [])
+                if len(chunks) < k:
+                    chunks.append(self._record(row, projection))
+        return results
+
+    def get_chunks_by_document_id(
+        self,
+        document_id: str,
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> List[VectorRecord]:
+        return self.get_chunks_by_document_ids([document_id], k, projection).get(
+            str(document_id), []
+        )
+
+    def export_chunks(
+        self,
+        ingestion_id: Optional[str] = None,
+        repo_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[VectorRecord]]:
+        """
+        Live rows of an ingestion and / or repository (all rows if neither
+        is given) in lists of batch_size, vectors included (see
+        PgVectorStore.export_chunks). Rows deleted while the export runs
+        are skipped; a compact() in between renumbers the rows, so the
+        export then stops with RuntimeError instead of reading other rows.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._filter_mask(
+                repo_id=repo_id,
+                ingestion_ids=[ingestion_id] if ingestion_id is not None else None,
+            ))
+            generation = self._compactions
+        for start in range(0, len(rows), batch_size):
+            # The lock is not held across the yield: the consumer may
+            # resume the generator on another thread
+            with self._lock:
+                if self._compactions != generation:
+                    raise RuntimeError("NumpyVectorStore was compacted during export")
+                batch = [
+                    self._record(int(row), Projection.FULL)
+                    for row in rows[start:start + batch_size]
+                    if self._alive[row]
+                ]
+            if batch:
+                yield batch
+
+    # ------------------------------------------------------------------
+    # Lifecycle (same surface as PgVectorStore)
+    # ------------------------------------------------------------------
+    def pool_stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+    def check_pool(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Flush the segment; the store must not be used afterwards."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._vectors = None
@@ -0,0 +1,1643 @@
+# src/core/vectorstore/pg_queries.py
+"""
+Everything the sync and async pgvector stores share: configuration, SQL
+builders, row mapping, write counts, the query cache and latency stats.
+
+Nothing in here touches a connection: each builder returns the statement
+(and its parameters) and each mapper takes the fetched rows, so
+PgVectorStore and AsyncPgVectorStore only differ in how they run the I/O.
+"""
+from __future__ import annotations
+from typing import Sequence, List, LiteralString, Optional, Dict, Any, Tuple, Union
+from uuid import UUID
+import json
+import logging
+import threading
+import time
+from psycopg import sql
+from psycopg.types.json import Jsonb
+
+from src.core.vectorstore.base import Projection
+from src.core.vectorstore.collections import Collection
+from src.core.vectorstore.filters import FilterCompiler
+from src.core.vectorstore.latency import LatencyRecorder
+from src.core.vectorstore.query_cache import (
+    DEFAULT_TTL_SECONDS, QueryCache,
+)
+from shared.models.vector import (
+    VectorRecord, VectorMetadata, VectorQuery, WriteCounts, canonical_id, content_hash,
+)
+
+
+class PgVectorQueries:
+    SCHEMA = "ingestion_service"
+
+    _provider: str
+
+    # Chunk table of this store's collection: vector_chunks for the default
+    # collection, vector_chunks_c_<name> for the others (see collections.py).
+    # Index, partition and staging names are derived from it.
+    _table: str = "vector_chunks"
+
+    @property
+    def _chunks_table(self) -> sql.Composed:
+        return sql.SQL("{}.{}").format(
+            sql.Identifier(self.SCHEMA), sql.Identifier(self._table)
+        )
+
+    # dual:        every record goes to the legacy `vectors` table, and those
+    #              linked to a document node to vector_chunks as well.
+    # chunks_only: every record goes to vector_chunks only; `vectors` is
+    #              retired by migrations 20260410_retire_vectors and
+    #              20260610_drop_vectors.
+    WRITE_MODES = ("dual", "chunks_only")
+    _write_mode: str = "dual"
+
+    # none:    ANN index and search on the full-precision vector column.
+    # halfvec: index on vector::halfvec(dim) (half the size); candidates
+    #          come from it and are reranked on the float32 vectors.
+    # binary:  index on binary_quantize(vector)::bit(dim) (1/32 the size),
+    #          hamming-distance candidates, reranked the same way.
+    QUANTIZATIONS = ("none", "halfvec", "binary")
+    _quantization: str = "none"
+    _rerank_factor: int = 4   # candidates fetched per requested result
+    _dimension: int
+    _partitioned: bool = False
+
+    # How a filtered search is planned:
+    # prefilter:  a selective filter. The planner stays free to apply it
+    #             first (btree / GIN indexes) and rank the survivors exactly;
+    #             should it walk the HNSW index instead, hnsw.iterative_scan
+    #             and an ef_search of at least _PREFILTER_EF_SEARCH keep k
+    #             matching rows coming out of it.
+    # postfilter: walk the ANN index and filter rows as they come out, with
+    #             hnsw.iterative_scan so a selective filter cannot starve the
+    #             result below k.
+    # auto:       prefilter when the planner estimates the filter matches at
+    #             most _prefilter_max_rows rows, postfilter otherwise. The
+    #             decision is kept per filter shape (latency.filter_shape) for
+    #             _PLAN_TTL_SECONDS, so the estimate is not run per search.
+    FILTER_STRATEGIES = ("auto", "prefilter", "postfilter")
+    _filter_strategy: str = "auto"
+    _prefilter_max_rows: int = 10000
+    _PREFILTER_EF_SEARCH = 1000   # pgvector's upper limit for hnsw.ef_search
+    _PLAN_TTL_SECONDS = 300.0
+    _MAX_PLAN_SHAPES = 100
+
+    def __init__(
+        self,
+        dsn: str,
+        dimension: int,
+        provider: str = "mock",
+        pool: Any = None,
+        partitioned: bool = False,
+        write_mode: str = "dual",
+        quantization: str = "none",
+        rerank_factor: int = 4,
+        filter_strategy: str = "auto",
+        prefilter_max_rows: int = 10000,
+        collection: Optional[Collection] = None,
+        query_cache_size: int = 0,
+        query_cache_ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self._dsn = dsn
+        self._dimension = dimension
+        self._provider = provider
+        # ConnectionPool (sync store) / AsyncConnectionPool (async store);
+        # None opens a one-off connection per operation
+        self._pool = pool
+        # vector_chunks is LIST-partitioned by repo_id (VECTOR_CHUNKS_PARTITIONED)
+        self._partitioned = partitioned
+        # dual / chunks_only (VECTOR_WRITE_MODE), see WRITE_MODES
+        self._write_mode = self._check_write_mode(write_mode)
+        # none / halfvec / binary (VECTOR_QUANTIZATION), see QUANTIZATIONS
+        self._quantization = self._check_quantization(quantization, rerank_factor)
+        self._rerank_factor = rerank_factor
+        # auto / prefilter / postfilter (VECTOR_FILTER_STRATEGY), see FILTER_STRATEGIES
+        self._filter_strategy = self._check_filter_strategy(filter_strategy)
+        self._prefilter_max_rows = prefilter_max_rows
+        # auto mode: filter shape -> (expires_at, plan)
+        self._plan_lock = threading.Lock()
+        self._plans: Dict[str, Tuple[float, str]] = {}
+        # Named collection (own chunk table); None = the default vector_chunks
+        self._collection = collection
+        if collection is not None:
+            self._table = collection.table
+        # add / similarity_search / get_chunks_by_document_id latency (stats endpoint)
+        self._latency = LatencyRecorder()
+        # similarity_search results, invalidated by this store's writes
+        # (VECTOR_QUERY_CACHE_SIZE / _TTL; off unless a size is given)
+        self._query_cache = QueryCache(query_cache_size, query_cache_ttl)
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics for the stats endpoint."""
+        return self._pool_stats(self._pool)
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """
+        Latency percentiles (p50 / p95 / p99) of add, similarity_search and
+        get_chunks_by_document_id by filter shape, since the store was built.
+        """
+        return self._latency.snapshot()
+
+    def query_cache_stats(self) -> Dict[str, Any]:
+        """Query cache hit / miss counters, size and write generation."""
+        return self._query_cache.stats()
+
+    # ------------------------------------------------------------------
+    # Pool metrics
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _pool_stats(pool: Any) -> Dict[str, Any]:
+        """
+        Connection pool metrics for the stats endpoint (sync or async pool).
+
+        wait_ms / timeouts are cumulative since the pool was opened;
+        in_use is the number of connections currently checked out.
+        """
+        if pool is None:
+            return {"enabled": False}
+
+        stats = pool.get_stats()
+        size = stats.get("pool_size", 0)
+        available = stats.get("pool_available", 0)
+        queued = stats.get("requests_queued", 0)
+        wait_ms = stats.get("requests_wait_ms", 0)
+        return {
+            "enabled": True,
+            "name": pool.name,
+            "min_size": pool.min_size,
+            "max_size": pool.max_size,
+            "size": size,
+            "available": available,
+            "in_use": size - available,
+            "requests_waiting": stats.get("requests_waiting", 0),
+            "requests": stats.get("requests_num", 0),
+            "requests_queued": queued,
+            "wait_ms_total": wait_ms,
+            "wait_ms_avg": (wait_ms / queued) if queued else 0.0,
+            "timeouts": stats.get("requests_errors", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+            "returns_bad": stats.get("returns_bad", 0),
+        }
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    @classmethod
+    def _check_write_mode(cls, write_mode: str) -> str:
+        if write_mode not in cls.WRITE_MODES:
+            raise ValueError(
+                f"Unknown write mode: {write_mode} (expected one of {cls.WRITE_MODES})"
+            )
+        return write_mode
+
+    @property
+    def _dual_write(self) -> bool:
+        return self._write_mode == "dual"
+
+    def _writes_chunk(self, record: VectorRecord) -> bool:
+        """Whether this record gets a vector_chunks row under the write mode."""
+        return bool(record.metadata.document_id) or not self._dual_write
+
+    def _write_tables(self) -> List[str]:
+        """Tables holding this store's rows (cleared by delete_by_ingestion_id)."""
+        return ["vectors", self._table] if self._dual_write else [self._table]
+
+    def _insert_vectors_sql(self) -> sql.Composed:
+        return sql.SQL("""
+            INSERT INTO {schema}.vectors
+            (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+             chunk_text, source_metadata, provider)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """).format(schema=sql.Identifier(self.SCHEMA))
+
+    def _insert_chunks_sql(self) -> sql.Composed:
+        """Per-record insert into the staging table (see _merge_chunks_sql)."""
+        return sql.SQL("""
+            INSERT INTO {staging}
+            (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+             chunk_text, source_metadata, provider, document_id, repo_id,
+             content_hash, canonical_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """).format(staging=sql.Identifier(self._staging_table))
+
+    def _insert_params(self, record: VectorRecord) -> tuple:
+        """
+        Parameters for _insert_vectors_sql (see _insert_chunk_params for
+        vector_chunks).
+        """
+        return (
+            record.vector, record.metadata.ingestion_id,
+            record.metadata.chunk_id, record.metadata.chunk_index,
+            record.metadata.chunk_strategy, record.metadata.chunk_text,
+            Jsonb(record.metadata.source_metadata or {}),
+            record.metadata.provider or self._provider,
+        )
+
+    def _insert_chunk_params(
+        self, record: VectorRecord, repo_ids: Dict[str, Any]
+    ) -> tuple:
+        """Parameters for _insert_chunks_sql."""
+        return self._insert_params(record) + (
+            record.metadata.document_id,
+            self._chunk_repo_id(record, repo_ids),
+            content_hash(record.metadata.chunk_text),
+            canonical_id(record.metadata.source_metadata),
+        )
+
+    # ------------------------------------------------------------------
+    # Idempotent chunk writes
+    # ------------------------------------------------------------------
+    # vector_chunks rows are written to a transaction-local staging table
+    # first, then merged in one statement keyed on the chunk's stable
+    # identity (repo_id, canonical_id, chunk_index) plus content_hash
+    # (migration 20260530_chunk_canonical_key). ingestion_id is new on
+    # every ingestion (document_id too, for uploads), so neither can be
+    # part of the key: a re-sent chunk keeps its row (and its ANN index
+    # entry) and only has its ingestion_id / document_id / chunk_id moved
+    # to the latest write, so ingestion-scoped reads and deletes still
+    # find it. Changed content replaces the row at its position. Rows
+    # without a repo_id or canonical_id never conflict (NULLs are
+    # distinct) and are always new.
+    _CONTENT_KEY = ["repo_id", "canonical_id", "chunk_index", "content_hash"]
+
+    @property
+    def _staging_table(self) -> str:
+        return f"{self._table}_incoming"
+
+    def _content_key(self) -> List[str]:
+        """Columns of the unique key (repo_id included, as partitioning requires)."""
+        return list(self._CONTENT_KEY)
+
+    def _create_staging_sql(self) -> sql.Composed:
+        # Same column types as vector_chunks (vector dimension included), no
+        # constraints / defaults; dropped when the write transaction commits.
+        return sql.SQL("""
+            CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DROP AS
+            SELECT {cols} FROM {chunks} WITH NO DATA
+        """).format(
+            chunks=self._chunks_table,
+            staging=sql.Identifier(self._staging_table),
+            cols=sql.SQL(", ").join(map(sql.Identifier, self._COPY_CHUNK_COLUMNS)),
+        )
+
+    def _merge_chunks_sql(self) -> sql.Composed:
+        """
+        Staging → vector_chunks. Returns one row (unchanged, replaced,
+        inserted): stale rows (same position, other content) are deleted,
+        then every staged row is inserted, or, when its key already exists,
+        the stored row is re-pointed at this write's ingestion / document.
+        Repeats of a key within the batch are merged once.
+        """
+        cols = sql.SQL(", ").join(map(sql.Identifier, self._COPY_CHUNK_COLUMNS))
+        key = sql.SQL(", ").join(map(sql.Identifier, self._content_key()))
+        return sql.SQL("""
+            WITH staged AS (
+                SELECT DISTINCT ON ({key}, CASE
+                    WHEN repo_id IS NULL OR canonical_id IS NULL THEN ctid
+                END) {cols}
+                FROM {staging}
+            ),
+            stale AS (
+                DELETE FROM {chunks} vc
+                USING staged i
+                WHERE vc.repo_id = i.repo_id
+                  AND vc.canonical_id = i.canonical_id
+                  AND vc.chunk_index = i.chunk_index
+                  AND vc.content_hash IS DISTINCT FROM i.content_hash
+                RETURNING vc.repo_id, vc.canonical_id, vc.chunk_index
+            ),
+            merged AS (
+                INSERT INTO {chunks} AS vc ({cols})
+                SELECT {cols} FROM staged
+                ON CONFLICT ({key}) DO UPDATE SET
+                    ingestion_id = EXCLUDED.ingestion_id,
+                    document_id = EXCLUDED.document_id,
+                    chunk_id = EXCLUDED.chunk_id
+                WHERE (vc.ingestion_id, vc.document_id, vc.chunk_id)
+                    IS DISTINCT FROM
+                    (EXCLUDED.ingestion_id, EXCLUDED.document_id, EXCLUDED.chunk_id)
+                RETURNING repo_id, canonical_id, chunk_index, (xmax = 0) AS inserted
+            )
+            SELECT
+                (SELECT count(*) FROM {staging})
+                    - (SELECT count(*) FROM merged WHERE inserted),
+                (SELECT count(*) FROM merged m
+                 WHERE m.inserted AND EXISTS (
+                     SELECT 1 FROM stale s
+                     WHERE s.repo_id = m.repo_id
+                       AND s.canonical_id = m.canonical_id
+                       AND s.chunk_index = m.chunk_index
+                 )),
+                (SELECT count(*) FROM merged WHERE inserted)
+        """).format(
+            chunks=self._chunks_table,
+            staging=sql.Identifier(self._staging_table),
+            cols=cols,
+            key=key,
+        )
+
+    @staticmethod
+    def _write_counts(
+        row: Optional[Sequence[int]], other_new: int = 0
+    ) -> WriteCounts:
+        """
+        WriteCounts from the _merge_chunks_sql row; other_new counts records
+        that only went to the legacy vectors table.
+        """
+        if row is None:
+            raise RuntimeError("chunk merge returned no counts row")
+        unchanged, replaced, inserted = (int(v) for v in row)
+        return WriteCounts(
+            new=other_new + inserted - replaced, unchanged=unchanged, replaced=replaced,
+        )
+
+    def _finish_write(
+        self, path: str, records: Sequence[VectorRecord], counts: WriteCounts
+    ) -> WriteCounts:
+        """Log a committed add / add_bulk and drop the cached search results."""
+        logging.info(
+            f"MS6 {path} ({self._write_mode}): {len(records)} records complete "
+            f"({counts.new} new, {counts.unchanged} unchanged, "
+            f"{counts.replaced} replaced)"
+        )
+        self._query_cache.invalidate()
+        return counts
+
+    # ------------------------------------------------------------------
+    # Collections: one chunk table per embedding model (collections.py)
+    # ------------------------------------------------------------------
+    _TABLE_EXISTS_SQL = "SELECT to_regclass(%s) IS NOT NULL"
+
+    # Indexes every collection table carries (name suffix, key); the same
+    # ones migrations created on vector_chunks. ANN indexes are built on
+    # demand through build_index.
+    _COLLECTION_INDEXES = [
+        ("repo_doc_type", "(repo_id, doc_type)"),
+        ("source_type", "(source_type)"),
+        ("ingestion_id", "(ingestion_id)"),
+        ("source_metadata", "USING gin (source_metadata jsonb_ops)"),
+        ("relative_path", "((source_metadata->>'relative_path') text_pattern_ops)"),
+        ("chunk_tsv", "USING gin (chunk_tsv)"),
+    ]
+
+    def _create_collection_sql(self) -> List[sql.Composed]:
+        """
+        DDL creating this store's collection table from vector_chunks: same
+        columns, defaults (the shared id sequence) and generated columns,
+        a vector(dimension) column, the content key and the filter / text
+        indexes; partitioned by repo_id like vector_chunks when the store is.
+        """
+        statements = [
+            sql.SQL("""
+                CREATE TABLE IF NOT EXISTS {chunks} (
+                    LIKE {schema}.vector_chunks
+                    INCLUDING DEFAULTS INCLUDING GENERATED
+                ){partition_by}
+            """).format(
+                chunks=self._chunks_table,
+                schema=sql.Identifier(self.SCHEMA),
+                partition_by=sql.SQL(
+                    " PARTITION BY LIST (repo_id)" if self._partitioned else ""
+                ),
+            ),
+            sql.SQL(
+                "ALTER TABLE {chunks} ALTER COLUMN vector TYPE vector({dim})"
+            ).format(
+                chunks=self._chunks_table, dim=sql.SQL(str(int(self._dimension)))
+            ),
+        ]
+        if self._partitioned:
+            statements.append(
+                sql.SQL(
+                    "CREATE TABLE IF NOT EXISTS {schema}.{default}"
+                    " PARTITION OF {chunks} DEFAULT"
+                ).format(
+                    schema=sql.Identifier(self.SCHEMA),
+                    default=sql.Identifier(f"{self._table}_default"),
+                    chunks=self._chunks_table,
+                )
+            )
+        statements.append(
+            sql.SQL(
+                "CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {chunks} ({key})"
+            ).format(
+                index=sql.Identifier(f"uq_{self._table}_content"),
+                chunks=self._chunks_table,
+                key=sql.SQL(", ").join(map(sql.Identifier, self._content_key())),
+            )
+        )
+        statements += [
+            sql.SQL("CREATE INDEX IF NOT EXISTS {index} ON {chunks} {key}").format(
+                index=sql.Identifier(f"ix_{self._table}_{suffix}"),
+                chunks=self._chunks_table,
+                key=sql.SQL(key),
+            )
+            for suffix, key in self._COLLECTION_INDEXES
+        ]
+        return statements
+
+    def _register_collection_sql(self) -> sql.Composed:
+        return sql.SQL("""
+            INSERT INTO {schema}.vector_collections
+                (name, provider, model, dimension, table_name)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (name) DO NOTHING
+        """).format(schema=sql.Identifier(self.SCHEMA))
+
+    def _collection_to_create(self) -> Optional[Collection]:
+        """This store's collection unless it is the default (managed by migrations)."""
+        if self._collection is None or self._collection.is_default:
+            return None
+        return self._collection
+
+    @staticmethod
+    def _table_exists(row: Optional[Sequence[Any]]) -> bool:
+        """_TABLE_EXISTS_SQL row → whether to_regclass found the table."""
+        return row is not None and row[0] is not None and bool(row[0])
+
+    def _register_collection_params(self, collection: Collection) -> tuple:
+        return (
+            collection.name, collection.provider, collection.model,
+            collection.dimension, self._table,
+        )
+
+    # ------------------------------------------------------------------
+    # Scope columns: repo_id / doc_type / source_type on vector_chunks
+    # ------------------------------------------------------------------
+    # Filters on these columns are compiled by FilterCompiler (SCOPE_COLUMNS).
+    @staticmethod
+    def _metadata_repo_id(record: VectorRecord) -> Optional[UUID]:
+        """repo_id carried in source_metadata (code ingestion), if it is a UUID."""
+        value = (record.metadata.source_metadata or {}).get("repo_id")
+        try:
+            return UUID(str(value)) if value else None
+        except ValueError:
+            return None
+
+    def _documents_missing_repo_id(self, records: Sequence[VectorRecord]) -> List[str]:
+        """document_ids whose repo_id must be looked up in document_nodes."""
+        return sorted({
+            str(r.metadata.document_id)
+            for r in records
+            if r.metadata.document_id and self._metadata_repo_id(r) is None
+        })
+
+    def _repo_ids_sql(self) -> sql.Composed:
+        return sql.SQL("""
+            SELECT document_id, repo_id
+            FROM {schema}.document_nodes
+            WHERE document_id = ANY(%s::uuid[])
+        """).format(schema=sql.Identifier(self.SCHEMA))
+
+    def _chunk_repo_id(
+        self, record: VectorRecord, repo_ids: Dict[str, Any]
+    ) -> Optional[UUID]:
+        """
+        repo_id for a vector_chunks row: source_metadata["repo_id"], else the
+        owning document node's repo_id (from the _repo_ids_sql lookup).
+        """
+        repo_id = self._metadata_repo_id(record)
+        if repo_id is None and record.metadata.document_id:
+            found = repo_ids.get(str(record.metadata.document_id))
+            repo_id = UUID(str(found)) if found else None
+        return repo_id
+
+    # ------------------------------------------------------------------
+    # Partitioned layout: vector_chunks LIST-partitioned by repo_id
+    # (migration 20260401_partition_chunks); rows without a repo_id land
+    # in vector_chunks_default.
+    # ------------------------------------------------------------------
+    def _partition_name(self, repo_id: Any) -> str:
+        return f"{self._table}_r_{UUID(str(repo_id)).hex}"
+
+    def _create_partition_sql(self, repo_id: Any) -> sql.Composed:
+        return sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {schema}.{partition}
+            PARTITION OF {chunks} FOR VALUES IN ({repo_id})
+        """).format(
+            chunks=self._chunks_table,
+            schema=sql.Identifier(self.SCHEMA),
+            partition=sql.Identifier(self._partition_name(repo_id)),
+            repo_id=sql.Literal(str(UUID(str(repo_id)))),
+        )
+
+    def _drop_partition_sql(self, repo_id: Any) -> sql.Composed:
+        return sql.SQL("DROP TABLE IF EXISTS {schema}.{partition}").format(
+            schema=sql.Identifier(self.SCHEMA),
+            partition=sql.Identifier(self._partition_name(repo_id)),
+        )
+
+    def _delete_by_repo_sql(self) -> sql.Composed:
+        return sql.SQL(
+            "DELETE FROM {chunks} WHERE repo_id = %s::uuid"
+        ).format(chunks=self._chunks_table)
+
+    def _delete_by_repo_statement(self, repo_id: str) -> Tuple[sql.Composed, tuple]:
+        """Partitioned: drop the repo's partition; otherwise DELETE its rows."""
+        if self._partitioned:
+            return self._drop_partition_sql(repo_id), ()
+        return self._delete_by_repo_sql(), (str(repo_id),)
+
+    def _delete_by_repo_result(self, repo_id: str, rowcount: int) -> Dict[str, Any]:
+        if self._partitioned:
+            return {"repo_id": repo_id, "mode": "drop_partition"}
+        return {"repo_id": repo_id, "mode": "delete", "deleted": rowcount}
+
+    @staticmethod
+    def _repo_id_lookup(rows: Sequence[tuple]) -> Dict[str, Any]:
+        """_repo_ids_sql rows → {document_id: repo_id}."""
+        return {str(document_id): repo_id for document_id, repo_id in rows}
+
+    def _chunk_repo_ids(
+        self, records: Sequence[VectorRecord], repo_ids: Dict[str, Any]
+    ) -> set:
+        """Distinct repo_ids the vector_chunks rows of this batch will carry."""
+        return {
+            repo_id
+            for r in records
+            if self._writes_chunk(r)
+            for repo_id in [self._chunk_repo_id(r, repo_ids)]
+            if repo_id is not None
+        }
+
+    # Column order / binary types shared by both COPY streams in add_bulk().
+    _COPY_COLUMNS = [
+        "vector", "ingestion_id", "chunk_id", "chunk_index", "chunk_strategy",
+        "chunk_text", "source_metadata", "provider",
+    ]
+    _COPY_TYPES = ["vector", "uuid", "text", "int4", "text", "text", "jsonb", "text"]
+    # vector_chunks adds its link / scope / dedup columns to the shared ones.
+    _COPY_CHUNK_COLUMNS = _COPY_COLUMNS + [
+        "document_id", "repo_id", "content_hash", "canonical_id",
+    ]
+    _COPY_CHUNK_TYPES = _COPY_TYPES + ["uuid", "uuid", "text", "text"]
+
+    def _copy_sql(self, table: str, columns: Sequence[str]) -> sql.Composed:
+        return sql.SQL(
+            "COPY {schema}.{table} ({cols}) FROM STDIN (FORMAT BINARY)"
+        ).format(
+            schema=sql.Identifier(self.SCHEMA),
+            table=sql.Identifier(table),
+            cols=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        )
+
+    def _copy_staging_sql(self) -> sql.Composed:
+        return sql.SQL("COPY {staging} ({cols}) FROM STDIN (FORMAT BINARY)").format(
+            staging=sql.Identifier(self._staging_table),
+            cols=sql.SQL(", ").join(map(sql.Identifier, self._COPY_CHUNK_COLUMNS)),
+        )
+
+    def _copy_chunk_row(self, record: VectorRecord, repo_ids: Dict[str, Any]) -> tuple:
+        document_id = record.metadata.document_id
+        return self._copy_row(record) + (
+            UUID(str(document_id)) if document_id else None,
+            self._chunk_repo_id(record, repo_ids),
+            content_hash(record.metadata.chunk_text),
+            canonical_id(record.metadata.source_metadata),
+        )
+
+    def _copy_row(self, record: VectorRecord) -> tuple:
+        m = record.metadata
+        return (
+            record.vector,
+            UUID(str(m.ingestion_id)),
+            m.chunk_id,
+            m.chunk_index,
+            m.chunk_strategy,
+            m.chunk_text,
+            m.source_metadata or {},
+            m.provider or self._provider,
+        )
+
+    def _delete_sql(self, table: str) -> sql.Composed:
+        return sql.SQL("""
+            DELETE FROM {schema}.{table_name} WHERE ingestion_id = %s
+        """).format(
+            schema=sql.Identifier(self.SCHEMA),
+            table_name=sql.Identifier(table),
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    # Result columns every read returns, in row order (score is appended by searches).
+    _RESULT_COLUMNS = [
+        "vector", "ingestion_id", "chunk_id", "chunk_index", "chunk_strategy",
+        "chunk_text", "source_metadata", "provider", "document_id",
+    ]
+    # Columns replaced by a cheap constant when the projection leaves them out.
+    _PROJECTED_OUT = {
+        Projection.METADATA: {"vector": "NULL"},
+        Projection.VECTOR: {
+            "chunk_strategy": "''", "chunk_text": "''",
+            "source_metadata": "NULL", "provider": "''",
+        },
+        Projection.FULL: {},
+    }
+
+    @classmethod
+    def _select_list(
+        cls, projection: Projection = Projection.FULL, alias: Optional[str] = None
+    ) -> sql.Composed:
+        """
+        SELECT list for _RESULT_COLUMNS under a projection. Omitted columns
+        keep their position (as constants) so row unpacking stays the same,
+        but the embedding / payload is never read or shipped.
+        """
+        omitted = cls._PROJECTED_OUT[Projection(projection)]
+        items = []
+        for col in cls._RESULT_COLUMNS:
+            if col in omitted:
+                items.append(
+                    sql.SQL("{} AS {}").format(
+                        sql.SQL(omitted[col]), sql.Identifier(col)
+                    )
+                )
+            elif alias:
+                items.append(sql.Identifier(alias, col))
+            else:
+                items.append(sql.Identifier(col))
+        return sql.SQL(", ").join(items)
+
+    @staticmethod
+    def _record_from_row(row: Sequence[Any]) -> VectorRecord:
+        """Build a VectorRecord from a _RESULT_COLUMNS row (optionally + score)."""
+        (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
+         chunk_text, source_metadata, provider, document_id) = row[:9]
+        metadata = VectorMetadata(
+            ingestion_id=ingestion_id,
+            chunk_id=chunk_id,
+            chunk_index=chunk_index,
+            chunk_strategy=chunk_strategy,
+            chunk_text=chunk_text,
+            source_metadata=source_metadata,
+            provider=provider,
+            document_id=document_id,
+        )
+        if len(row) > 9:
+            metadata.score = row[9]
+        return VectorRecord(vector=vector, metadata=metadata)
+
+    @classmethod
+    def _records_from_rows(cls, rows: Sequence[Sequence[Any]]) -> List[VectorRecord]:
+        return [cls._record_from_row(row) for row in rows]
+
+    @classmethod
+    def _batch_results(
+        cls, rows: Sequence[Sequence[Any]], queries: int
+    ) -> List[List[VectorRecord]]:
+        """_batch_search_query rows (query index first) → one list per query."""
+        results: List[List[VectorRecord]] = [[] for _ in range(queries)]
+        for row in rows:
+            results[row[0]].append(cls._record_from_row(row[1:]))
+        return results
+
+    @classmethod
+    def _records_by_document(
+        cls, rows: Sequence[Sequence[Any]]
+    ) -> Dict[str, List[VectorRecord]]:
+        """_chunks_by_document_ids_query rows grouped by document_id."""
+        results: Dict[str, List[VectorRecord]] = {}
+        for row in rows:
+            record = cls._record_from_row(row)
+            results.setdefault(str(record.metadata.document_id), []).append(record)
+        return results
+
+    def _similarity_search_query(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[sql.Composed, List[Any]]:
+        where_clause, filter_values = self._filter_clause(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids
+        )
+        source, where_clause = self._nearest_source(
+            where_clause, sql.SQL("query.qvec"), sql.Literal(int(k)), with_query=True
+        )
+        search_sql = sql.SQL("""
+            WITH query AS (SELECT {qvec}::vector AS qvec)
+            SELECT {columns},
+                   1 - (vc.vector <=> query.qvec) AS score
+            FROM {source}, query
+            {where}
+            ORDER BY vc.vector <=> query.qvec
+            LIMIT {limit}
+        """).format(
+            source=source,
+            columns=self._select_list(projection, "vc"),
+            where=where_clause,
+            qvec=sql.Placeholder(),
+            limit=sql.Placeholder(),
+        )
+        return search_sql, [query_vector] + filter_values + [k]
+
+    # ------------------------------------------------------------------
+    # Quantized candidate generation (QUANTIZATIONS)
+    # ------------------------------------------------------------------
+    @classmethod
+    def _check_quantization(cls, quantization: str, rerank_factor: int) -> str:
+        if quantization not in cls.QUANTIZATIONS:
+            raise ValueError(
+                f"Unknown quantization: {quantization}"
+                f" (expected one of {cls.QUANTIZATIONS})"
+            )
+        if rerank_factor < 1:
+            raise ValueError(f"rerank_factor must be >= 1, got {rerank_factor}")
+        return quantization
+
+    def _quantized(self, value: sql.Composable) -> sql.Composed:
+        """value (a vector expression) in the quantized form the index is built on."""
+        dim = sql.SQL(str(int(self._dimension)))
+        if self._quantization == "halfvec":
+            return sql.SQL("({}::halfvec({}))").format(value, dim)
+        return sql.SQL("(binary_quantize({})::bit({}))").format(value, dim)
+
+    def _quantized_distance(
+        self, column: sql.Composable, qvec: sql.Composable
+    ) -> sql.Composed:
+        operator = "<~>" if self._quantization == "binary" else "<=>"
+        return sql.SQL("{} {} {}").format(
+            self._quantized(column), sql.SQL(operator), self._quantized(qvec)
+        )
+
+    def _nearest_source(
+        self,
+        where_clause: sql.Composable,
+        qvec: sql.Composable,
+        limit: sql.Composable,
+        with_query: bool = False,
+    ) -> Tuple[sql.Composable, sql.Composable]:
+        """
+        (FROM item aliased vc, WHERE clause to apply to it) for a nearest-
+        neighbour scan the caller orders by exact vc.vector <=> qvec.
+
+        Unquantized: the table itself with the filter. Quantized: the
+        limit * rerank_factor rows nearest by quantized distance (an
+        expression-index scan), filtered inside; the caller's exact ORDER BY
+        then reranks those candidates on the float32 vectors.
+        with_query adds the `query` CTE to the candidate scan's FROM.
+        """
+        table = self._chunks_table
+        if self._quantization == "none":
+            return sql.SQL("{} vc").format(table), where_clause
+        source = sql.SQL("""(
+                SELECT c.*
+                FROM {table} c{query}
+                {where}
+                ORDER BY {distance}
+                LIMIT {limit} * {factor}
+            ) vc""").format(
+            table=table,
+            query=sql.SQL(", query") if with_query else sql.SQL(""),
+            where=where_clause,
+            distance=self._quantized_distance(sql.SQL("c.vector"), qvec),
+            limit=limit,
+            factor=sql.Literal(int(self._rerank_factor)),
+        )
+        return source, sql.SQL("")
+
+    # ------------------------------------------------------------------
+    # Lexical / hybrid search over the generated chunk_tsv column
+    # (migration 20260420_chunk_tsv)
+    # ------------------------------------------------------------------
+    # Must match the config in the chunk_tsv generation expression. 'simple'
+    # does no stemming or stop words, so identifiers survive as written.
+    TEXT_SEARCH_CONFIG = "simple"
+    # ts_rank_cd normalization: divide by 1 + log(document length), so long
+    # chunks don't win on term count alone (closer to BM25's length norm).
+    _TS_RANK_NORMALIZATION = 1
+    RRF_K = 60
+
+    def _tsquery(self) -> sql.Composed:
+        return sql.SQL("websearch_to_tsquery({config}, {text})").format(
+            config=sql.Literal(self.TEXT_SEARCH_CONFIG), text=sql.Placeholder()
+        )
+
+    def _lexical_search_query(
+        self,
+        query_text: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """Full-text match on chunk_tsv (GIN index), ranked by ts_rank_cd."""
+        where_clause, filter_values = self._filter_clause(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids,
+            extra_conditions=[sql.SQL("vc.chunk_tsv @@ query.tsq")],
+        )
+        search_sql = sql.SQL("""
+            WITH query AS (SELECT {tsq} AS tsq)
+            SELECT {columns},
+                   ts_rank_cd(vc.chunk_tsv, query.tsq, {norm}) AS score
+            FROM {chunks} vc, query
+            {where}
+            ORDER BY score DESC, vc.id
+            LIMIT {limit}
+        """).format(
+            chunks=self._chunks_table,
+            columns=self._select_list(projection, "vc"),
+            tsq=self._tsquery(),
+            norm=sql.Literal(self._TS_RANK_NORMALIZATION),
+            where=where_clause,
+            limit=sql.Placeholder(),
+        )
+        return search_sql, [query_text] + filter_values + [k]
+
+    def _hybrid_search_query(
+        self,
+        query_vector: Sequence[float],
+        query_text: str,
+        k: int,
+        vector_k: int,
+        lexical_k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+        rrf_k: Optional[int] = None,
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """
+        Reciprocal rank fusion of a vector and a lexical candidate list in
+        one statement. Each side takes its own top-N (vector_k by <=>, so
+        the ANN index applies; lexical_k by ts_rank_cd, via the GIN index),
+        ranks are numbered within those N rows only, and every chunk scores
+        sum(1 / (rrf_k + rank)) over the lists it appears in.
+        """
+        vector_where, vector_values = self._filter_clause(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids
+        )
+        vector_source, vector_where = self._nearest_source(
+            vector_where, sql.SQL("query.qvec"), sql.Literal(int(vector_k)),
+            with_query=True,
+        )
+        lexical_where, lexical_values = self._filter_clause(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids,
+            extra_conditions=[sql.SQL("vc.chunk_tsv @@ query.tsq")],
+        )
+        search_sql = sql.SQL("""
+            WITH query AS (SELECT {qvec}::vector AS qvec, {tsq} AS tsq),
+            vector_hits AS (
+                SELECT id, row_number() OVER (ORDER BY distance, id) AS rank
+                FROM (
+                    SELECT vc.id, vc.vector <=> query.qvec AS distance
+                    FROM {vector_source}, query
+                    {vector_where}
+                    ORDER BY vc.vector <=> query.qvec
+                    LIMIT {vector_k}
+                ) v
+            ),
+            lexical_hits AS (
+                SELECT id, row_number() OVER (ORDER BY lexical_score DESC, id) AS rank
+                FROM (
+                    SELECT vc.id,
+                           ts_rank_cd(vc.chunk_tsv, query.tsq, {norm}) AS lexical_score
+                    FROM {chunks} vc, query
+                    {lexical_where}
+                    ORDER BY lexical_score DESC
+                    LIMIT {lexical_k}
+                ) l
+            ),
+            fused AS (
+                SELECT id, sum(1.0 / ({rrf_k} + rank)) AS score
+                FROM (
+                    SELECT id, rank FROM vector_hits
+                    UNION ALL
+                    SELECT id, rank FROM lexical_hits
+                ) ranked
+                GROUP BY id
+                ORDER BY score DESC, id
+                LIMIT {limit}
+            )
+            SELECT {columns}, fused.score::float8 AS score
+            FROM fused
+            JOIN {chunks} vc ON vc.id = fused.id
+            ORDER BY fused.score DESC, vc.id
+        """).format(
+            chunks=self._chunks_table,
+            columns=self._select_list(projection, "vc"),
+            qvec=sql.Placeholder(),
+            tsq=self._tsquery(),
+            norm=sql.Literal(self._TS_RANK_NORMALIZATION),
+            vector_source=vector_source,
+            vector_where=vector_where,
+            lexical_where=lexical_where,
+            vector_k=sql.Placeholder(),
+            lexical_k=sql.Placeholder(),
+            rrf_k=sql.Literal(self.RRF_K if rrf_k is None else int(rrf_k)),
+            limit=sql.Placeholder(),
+        )
+        params = (
+            [query_vector, query_text]
+            + vector_values + [vector_k]
+            + lexical_values + [lexical_k]
+            + [k]
+        )
+        return search_sql, params
+
+    def _batch_search_query(
+        self,
+        queries: Sequence[VectorQuery],
+        projection: Projection = Projection.FULL,
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """
+        Queries sharing the same metadata_filter and scope are grouped; each group is a
+        LATERAL join over an unnested array of (query_index, query_vector, k),
+        so every query still gets its own ORDER BY <=> ... LIMIT k (and can
+        use the ANN index). Groups are combined with UNION ALL.
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        for index, query in enumerate(queries):
+            key = json.dumps(
+                [query.metadata_filter or {}, query.repo_id, query.ingestion_ids],
+                sort_keys=True,
+                default=str,
+            )
+            group = groups.setdefault(
+                key, {"query": query, "indexes": [], "vectors": [], "ks": []}
+            )
+            group["indexes"].append(index)
+            group["vectors"].append(self._vector_literal(query.query_vector))
+            group["ks"].append(int(query.k))
+
+        selects = []
+        params: List[Any] = []
+        for group in groups.values():
+            where_clause, filter_values = self._filter_clause(
+                group["query"].metadata_filter,
+                repo_id=group["query"].repo_id,
+                ingestion_ids=group["query"].ingestion_ids,
+            )
+            source, where_clause = self._nearest_source(
+                where_clause, sql.SQL("q.qvec"), sql.SQL("q.k")
+            )
+            selects.append(sql.SQL("""
+                SELECT q.query_index, r.*
+                FROM (
+                    SELECT u.query_index, u.qvec::vector AS qvec, u.k
+                    FROM unnest({indexes}::int[], {vectors}::text[], {ks}::int[])
+                         AS u(query_index, qvec, k)
+                ) q
+                CROSS JOIN LATERAL (
+                    SELECT {columns},
+                           1 - (vc.vector <=> q.qvec) AS score
+                    FROM {source}
+                    {where}
+                    ORDER BY vc.vector <=> q.qvec
+                    LIMIT q.k
+                ) r
+            """).format(
+                source=source,
+                columns=self._select_list(projection, "vc"),
+                where=where_clause,
+                indexes=sql.Placeholder(),
+                vectors=sql.Placeholder(),
+                ks=sql.Placeholder(),
+            ))
+            params.extend([group["indexes"], group["vectors"], group["ks"]])
+            params.extend(filter_values)
+
+        batch_sql = sql.SQL("{selects} ORDER BY query_index, score DESC").format(
+            selects=sql.SQL(" UNION ALL ").join(selects)
+        )
+        return batch_sql, params
+
+    def _chunks_by_document_id_query(
+        self, projection: Projection = Projection.FULL
+    ) -> sql.Composed:
+        return sql.SQL("""
+            SELECT {columns}
+            FROM {chunks}
+            WHERE document_id = {doc_id}
+            LIMIT {limit}
+        """).format(
+            chunks=self._chunks_table,
+            columns=self._select_list(projection),
+            doc_id=sql.Placeholder(),
+            limit=sql.Placeholder(),
+        )
+
+    def _chunks_by_document_ids_query(
+        self, projection: Projection = Projection.FULL
+    ) -> sql.Composed:
+        """
+        A single WHERE document_id = ANY(...) scan with a per-document
+        row_number() window, chunks in chunk_index order.
+        """
+        return sql.SQL("""
+            SELECT {columns}
+            FROM (
+                SELECT {columns},
+                    row_number() OVER (
+                        PARTITION BY document_id ORDER BY chunk_index, id
+                    ) AS rn
+                FROM {chunks}
+                WHERE document_id = ANY({doc_ids}::uuid[])
+            ) ranked
+            WHERE rn <= {limit}
+            ORDER BY document_id, rn
+        """).format(
+            chunks=self._chunks_table,
+            columns=self._select_list(projection),
+            doc_ids=sql.Placeholder(),
+            limit=sql.Placeholder(),
+        )
+
+    # Named (server-side) cursor for export_chunks: rows are fetched in
+    # batches, so memory stays flat however many rows match.
+    EXPORT_CURSOR = "vector_chunks_export"
+
+    def _export_query(
+        self, ingestion_id: Optional[str] = None, repo_id: Optional[str] = None
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """Every stored column of the matching chunks, in insertion (id) order."""
+        where_clause, values = self._filter_clause(
+            None, repo_id=repo_id,
+            ingestion_ids=[ingestion_id] if ingestion_id is not None else None,
+        )
+        return sql.SQL("""
+            SELECT {columns}
+            FROM {chunks}
+            {where}
+            ORDER BY id
+        """).format(
+            chunks=self._chunks_table,
+            columns=self._select_list(Projection.FULL),
+            where=where_clause,
+        ), values
+
+    @staticmethod
+    def _search_cache_key(
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        ef_search: Optional[int],
+        probes: Optional[int],
+        projection: Projection,
+        repo_id: Optional[str],
+        ingestion_ids: Optional[Sequence[str]],
+    ) -> str:
+        """QueryCache key of a similarity_search (ingestion_ids order-insensitive)."""
+        return QueryCache.key(
+            query_vector, k,
+            metadata_filter=metadata_filter or None,
+            ef_search=ef_search,
+            probes=probes,
+            projection=Projection(projection).value,
+            repo_id=str(repo_id) if repo_id is not None else None,
+            ingestion_ids=sorted(map(str, ingestion_ids)) if ingestion_ids else None,
+        )
+
+    def _cached_search(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        ef_search: Optional[int],
+        probes: Optional[int],
+        projection: Projection,
+        repo_id: Optional[str],
+        ingestion_ids: Optional[Sequence[str]],
+    ) -> Tuple[str, Optional[List[VectorRecord]], int]:
+        """
+        (cache key, cached results or None, write generation) of a
+        similarity_search; results computed after a miss are stored with
+        self._query_cache.put(key, results, generation).
+        """
+        key = self._search_cache_key(
+            query_vector, k, metadata_filter, ef_search, probes, projection,
+            repo_id, ingestion_ids,
+        )
+        generation = self._query_cache.generation
+        return key, self._query_cache.get(key), generation
+
+    @staticmethod
+    def _vector_literal(vector: Sequence[float]) -> str:
+        """pgvector text form '[x,y,...]' (used where vectors travel inside arrays)."""
+        return "[" + ",".join(str(float(v)) for v in vector) + "]"
+
+    @staticmethod
+    def _filter_clause(
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+        extra_conditions: Sequence[sql.Composable] = (),
+    ) -> tuple[sql.Composable, List[Any]]:
+        """WHERE clause for a metadata_filter plus scope (see FilterCompiler)."""
+        return FilterCompiler.compile(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids,
+            extra_conditions=extra_conditions,
+        )
+
+    # ------------------------------------------------------------------
+    # Filtered search plans (FILTER_STRATEGIES)
+    # ------------------------------------------------------------------
+    @classmethod
+    def _check_filter_strategy(cls, filter_strategy: str) -> str:
+        if filter_strategy not in cls.FILTER_STRATEGIES:
+            raise ValueError(
+                f"Unknown filter strategy: {filter_strategy} "
+                f"(expected one of {cls.FILTER_STRATEGIES})"
+            )
+        return filter_strategy
+
+    @staticmethod
+    def _is_filtered(
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> bool:
+        return bool(metadata_filter) or repo_id is not None or bool(ingestion_ids)
+
+    def _filter_estimate_query(
+        self,
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> Tuple[sql.Composed, List[Any]]:
+        """EXPLAIN of the bare filter; the planner's row estimate, no execution."""
+        where_clause, filter_values = self._filter_clause(
+            metadata_filter, repo_id=repo_id, ingestion_ids=ingestion_ids
+        )
+        return sql.SQL(
+            "EXPLAIN (FORMAT JSON) SELECT 1 FROM {chunks} {where}"
+        ).format(chunks=self._chunks_table, where=where_clause), filter_values
+
+    @staticmethod
+    def _estimated_rows(row: Any) -> Optional[float]:
+        """Top-level "Plan Rows" of an EXPLAIN (FORMAT JSON) row, if readable."""
+        try:
+            plan = row[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return float(plan[0]["Plan"]["Plan Rows"])
+        except (TypeError, KeyError, IndexError, ValueError):
+            return None
+
+    def _filter_plan(
+        self, filtered: bool, estimated_rows: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        "prefilter" / "postfilter" for a filtered search, None when there is
+        no filter. In auto mode without an estimate, postfilter.
+        """
+        if not filtered:
+            return None
+        if self._filter_strategy != "auto":
+            return self._filter_strategy
+        return self._auto_plan(estimated_rows)
+
+    def _auto_plan(self, estimated_rows: Optional[float]) -> str:
+        if estimated_rows is not None and estimated_rows <= self._prefilter_max_rows:
+            return "prefilter"
+        return "postfilter"
+
+    def _needs_estimate(
+        self,
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str],
+        ingestion_ids: Optional[Sequence[str]],
+    ) -> bool:
+        """Whether _search_plan has to ask the planner (auto mode, filtered)."""
+        return self._filter_strategy == "auto" and self._is_filtered(
+            metadata_filter, repo_id, ingestion_ids
+        )
+
+    def _known_plan(self, shape: str) -> Optional[str]:
+        """The auto plan chosen for a filter shape, unless it has expired."""
+        with self._plan_lock:
+            entry = self._plans.get(shape)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def _remember_plan(self, shape: str, plan: str) -> str:
+        with self._plan_lock:
+            if shape not in self._plans and len(self._plans) >= self._MAX_PLAN_SHAPES:
+                self._plans.clear()
+            self._plans[shape] = (time.monotonic() + self._PLAN_TTL_SECONDS, plan)
+        return plan
+
+    def _batch_plan(self, queries: Sequence[VectorQuery]) -> Optional[str]:
+        """One plan for a whole batch statement: no per-query estimate."""
+        return self._filter_plan(any(
+            self._is_filtered(q.metadata_filter, q.repo_id, q.ingestion_ids)
+            for q in queries
+        ))
+
+    @classmethod
+    def _search_params_sql(
+        cls,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        plan: Optional[str] = None,
+    ) -> Optional[sql.Composed]:
+        """
+        Statement that SET LOCALs the ANN recall knobs and the filter plan's
+        settings (they reset when the transaction ends), or None when there
+        is nothing to set.
+        """
+        settings: List[Tuple[str, str]] = []
+        if plan == "prefilter":
+            ef_search = max(ef_search or 0, cls._PREFILTER_EF_SEARCH)
+        if ef_search is not None:
+            settings.append(("hnsw.ef_search", str(int(ef_search))))
+        if probes is not None:
+            settings.append(("ivfflat.probes", str(int(probes))))
+        if plan is not None:
+            # ivfflat only offers relaxed_order, which can return neighbours
+            # out of distance order, so it is left off.
+            settings.append(("hnsw.iterative_scan", "strict_order"))
+        if not settings:
+            return None
+
+        # SET LOCAL does not take bind parameters; set_config(..., true) is
+        # the parameterised equivalent.
+        return sql.SQL("SELECT {}").format(
+            sql.SQL(", ").join(
+                sql.SQL("set_config({name}, {value}, true)").format(
+                    name=sql.Literal(name),
+                    value=sql.Literal(value),
+                )
+                for name, value in settings
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Table / index statistics (stats endpoint)
+    # ------------------------------------------------------------------
+    # This store's tables and, when partitioned, their partitions.
+    _STATS_RELATIONS = """
+        WITH rels AS (
+            SELECT c.oid
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %(schema)s AND c.relname = ANY(%(tables)s)
+            UNION
+            SELECT i.inhrelid
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %(schema)s AND c.relname = ANY(%(tables)s)
+        )
+    """
+
+    # Live / dead tuples are the statistics collector's estimates; seq_scan
+    # vs idx_scan shows searches falling back to sequential scans.
+    _TABLE_STATS_SQL = _STATS_RELATIONS + """
+        SELECT c.relname, s.n_live_tup, s.n_dead_tup,
+               pg_total_relation_size(c.oid), s.seq_scan, s.seq_tup_read,
+               s.idx_scan, greatest(s.last_vacuum, s.last_autovacuum)
+        FROM rels
+        JOIN pg_class c ON c.oid = rels.oid
+        JOIN pg_stat_user_tables s ON s.relid = c.oid
+        ORDER BY c.relname
+    """
+
+    _INDEX_STATS_SQL = _STATS_RELATIONS + """
+        SELECT i.relname, t.relname, am.amname, ix.indisvalid,
+               pg_relation_size(i.oid), s.idx_scan
+        FROM rels
+        JOIN pg_index ix ON ix.indrelid = rels.oid
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_am am ON am.oid = i.relam
+        LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
+        ORDER BY t.relname, i.relname
+    """
+
+    # Rows per repo_id estimated from the planner statistics (ANALYZE):
+    # the repo_id most-common-values frequencies times reltuples, summed
+    # over vector_chunks or, when partitioned, its per-repo partitions.
+    # Repos outside the most-common-values list and NULL repo_ids are not
+    # reported. No table scan, so it is the default for the stats endpoint.
+    _REPO_ESTIMATES_SQL = _STATS_RELATIONS + """
+        SELECT v.repo_id, sum(round(v.freq * greatest(c.reltuples, 0)))::bigint
+        FROM rels
+        JOIN pg_class c ON c.oid = rels.oid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_stats s
+          ON s.schemaname = n.nspname AND s.tablename = c.relname
+         AND s.attname = 'repo_id' AND NOT s.inherited
+        CROSS JOIN LATERAL unnest(
+            s.most_common_vals::text::uuid[], s.most_common_freqs
+        ) AS v(repo_id, freq)
+        GROUP BY v.repo_id
+        ORDER BY 2 DESC
+    """
+
+    def _stats_params(self) -> Dict[str, Any]:
+        tables = ["vectors", self._table] if self._dual_write else [self._table]
+        return {"schema": self.SCHEMA, "tables": tables}
+
+    def _repo_counts_sql(self) -> sql.Composed:
+        """
+        Exact chunk count per repo_id. Counts every row of vector_chunks
+        (a full scan, or an index-only scan of the repo_id index at best),
+        so it only runs on request.
+        """
+        return sql.SQL("""
+            SELECT repo_id, count(*)
+            FROM {chunks}
+            GROUP BY repo_id
+            ORDER BY count(*) DESC
+        """).format(chunks=self._chunks_table)
+
+    def _repo_counts_statement(
+        self, exact: bool
+    ) -> Tuple[Union[LiteralString, sql.Composed], Optional[Dict[str, Any]]]:
+        """(query, params) for the stats' per-repo rows: exact or estimated."""
+        if exact:
+            return self._repo_counts_sql(), None
+        params = {"schema": self.SCHEMA, "tables": [self._table]}
+        return self._REPO_ESTIMATES_SQL, params
+
+    @staticmethod
+    def _table_stats_rows(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "table": table,
+                "live_rows": live,
+                "dead_rows": dead,
+                "dead_ratio": (dead / (live + dead)) if (live + dead) else 0.0,
+                "size_bytes": size,
+                "seq_scans": seq_scan,
+                "seq_rows_read": seq_read,
+                "index_scans": idx_scan,
+                "last_vacuum": last_vacuum.isoformat() if last_vacuum else None,
+            }
+            for (
+                table, live, dead, size, seq_scan, seq_read, idx_scan, last_vacuum
+            ) in rows
+        ]
+
+    @staticmethod
+    def _index_stats_rows(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": name,
+                "table": table,
+                "method": method,
+                "valid": valid,
+                "size_bytes": size,
+                "scans": scans,
+            }
+            for name, table, method, valid, size, scans in rows
+        ]
+
+    @staticmethod
+    def _repo_count_rows(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+        return [
+            {"repo_id": str(repo_id) if repo_id is not None else None, "rows": count}
+            for repo_id, count in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # ANN index lifecycle (vector_chunks.vector, cosine ops)
+    # ------------------------------------------------------------------
+    ANN_INDEXES = ("hnsw", "ivfflat")
+
+    _LIST_INDEXES_SQL = """
+        SELECT i.relname, am.amname, ix.indisvalid,
+               pg_relation_size(i.oid), pg_get_indexdef(i.oid)
+        FROM pg_index ix
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        JOIN pg_am am ON am.oid = i.relam
+        WHERE n.nspname = %s AND t.relname = %s
+          AND am.amname IN ('hnsw', 'ivfflat')
+        ORDER BY i.relname
+    """
+
+    @staticmethod
+    def _index_rows(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": name,
+                "method": method,
+                "valid": valid,
+                "size_bytes": size,
+                "definition": definition,
+            }
+            for name, method, valid, size, definition in rows
+        ]
+
+    def ann_index_name(self, method: str) -> str:
+        """Index name for a method under this store's quantization."""
+        if method not in self.ANN_INDEXES:
+            raise ValueError(f"Unknown ANN index method: {method}")
+        if self._quantization == "none":
+            return f"{self._table}_vector_{method}_idx"
+        return f"{self._table}_{self._quantization}_{method}_idx"
+
+    def _index_key_sql(self) -> sql.Composed:
+        """Indexed expression + operator class matching the search ORDER BY."""
+        if self._quantization == "none":
+            return sql.SQL("vector vector_cosine_ops")
+        if self._quantization == "binary":
+            opclass = "bit_hamming_ops"
+        else:
+            opclass = "halfvec_cosine_ops"
+        return sql.SQL("{} {}").format(
+            self._quantized(sql.SQL("vector")), sql.SQL(opclass)
+        )
+
+    def _index_drop_sql(
+        self, index_name: str, concurrently: bool = True
+    ) -> sql.Composed:
+        # Indexes on a partitioned table cannot be dropped CONCURRENTLY.
+        return sql.SQL("DROP INDEX {concurrently}IF EXISTS {schema}.{index}").format(
+            concurrently=sql.SQL("CONCURRENTLY " if concurrently else ""),
+            schema=sql.Identifier(self.SCHEMA),
+            index=sql.Identifier(index_name),
+        )
+
+    # Partitions of vector_chunks without a valid index attached to the given
+    # parent index (all partitions when the first parameter is true).
+    _PARTITIONS_TO_INDEX_SQL = """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%(table)s)
+          AND (%(all)s OR NOT EXISTS (
+              SELECT 1
+              FROM pg_inherits ii
+              JOIN pg_index x ON x.indexrelid = ii.inhrelid
+              WHERE ii.inhparent = to_regclass(%(index)s)
+                AND x.indrelid = c.oid
+                AND x.indisvalid
+          ))
+        ORDER BY c.relname
+    """
+
+    def _partitions_to_index_params(
+        self, index_name: str, rebuild: bool
+    ) -> Dict[str, Any]:
+        return {
+            "table": f"{self.SCHEMA}.{self._table}",
+            "index": f"{self.SCHEMA}.{index_name}",
+            "all": rebuild,
+        }
+
+    def _index_build_plan(
+        self,
+        method: str,
+        current: Optional[Dict[str, Any]],
+        *,
+        m: int,
+        ef_construction: int,
+        lists: int,
+        rebuild: bool,
+        maintenance_work_mem: Optional[str],
+        partitions: Optional[Sequence[str]] = None,
+    ) -> Tuple[str, List[sql.Composed]]:
+        """
+        Decide how to bring the method's index up to date given its current
+        state (a list_indexes() entry or None). Returns (status, statements);
+        the statements must run in order on an autocommit connection.
+
+        A rebuild creates the replacement under a temporary name, then swaps
+        it in; the old index keeps serving queries until the new one is valid.
+        An index left INVALID by an interrupted concurrent build is rebuilt.
+
+        For the partitioned layout, partitions lists the partitions still
+        needing an index (see _PARTITIONS_TO_INDEX_SQL). The parent index is
+        created ON ONLY vector_chunks and each partition's index is built
+        CONCURRENTLY and attached; the parent turns valid once all are.
+        A partitioned rebuild drops the parent index (and its children) first.
+        """
+        name = self.ann_index_name(method)
+        if current is not None and current["valid"] and not rebuild:
+            return "exists", []
+
+        if method == "hnsw":
+            options = sql.SQL("m = {}, ef_construction = {}").format(
+                sql.Literal(int(m)), sql.Literal(int(ef_construction))
+            )
+        else:
+            options = sql.SQL("lists = {}").format(sql.Literal(int(lists)))
+
+        statements: List[sql.Composed] = []
+        if maintenance_work_mem:
+            statements.append(
+                sql.SQL("SET maintenance_work_mem = {}").format(
+                    sql.Literal(maintenance_work_mem)
+                )
+            )
+
+        if partitions is not None:
+            statements += self._partitioned_index_build(
+                name, method, options, partitions, drop=rebuild and current is not None
+            )
+            return ("created" if current is None else "rebuilt"), statements
+
+        status, build = self._index_build(name, method, options, current)
+        return status, statements + build
+
+    _ANN_METHOD_SQL = {"hnsw": sql.SQL("hnsw"), "ivfflat": sql.SQL("ivfflat")}
+
+    def _index_create_sql(
+        self,
+        index_name: str,
+        method: str,
+        options: sql.Composable,
+        table: Optional[str] = None,
+    ) -> sql.Composed:
+        return sql.SQL("""
+            CREATE INDEX CONCURRENTLY {index}
+            ON {schema}.{table}
+            USING {method} ({key})
+            WITH ({options})
+        """).format(
+            key=self._index_key_sql(),
+            index=sql.Identifier(index_name),
+            schema=sql.Identifier(self.SCHEMA),
+            table=sql.Identifier(table or self._table),
+            method=self._ANN_METHOD_SQL[method],
+            options=options,
+        )
+
+    def _index_build(
+        self,
+        name: str,
+        method: str,
+        options: sql.Composable,
+        current: Optional[Dict[str, Any]],
+    ) -> Tuple[str, List[sql.Composed]]:
+        """(status, statements) creating / rebuilding an unpartitioned table's index."""
+        if current is None:
+            return "created", [self._index_create_sql(name, method, options)]
+
+        if not current["valid"]:
+            return "rebuilt", [
+                self._index_drop_sql(name),
+                self._index_create_sql(name, method, options),
+            ]
+
+        tmp_name = f"{name}_new"
+        return "rebuilt", [
+            self._index_drop_sql(tmp_name),
+            self._index_create_sql(tmp_name, method, options),
+            self._index_drop_sql(name),
+            sql.SQL("ALTER INDEX {schema}.{tmp} RENAME TO {index}").format(
+                schema=sql.Identifier(self.SCHEMA),
+                tmp=sql.Identifier(tmp_name),
+                index=sql.Identifier(name),
+            ),
+        ]
+
+    def _partitioned_index_build(
+        self,
+        name: str,
+        method: str,
+        options: sql.Composable,
+        partitions: Sequence[str],
+        drop: bool,
+    ) -> List[sql.Composed]:
+        """Statements building the parent index and attaching each partition's."""
+        statements: List[sql.Composed] = []
+        if drop:
+            statements.append(self._index_drop_sql(name, concurrently=False))
+        # ON ONLY: an empty, invalid parent index; partitions attach below.
+        statements.append(
+            sql.SQL("""
+                CREATE INDEX IF NOT EXISTS {index}
+                ON ONLY {chunks}
+                USING {method} ({key})
+                WITH ({options})
+            """).format(
+                chunks=self._chunks_table,
+                key=self._index_key_sql(),
+                index=sql.Identifier(name),
+                method=self._ANN_METHOD_SQL[method],
+                options=options,
+            )
+        )
+        for partition in partitions:
+            child = f"{partition}_{method}_idx"
+            if self._quantization != "none":
+                child = f"{partition}_{self._quantization}_{method}_idx"
+            statements += [
+                self._index_drop_sql(child),
+                self._index_create_sql(child, method, options, table=partition),
+                sql.SQL(
+                    "ALTER INDEX {schema}.{index} ATTACH PARTITION {schema}.{child}"
+                ).format(
+                    schema=sql.Identifier(self.SCHEMA),
+                    index=sql.Identifier(name),
+                    child=sql.Identifier(child),
+                ),
+            ]
+        return statements
@@ -1,76 +1,181 @@
 # src/core/vectorstore/pgvector_store.py
 from __future__ import annotations
-from typing import Sequence, Iterable, List, Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Sequence, Iterable, Iterator, List, Optional, Dict, Any
 import psycopg
-from psycopg import sql
-from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+from pgvector.psycopg import register_vector
 import logging
 
-from src.core.vectorstore.base import VectorStore
-from shared.models.vector import VectorRecord, VectorMetadata
+from src.core.vectorstore.base import Projection, VectorStore
+from src.core.vectorstore.latency import filter_shape
+from src.core.vectorstore.mmr import (
+    DEFAULT_FANOUT, DEFAULT_LAMBDA, candidate_projection, mmr_rerank,
+)
+from src.core.vectorstore.pg_queries import PgVectorQueries
+from shared.models.vector import VectorRecord, VectorQuery, WriteCounts
 
 logging.basicConfig(level=logging.DEBUG)
 
 
-class PgVectorStore(VectorStore):
-    SCHEMA = "ingestion_service"
+def configure_connection(conn: psycopg.Connection) -> None:
+    """
+    Per-connection setup: register the pgvector adapters so vector columns
+    load as float32 numpy arrays and binary COPY can dump them.
+    Used as the pool's configure callback and for one-off connections.
+    """
+    if conn.adapters.types.get("vector") is None:
+        register_vector(conn)
 
-    def __init__(self, dsn: str, dimension: int, provider: str = "mock") -> None:
-        self._dsn = dsn
-        self._dimension = dimension
-        self._provider = provider
-        logging.info("PgVectorStore MS6: Skipping table validation for dual-write test")
 
-    @property
-    def dimension(self) -> int:
-        return self._dimension
+class PgVectorStore(PgVectorQueries, VectorStore):
+    """Synchronous store (scripts, benchmarks); the API uses AsyncPgVectorStore."""
+
+    _pool: Optional[ConnectionPool]
+
+    def __init__(self, dsn: str, dimension: int, **options: Any) -> None:
+        super().__init__(dsn, dimension, **options)
+        logging.info(
+            f"PgVectorStore MS6: write mode {self._write_mode}, "
+            "skipping table validation"
+        )
+
+    @contextmanager
+    def _connection(self) -> Iterator[psycopg.Connection]:
+        """
+        Borrow a connection from the pool, or open a one-off connection
+        when the store was built without a pool (scripts, tests).
+        Either way the block runs in a single transaction committed on exit.
+        """
+        if self._pool is not None:
+            with self._pool.connection() as conn:
+                yield conn
+        else:
+            with psycopg.connect(self._dsn) as conn:
+                configure_connection(conn)
+                yield conn
+
+    def table_stats(self, exact_repo_counts: bool = False) -> Dict[str, Any]:
+        """
+        Storage statistics for the stats endpoint: live / dead rows, size and
+        sequential vs index scans per table (and partition), every index with
+        its method, size and scan count, and chunk counts per repo: planner
+        estimates, or exact counts (a scan of vector_chunks) on request.
+        """
+        params = self._stats_params()
+        repo_query, repo_params = self._repo_counts_statement(exact_repo_counts)
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(self._TABLE_STATS_SQL, params)
+                tables = self._table_stats_rows(cur.fetchall())
+                cur.execute(self._INDEX_STATS_SQL, params)
+                indexes = self._index_stats_rows(cur.fetchall())
+                cur.execute(repo_query, repo_params)
+                repos = self._repo_count_rows(cur.fetchall())
+        return {
+            "tables": tables,
+            "indexes": indexes,
+            "repos": repos,
+            "repo_counts": "exact" if exact_repo_counts else "estimate",
+        }
+
+    def check_pool(self) -> None:
+        """Health check: verify idle pooled connections, dropping broken ones."""
+        if self._pool is not None:
+            self._pool.check()
+
+    def close(self) -> None:
+        """Close the connection pool, if any."""
+        if self._pool is not None:
+            self._pool.close()
 
     def persist(self, records: list[VectorRecord]) -> None:
         self.add(records)
         logging.debug("PgVectorStore.persist: added %d records", len(records))
 
-    def add(self, records: Iterable[VectorRecord]) -> None:
-        """MS6 Dual-write: vectors + vector_chunks"""
-        vectors_sql = sql.SQL("""
-            INSERT INTO {schema}.vectors 
-            (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy, 
-             chunk_text, source_metadata, provider)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """).format(schema=sql.Identifier(self.SCHEMA))
-
-        chunks_sql = sql.SQL("""
-            INSERT INTO {schema}.vector_chunks 
-            (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy, 
-             chunk_text, source_metadata, provider, document_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """).format(schema=sql.Identifier(self.SCHEMA))
-
-        with psycopg.connect(self._dsn) as conn:
-            with conn.cursor() as cur:
-                for record in records:
-                    cur.execute(vectors_sql, (
-                        record.vector, record.metadata.ingestion_id,
-                        record.metadata.chunk_id, record.metadata.chunk_index,
-                        record.metadata.chunk_strategy, record.metadata.chunk_text,
-                        Jsonb(record.metadata.source_metadata or {}),
-                        record.metadata.provider or self._provider,
-                    ))
-                    if record.metadata.document_id:
-                        cur.execute(chunks_sql, (
-                            record.vector, record.metadata.ingestion_id,
-                            record.metadata.chunk_id, record.metadata.chunk_index,
-                            record.metadata.chunk_strategy, record.metadata.chunk_text,
-                            Jsonb(record.metadata.source_metadata or {}),
-                            record.metadata.provider or self._provider,
-                            record.metadata.document_id,
-                        ))
-        logging.info(f"MS6 DUAL-WRITE: {len(records)} vectors + chunks complete")
+    def add(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """
+        MS6 write: vector_chunks, plus the legacy vectors table in dual mode.
+
+        Chunk rows go through the staging table and are merged idempotently
+        (PgVectorQueries._merge_chunks_sql); the legacy vectors table is
+        appended to as before. Returns new / unchanged / replaced counts.
+        """
+        records = list(records)
+        chunks = [r for r in records if self._writes_chunk(r)]
+        vectors_sql = self._insert_vectors_sql()
+        repo_ids = self._prepare_partitions(records)
+
+        counts = WriteCounts(new=len(records) - len(chunks))
+        with self._latency.time("add", "insert"):
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    if repo_ids is None:
+                        repo_ids = self._resolve_repo_ids(cur, records)
+                    if self._dual_write:
+                        for record in records:
+                            cur.execute(vectors_sql, self._insert_params(record))
+                    if chunks:
+                        cur.execute(self._create_staging_sql())
+                        cur.executemany(
+                            self._insert_chunks_sql(),
+                            [self._insert_chunk_params(r, repo_ids) for r in chunks],
+                        )
+                        cur.execute(self._merge_chunks_sql())
+                        counts = self._write_counts(cur.fetchone(), counts.new)
+        return self._finish_write("WRITE", records, counts)
+
+    def add_bulk(self, records: Iterable[VectorRecord]) -> WriteCounts:
+        """
+        Bulk write path for large batches.
+
+        Streams records with binary COPY ... FROM STDIN (vectors in dual
+        mode; chunk rows into the staging table, then merged as in add())
+        inside a single transaction: one round trip per table per batch
+        instead of per record. Returns new / unchanged / replaced counts.
+        """
+        records = list(records)
+        if not records:
+            return WriteCounts()
+
+        copy_vectors = self._copy_sql("vectors", self._COPY_COLUMNS)
+        chunks = [r for r in records if self._writes_chunk(r)]
+
+        repo_ids = self._prepare_partitions(records)
+
+        counts = WriteCounts(new=len(records) - len(chunks))
+        with self._latency.time("add", "copy"):
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    if repo_ids is None:
+                        repo_ids = self._resolve_repo_ids(cur, records)
+                    if self._dual_write:
+                        with cur.copy(copy_vectors) as copy:
+                            copy.set_types(self._COPY_TYPES)
+                            for record in records:
+                                copy.write_row(self._copy_row(record))
+
+                    if chunks:
+                        cur.execute(self._create_staging_sql())
+                        with cur.copy(self._copy_staging_sql()) as copy:
+                            copy.set_types(self._COPY_CHUNK_TYPES)
+                            for record in chunks:
+                                copy.write_row(self._copy_chunk_row(record, repo_ids))
+                        cur.execute(self._merge_chunks_sql())
+                        counts = self._write_counts(cur.fetchone(), counts.new)
+        return self._finish_write("BULK COPY", records, counts)
 
     def similarity_search(
         self,
         query_vector: Sequence[float],
         k: int,
         metadata_filter: Optional[Dict[str, Any]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
     ) -> List[VectorRecord]:
         """
         Search vector_chunks with optional metadata filtering.
@@ -78,152 +183,406 @@ class PgVectorStore(VectorStore):
         nomic-embed-text which both produce cosine-optimised embeddings.
         Score is returned as 1 - cosine_distance, range 0–1 (higher = more similar).
 
-        metadata_filter supports:
-            {"source_type": "code"}              → equality
-            {"source_type": {"ne": "code"}}      → not equal (also matches NULL)
-            {"doc_type": {"in": ["file","pdf"]}} → IN list
-        """
-        if metadata_filter:
-            conditions = []
-            filter_values = []
-
-            for key, value in metadata_filter.items():
-                if isinstance(value, dict):
-                    operator = list(value.keys())[0]
-                    operand = list(value.values())[0]
-
-                    if operator == "ne":
-                        conditions.append(
-                            sql.SQL(
-                                "(source_metadata->>{key} IS NULL "
-                                "OR source_metadata->>{key} != {val})"
-                            ).format(
-                                key=sql.Literal(key),
-                                val=sql.Placeholder(),
-                            )
-                        )
-                        filter_values.append(operand)
+        metadata_filter supports equality and the eq / ne / in / exists /
+        range / prefix / glob operators (syntax in filters.FilterCompiler),
+        e.g. {"doc_type": {"in": ["file","pdf"]}} or
+        {"relative_path": {"glob": "src/**/*.py"}}. Whether the filter is
+        applied before or during the ANN scan is the filter strategy's call
+        (PgVectorQueries.FILTER_STRATEGIES).
 
-                    elif operator == "in":
-                        placeholders = sql.SQL(", ").join(
-                            sql.Placeholder() for _ in operand
-                        )
-                        conditions.append(
-                            sql.SQL(
-                                "source_metadata->>{key} IN ({vals})"
-                            ).format(
-                                key=sql.Literal(key),
-                                vals=placeholders,
-                            )
-                        )
-                        filter_values.extend(operand)
-
-                else:
-                    # Simple equality
-                    conditions.append(
-                        sql.SQL("source_metadata->>{key} = {val}").format(
-                            key=sql.Literal(key),
-                            val=sql.Placeholder(),
-                        )
+        ef_search / probes override hnsw.ef_search / ivfflat.probes for this
+        query only (transaction-local), trading recall for latency. Note that
+        an HNSW scan returns at most ef_search rows.
+
+        projection controls which columns come back (see Projection).
+
+        repo_id / ingestion_ids scope the search to one repository / a set of
+        ingestions via the indexed vector_chunks columns, so other repos'
+        rows are never scanned or returned.
+        """
+        cache_key, cached, generation = self._cached_search(
+            query_vector, k, metadata_filter, ef_search, probes, projection,
+            repo_id, ingestion_ids,
+        )
+        if cached is not None:
+            return cached
+
+        search_sql, params = self._similarity_search_query(
+            query_vector, k, metadata_filter, projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+
+        with self._latency.time("similarity_search") as timing:
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    plan = self._search_plan(
+                        cur, metadata_filter, repo_id, ingestion_ids
                     )
-                    filter_values.append(value)
-
-            where_clause = sql.SQL(" AND ").join(conditions)
-            search_sql = sql.SQL("""
-                WITH query AS (SELECT {qvec}::vector AS qvec)
-                SELECT vc.vector, vc.ingestion_id, vc.chunk_id, vc.chunk_index, vc.chunk_strategy,
-                       vc.chunk_text, vc.source_metadata, vc.provider, vc.document_id,
-                       1 - (vc.vector <=> query.qvec) AS score
-                FROM {schema}.vector_chunks vc, query
-                WHERE {where}
-                ORDER BY vc.vector <=> query.qvec
-                LIMIT {limit}
-            """).format(
-                schema=sql.Identifier(self.SCHEMA),
-                where=where_clause,
-                qvec=sql.Placeholder(),
-                limit=sql.Placeholder(),
-            )
-            params = [query_vector] + filter_values + [k]
+                    timing.shape = filter_shape(
+                        metadata_filter, repo_id, ingestion_ids, plan
+                    )
+                    self._apply_search_params(
+                        cur, ef_search=ef_search, probes=probes, plan=plan
+                    )
+                    cur.execute(search_sql, params)
+                    results = self._records_from_rows(cur.fetchall())
+        self._query_cache.put(cache_key, results, generation)
+        return results
 
-        else:
-            search_sql = sql.SQL("""
-                WITH query AS (SELECT {qvec}::vector AS qvec)
-                SELECT vc.vector, vc.ingestion_id, vc.chunk_id, vc.chunk_index, vc.chunk_strategy,
-                       vc.chunk_text, vc.source_metadata, vc.provider, vc.document_id,
-                       1 - (vc.vector <=> query.qvec) AS score
-                FROM {schema}.vector_chunks vc, query
-                ORDER BY vc.vector <=> query.qvec
-                LIMIT {limit}
-            """).format(
-                schema=sql.Identifier(self.SCHEMA),
-                qvec=sql.Placeholder(),
-                limit=sql.Placeholder(),
-            )
-            params = [query_vector, k]
+    def similarity_search_mmr(
+        self,
+        query_vector: Sequence[float],
+        k: int,
+        fanout: int = DEFAULT_FANOUT,
+        lambda_mult: float = DEFAULT_LAMBDA,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        similarity_search diversified with maximal marginal relevance:
+        k * fanout nearest chunks are fetched with their embeddings and MMR
+        (mmr.mmr_select) keeps the k that balance query similarity against
+        redundancy with each other; lambda_mult = 1 is plain relevance
+        order. Scores remain the cosine similarity to the query.
+        """
+        candidates = self.similarity_search(
+            query_vector, k * fanout, metadata_filter,
+            ef_search=ef_search, probes=probes,
+            projection=candidate_projection(projection),
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+        return mmr_rerank(query_vector, candidates, k, lambda_mult, projection)
 
-        results: List[VectorRecord] = []
-        with psycopg.connect(self._dsn) as conn:
+    def lexical_search(
+        self,
+        query_text: str,
+        k: int,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        Full-text search: chunks whose chunk_tsv matches query_text
+        (websearch_to_tsquery syntax: words, "quoted phrases", -exclusions),
+        ranked by ts_rank_cd. Score is the text rank, not a similarity.
+        Same metadata_filter / scope semantics as similarity_search.
+        """
+        search_sql, params = self._lexical_search_query(
+            query_text, k, metadata_filter, projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids,
+        )
+        with self._connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(search_sql, params)
-                for row in cur.fetchall():
-                    (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
-                     chunk_text, source_metadata, provider, document_id, score) = row
-                    metadata = VectorMetadata(
-                        ingestion_id=ingestion_id,
-                        chunk_id=chunk_id,
-                        chunk_index=chunk_index,
-                        chunk_strategy=chunk_strategy,
-                        chunk_text=chunk_text,
-                        source_metadata=source_metadata,
-                        provider=provider,
-                        document_id=document_id,
-                        score=score,
-                    )
-                    results.append(VectorRecord(vector=vector, metadata=metadata))
-        return results
+                return self._records_from_rows(cur.fetchall())
 
-    def delete_by_ingestion_id(self, ingestion_id: str) -> None:
-        for table in ["vectors", "vector_chunks"]:
-            delete_sql = sql.SQL("""
-                DELETE FROM {schema}.{table_name} WHERE ingestion_id = %s
-            """).format(
-                schema=sql.Identifier(self.SCHEMA),
-                table_name=sql.Identifier(table),
+    def hybrid_search(
+        self,
+        query_vector: Sequence[float],
+        query_text: str,
+        k: int,
+        vector_k: Optional[int] = None,
+        lexical_k: Optional[int] = None,
+        rrf_k: Optional[int] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+        repo_id: Optional[str] = None,
+        ingestion_ids: Optional[Sequence[str]] = None,
+    ) -> List[VectorRecord]:
+        """
+        Hybrid retrieval in one round trip: the top vector_k chunks by
+        cosine distance and the top lexical_k by ts_rank_cd are fused with
+        reciprocal rank fusion, score = sum(1 / (rrf_k + rank)). Exact
+        identifier matches surface even when they rank low on embeddings,
+        so the vector side can use a smaller k. vector_k / lexical_k
+        default to k; the filter, scope and recall knobs apply to both sides.
+        """
+        search_sql, params = self._hybrid_search_query(
+            query_vector, query_text, k,
+            vector_k=k if vector_k is None else vector_k,
+            lexical_k=k if lexical_k is None else lexical_k,
+            metadata_filter=metadata_filter, projection=projection,
+            repo_id=repo_id, ingestion_ids=ingestion_ids, rrf_k=rrf_k,
+        )
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                plan = self._search_plan(cur, metadata_filter, repo_id, ingestion_ids)
+                self._apply_search_params(
+                    cur, ef_search=ef_search, probes=probes, plan=plan
+                )
+                cur.execute(search_sql, params)
+                return self._records_from_rows(cur.fetchall())
+
+    def similarity_search_batch(
+        self,
+        queries: Sequence[VectorQuery],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        projection: Projection = Projection.FULL,
+    ) -> List[List[VectorRecord]]:
+        """
+        Run several similarity searches in one statement / one round trip
+        (see _batch_search_query). Returns one result list per query, in
+        input order.
+        """
+        if not queries:
+            return []
+
+        batch_sql, params = self._batch_search_query(queries, projection)
+
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                plan = self._batch_plan(queries)
+                self._apply_search_params(
+                    cur, ef_search=ef_search, probes=probes, plan=plan
+                )
+                cur.execute(batch_sql, params)
+                return self._batch_results(cur.fetchall(), len(queries))
+
+    def export_chunks(
+        self,
+        ingestion_id: Optional[str] = None,
+        repo_id: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[List[VectorRecord]]:
+        """
+        Stream vector_chunks rows of an ingestion and / or repository (all
+        rows if neither is given) in lists of batch_size, through a
+        server-side cursor: the connection is held until the iteration
+        ends, but only one batch is in memory at a time. Records carry
+        their vectors, ready for add_bulk() elsewhere.
+        """
+        query, params = self._export_query(ingestion_id, repo_id)
+        with self._connection() as conn:
+            with conn.cursor(name=self.EXPORT_CURSOR) as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                while rows := cur.fetchmany(batch_size):
+                    yield self._records_from_rows(rows)
+
+    def _prepare_partitions(
+        self, records: Sequence[VectorRecord]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Partitioned layout only: resolve the batch's repo_ids and create any
+        missing repo partitions in a short transaction of their own, so the
+        parent table lock taken by CREATE TABLE ... PARTITION OF is not held
+        for the whole write. Returns the repo_id lookup (None if unpartitioned).
+        """
+        if not self._partitioned:
+            return None
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                repo_ids = self._resolve_repo_ids(cur, records)
+                # IF NOT EXISTS returns before locking the parent when the
+                # partition is already there; no per-process cache, since
+                # another worker may have dropped it meanwhile.
+                for repo_id in sorted(self._chunk_repo_ids(records, repo_ids), key=str):
+                    cur.execute(self._create_partition_sql(repo_id))
+        return repo_ids
+
+    def _resolve_repo_ids(
+        self, cur: psycopg.Cursor, records: Sequence[VectorRecord]
+    ) -> Dict[str, Any]:
+        """document_id → repo_id for chunks whose source_metadata has no repo_id."""
+        missing = self._documents_missing_repo_id(records)
+        if not missing:
+            return {}
+        cur.execute(self._repo_ids_sql(), (missing,))
+        return self._repo_id_lookup(cur.fetchall())
+
+    def _apply_search_params(
+        self,
+        cur: psycopg.Cursor,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        plan: Optional[str] = None,
+    ) -> None:
+        """
+        SET LOCAL the ANN recall knobs and the filter plan's settings; they
+        reset when the transaction ends.
+        """
+        set_sql = self._search_params_sql(ef_search=ef_search, probes=probes, plan=plan)
+        if set_sql is not None:
+            cur.execute(set_sql)
+
+    def _search_plan(
+        self,
+        cur: psycopg.Cursor,
+        metadata_filter: Optional[Dict[str, Any]],
+        repo_id: Optional[str],
+        ingestion_ids: Optional[Sequence[str]],
+    ) -> Optional[str]:
+        """
+        prefilter / postfilter for a filtered search (None when unfiltered).
+        In auto mode the planner's row estimate for the filter decides, once
+        per filter shape (see FILTER_STRATEGIES).
+        """
+        if not self._needs_estimate(metadata_filter, repo_id, ingestion_ids):
+            return self._filter_plan(
+                self._is_filtered(metadata_filter, repo_id, ingestion_ids)
             )
-            with psycopg.connect(self._dsn) as conn:
+        shape = filter_shape(metadata_filter, repo_id, ingestion_ids)
+        plan = self._known_plan(shape)
+        if plan is not None:
+            return plan
+        cur.execute(
+            *self._filter_estimate_query(metadata_filter, repo_id, ingestion_ids)
+        )
+        estimated_rows = self._estimated_rows(cur.fetchone())
+        return self._remember_plan(shape, self._auto_plan(estimated_rows))
+
+    def ensure_collection(self) -> bool:
+        """
+        Create this store's collection table (and register it in
+        vector_collections) if it does not exist yet; True when created.
+        The default collection's vector_chunks is managed by migrations.
+        """
+        collection = self._collection_to_create()
+        if collection is None:
+            return False
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(self._TABLE_EXISTS_SQL, (f"{self.SCHEMA}.{self._table}",))
+                if self._table_exists(cur.fetchone()):
+                    return False
+                for statement in self._create_collection_sql():
+                    cur.execute(statement)
+                cur.execute(
+                    self._register_collection_sql(),
+                    self._register_collection_params(collection),
+                )
+        logging.info(f"Created vector collection {collection.name} ({self._table})")
+        return True
+
+    # ------------------------------------------------------------------
+    # ANN index lifecycle (vector_chunks.vector, cosine ops)
+    # ------------------------------------------------------------------
+    def list_indexes(self) -> List[Dict[str, Any]]:
+        """Return the vector indexes on vector_chunks with method, validity and size."""
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(self._LIST_INDEXES_SQL, (self.SCHEMA, self._table))
+                return self._index_rows(cur.fetchall())
+
+    def build_index(
+        self,
+        method: str = "hnsw",
+        *,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        rebuild: bool = False,
+        maintenance_work_mem: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build (or rebuild) the cosine ANN index on vector_chunks.vector
+        with CREATE INDEX CONCURRENTLY, so searches and writes keep running.
+        See _index_build_plan for the create / rebuild / swap rules.
+        """
+        name = self.ann_index_name(method)
+        existing = {ix["name"]: ix for ix in self.list_indexes()}
+        partitions = None
+        if self._partitioned:
+            with self._connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(delete_sql, (ingestion_id,))
+                    cur.execute(
+                        self._PARTITIONS_TO_INDEX_SQL,
+                        self._partitions_to_index_params(name, rebuild),
+                    )
+                    partitions = [row[0] for row in cur.fetchall()]
+        status, statements = self._index_build_plan(
+            method,
+            existing.get(name),
+            m=m,
+            ef_construction=ef_construction,
+            lists=lists,
+            rebuild=rebuild,
+            maintenance_work_mem=maintenance_work_mem,
+            partitions=partitions,
+        )
+        if not statements:
+            return {"index": name, "method": method, "status": status}
+
+        # CONCURRENTLY cannot run inside a transaction block, so DDL uses a
+        # dedicated autocommit connection rather than a pooled one.
+        with psycopg.connect(self._dsn, autocommit=True) as conn:
+            for statement in statements:
+                conn.execute(statement)
+
+        logging.info(f"ANN index {name} ({method}) {status}")
+        return {"index": name, "method": method, "status": status}
+
+    def drop_index(self, method: str) -> None:
+        """Drop the ANN index for the given method (concurrently)."""
+        with psycopg.connect(self._dsn, autocommit=True) as conn:
+            conn.execute(
+                self._index_drop_sql(
+                    self.ann_index_name(method), concurrently=not self._partitioned
+                )
+            )
+
+    def delete_by_ingestion_id(self, ingestion_id: str) -> None:
+        # Every written table is cleared on one connection, in one transaction.
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                for table in self._write_tables():
+                    cur.execute(self._delete_sql(table), (ingestion_id,))
+        self._query_cache.invalidate()
 
-    def get_chunks_by_document_id(self, document_id: str, k: int = 3) -> List[VectorRecord]:
+    def delete_by_repo_id(self, repo_id: str) -> Dict[str, Any]:
+        """
+        Remove every vector_chunks row of a repository (before re-ingesting it).
+
+        Partitioned layout: drops the repo's partition — O(1), no dead tuples
+        for vacuum. Otherwise a DELETE over the indexed repo_id column.
+        Legacy vectors rows are cleared per ingestion by delete_by_ingestion_id.
+        """
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(*self._delete_by_repo_statement(repo_id))
+                result = self._delete_by_repo_result(repo_id, cur.rowcount)
+        self._query_cache.invalidate()
+        return result
+
+    def get_chunks_by_document_id(
+        self,
+        document_id: str,
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> List[VectorRecord]:
         """Fetch chunks for a specific document_id — no vector similarity needed."""
-        search_sql = sql.SQL("""
-            SELECT vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
-                chunk_text, source_metadata, provider, document_id
-            FROM {schema}.vector_chunks
-            WHERE document_id = {doc_id}
-            LIMIT {limit}
-        """).format(
-            schema=sql.Identifier(self.SCHEMA),
-            doc_id=sql.Placeholder(),
-            limit=sql.Placeholder(),
-        )
-        results: List[VectorRecord] = []
-        with psycopg.connect(self._dsn) as conn:
+        search_sql = self._chunks_by_document_id_query(projection)
+        with self._latency.time("get_chunks_by_document_id", "document_id"):
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(search_sql, (document_id, k))
+                    return self._records_from_rows(cur.fetchall())
+
+    def get_chunks_by_document_ids(
+        self,
+        document_ids: Sequence[str],
+        k: int = 3,
+        projection: Projection = Projection.FULL,
+    ) -> Dict[str, List[VectorRecord]]:
+        """
+        Fetch up to k chunks for each of many document_ids in one query,
+        replacing one get_chunks_by_document_id call per document.
+        Chunks come back in chunk_index order; documents with no chunks
+        are absent from the result.
+        """
+        if not document_ids:
+            return {}
+
+        search_sql = self._chunks_by_document_ids_query(projection)
+        with self._connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(search_sql, (document_id, k))
-                for row in cur.fetchall():
-                    (vector, ingestion_id, chunk_id, chunk_index, chunk_strategy,
-                    chunk_text, source_metadata, provider, document_id) = row
-                    metadata = VectorMetadata(
-                        ingestion_id=ingestion_id,
-                        chunk_id=chunk_id,
-                        chunk_index=chunk_index,
-                        chunk_strategy=chunk_strategy,
-                        chunk_text=chunk_text,
-                        source_metadata=source_metadata,
-                        provider=provider,
-                        document_id=document_id,
-                    )
-                    results.append(VectorRecord(vector=vector, metadata=metadata))
-        return results
\ No newline at end of file
+                cur.execute(search_sql, ([str(d) for d in document_ids], k))
+                return self._records_by_document(cur.fetchall())
@@ -0,0 +1,136 @@
+# src/core/vectorstore/query_cache.py
+"""
+In-memory LRU / TTL cache of similarity_search results.
+
+The key hashes the query vector quantized to float16 after L2
+normalisation (cosine ranking ignores the norm, and float16 absorbs the
+last-bit noise of re-embedding the same question) together with k, the
+normalised filter / scope and the ANN knobs. add / add_bulk / delete_*
+bump the store's write generation, which drops the cached results, and a
+search that overlapped a write (the generation moved while it ran) is not
+stored, so rows read before a write are never served after it.
+
+The cache is per process and per collection (one per store). Another
+worker's writes are not seen here, which is what the TTL bounds.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.models.vector import VectorRecord
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class QueryCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (expires_at, records), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, List[VectorRecord]]]" = (
+            OrderedDict()
+        )
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @staticmethod
+    def key(
+        query_vector: Sequence[float],
+        k: int,
+        **options: Any,
+    ) -> str:
+        """
+        Cache key of a search. options are the remaining search arguments
+        (filter, scope, projection, ef_search, ...); they are normalised
+        through sorted-key JSON, so dict order does not matter.
+        """
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+        digest = hashlib.sha256(vector.astype(np.float16).tobytes())
+        digest.update(json.dumps([k, options], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[VectorRecord]]:
+        """Cached records (copies) or None; expired entries are dropped."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, records = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expired += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        # Callers may modify what they get (mmr_rerank drops vectors)
+        return [copy.copy(r) for r in records]
+
+    def put(self, key: str, records: List[VectorRecord], generation: int) -> None:
+        """Store results of a search that started at the given generation."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return  # a write landed while the search ran
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                [copy.copy(r) for r in records],
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> None:
+        """Bump the write generation and drop every cached result."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self._generation,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expired": self._expired,
+            }
@@ -0,0 +1,57 @@
+# tests/core/vectorstore/test_async_numpy_store.py
+import asyncio
+
+import pytest
+
+from src.core.vectorstore.async_numpy_store import AsyncNumpyVectorStore
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from shared.models.vector import VectorRecord, VectorMetadata, WriteCounts
+
+pytestmark = pytest.mark.unit
+
+ING = "00000000-0000-0000-0000-00000000000a"
+
+
+def _record(vector, i):
+    return VectorRecord(
+        vector=vector,
+        metadata=VectorMetadata(
+            ingestion_id=ING,
+            chunk_id=f"c{i}",
+            chunk_index=i,
+            chunk_strategy="simple",
+            chunk_text=f"text {i}",
+        ),
+    )
+
+
+def test_awaits_the_numpy_store(tmp_path):
+    store = AsyncNumpyVectorStore(NumpyVectorStore(path=str(tmp_path), dimension=2))
+
+    async def run():
+        counts = await store.add([_record([1.0, 0.0], 0), _record([0.0, 1.0], 1)])
+        hits = await store.similarity_search([1.0, 0.0], k=1)
+        exported = [
+            batch
+            async for batch in store.export_chunks(ingestion_id=ING, batch_size=1)
+        ]
+        await store.delete_by_ingestion_id(ING)
+        return counts, hits, exported, await store.table_stats()
+
+    counts, hits, exported, stats = asyncio.run(run())
+
+    assert counts == WriteCounts(new=2)
+    assert [r.metadata.chunk_id for r in hits] == ["c0"]
+    assert [[r.metadata.chunk_id for r in batch] for batch in exported] == [
+        ["c0"], ["c1"],
+    ]
+    assert stats == {"rows": 0}
+    assert "similarity_search" in store.latency_stats()
+
+
+def test_postgres_only_features_are_rejected(tmp_path):
+    store = AsyncNumpyVectorStore(NumpyVectorStore(path=str(tmp_path), dimension=2))
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(store.lexical_search("query", k=1))
+    assert asyncio.run(store.list_indexes()) == []
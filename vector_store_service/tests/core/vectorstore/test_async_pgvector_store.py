@@ -0,0 +1,103 @@
+# tests/core/vectorstore/test_async_pgvector_store.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.core.vectorstore.async_pgvector_store import AsyncPgVectorStore
+from shared.models.vector import VectorRecord, VectorMetadata, VectorQuery, WriteCounts
+
+
+def _mock_async_pool():
+    """A mock AsyncConnectionPool whose connection() yields an async conn/cursor."""
+    mock_cursor = MagicMock()
+    mock_cursor.execute = AsyncMock()
+    mock_cursor.executemany = AsyncMock()
+    mock_cursor.fetchall = AsyncMock(return_value=[])
+    mock_cursor.fetchone = AsyncMock()
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__aenter__.return_value = mock_cursor
+    mock_pool = MagicMock()
+    mock_pool.connection.return_value.__aenter__.return_value = mock_conn
+    return mock_pool, mock_conn, mock_cursor
+
+
+class TestAsyncPgVectorStore:
+    def test_similarity_search_awaits_pooled_connection(self):
+        mock_pool, _, mock_cursor = _mock_async_pool()
+        mock_cursor.fetchall.return_value = [
+            (None, "ing", "c1", 0, "simple", "text", {}, "mock", "doc", 0.9),
+        ]
+        store = AsyncPgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        results = asyncio.run(
+            store.similarity_search([0.1, 0.2, 0.3], k=1, ef_search=40)
+        )
+
+        mock_pool.connection.assert_called_once()
+        # set_config for ef_search, then the search itself
+        assert mock_cursor.execute.await_count == 2
+        assert results[0].metadata.chunk_id == "c1"
+        assert results[0].metadata.score == 0.9
+
+    def test_search_sql_matches_sync_store(self):
+        """Both stores build their statements through PgVectorQueries."""
+        from src.core.vectorstore.pgvector_store import PgVectorStore
+
+        mock_pool, _, mock_cursor = _mock_async_pool()
+        store = AsyncPgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        asyncio.run(store.similarity_search_batch([VectorQuery([0.1, 0.2], k=2)]))
+
+        sync_store = PgVectorStore(dsn="mock_dsn", dimension=2)
+        expected, params = sync_store._batch_search_query(
+            [VectorQuery([0.1, 0.2], k=2)]
+        )
+        query, sent = mock_cursor.execute.await_args.args
+        assert query.as_string(None) == expected.as_string(None)
+        assert sent == params
+
+    def test_add_and_delete(self):
+        mock_pool, _, mock_cursor = _mock_async_pool()
+        store = AsyncPgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        record = VectorRecord(
+            vector=[0.1, 0.2],
+            metadata=VectorMetadata(
+                ingestion_id="ing_1",
+                chunk_id="c1",
+                chunk_index=0,
+                chunk_strategy="simple",
+                chunk_text="text",
+                document_id="doc-1",
+            ),
+        )
+
+        mock_cursor.fetchone.return_value = (0, 0, 1)
+
+        counts = asyncio.run(store.add([record]))
+        asyncio.run(store.delete_by_ingestion_id("ing_1"))
+
+        assert counts == WriteCounts(new=1)
+        statements = [str(c.args[0]) for c in mock_cursor.execute.await_args_list]
+        # legacy vectors row + staging → vector_chunks merge
+        assert sum("INSERT INTO" in q for q in statements) == 2
+        mock_cursor.executemany.assert_awaited_once()
+        # delete_by_ingestion_id clears both tables
+        assert all("DELETE FROM" in q for q in statements[-2:])
+
+    def test_without_pool_opens_direct_connection(self):
+        """Stores built without a pool fall back to AsyncConnection.connect."""
+        _, mock_conn, mock_cursor = _mock_async_pool()
+        conn_cm = MagicMock()
+        conn_cm.__aenter__.return_value = mock_conn
+        mock_connect = AsyncMock(return_value=conn_cm)
+
+        store = AsyncPgVectorStore(dsn="mock_dsn", dimension=2)
+        with patch(
+            "src.core.vectorstore.async_pgvector_store.psycopg.AsyncConnection.connect",
+            new=mock_connect,
+        ), patch(
+            "src.core.vectorstore.async_pgvector_store.configure_async_connection",
+            new=AsyncMock(),
+        ):
+            assert asyncio.run(store.get_chunks_by_document_id("doc-1", k=2)) == []
+
+        mock_connect.assert_awaited_once_with("mock_dsn")
+        mock_cursor.execute.assert_awaited_once()
@@ -0,0 +1,45 @@
+# tests/core/vectorstore/test_collections.py
+import pytest
+
+from src.core.vectorstore.collections import (
+    DEFAULT_COLLECTION,
+    Collection,
+    build_collections,
+    find_collection,
+)
+
+pytestmark = pytest.mark.unit
+
+DEFAULT = Collection(DEFAULT_COLLECTION, "ollama", "mxbai-embed-large:latest", 1024)
+MINILM = {"minilm": {"provider": "ollama", "model": "all-minilm", "dimension": 384}}
+
+
+def test_default_collection_keeps_vector_chunks():
+    collections = build_collections(DEFAULT, MINILM)
+
+    assert collections[DEFAULT_COLLECTION].table == "vector_chunks"
+    assert collections["minilm"].table == "vector_chunks_c_minilm"
+    assert collections["minilm"].dimension == 384
+
+
+def test_find_collection_by_name_or_embedder():
+    collections = build_collections(DEFAULT, MINILM)
+
+    assert find_collection(collections, None) is collections[DEFAULT_COLLECTION]
+    assert find_collection(collections, "minilm").dimension == 384
+    assert find_collection(collections, "ollama/all-minilm").name == "minilm"
+    assert find_collection(collections, "nope") is None
+
+
+@pytest.mark.parametrize("extra", [
+    {"Bad-Name": {"provider": "ollama", "model": "m", "dimension": 8}},
+    {"small": {"provider": "ollama", "model": "m"}},
+    {"small": {"provider": "ollama", "model": "m", "dimension": 0}},
+    # Same embedder as the default collection
+    {"twin": {
+        "provider": "ollama", "model": "mxbai-embed-large:latest", "dimension": 1024,
+    }},
+])
+def test_rejects_invalid_collections(extra):
+    with pytest.raises(ValueError):
+        build_collections(DEFAULT, extra)
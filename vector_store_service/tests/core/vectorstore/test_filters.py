@@ -0,0 +1,107 @@
+# tests/core/vectorstore/test_filters.py
+import re
+
+import pytest
+
+from src.core.vectorstore.filters import FilterCompiler
+
+pytestmark = pytest.mark.unit
+
+
+def _compile(metadata_filter, **kwargs):
+    clause, values = FilterCompiler.compile(metadata_filter, **kwargs)
+    return clause.as_string(None), values
+
+
+def test_empty_filter_compiles_to_nothing():
+    assert _compile(None) == ("", [])
+
+
+def test_metadata_equalities_fold_into_one_containment():
+    rendered, values = _compile(
+        {"language": "python", "symbol": "main", "source_type": "code"}
+    )
+
+    assert rendered == 'WHERE "source_type" = %s::text AND source_metadata @> %s::jsonb'
+    assert values[0] == "code"
+    assert values[1].obj == {"language": "python", "symbol": "main"}
+
+
+def test_rich_operators_on_metadata_keys():
+    rendered, values = _compile({
+        "symbol": {"exists": True},
+        "start_line": {"range": {"gte": 10, "lt": 50}},
+        "relative_path": {"prefix": "src/100%_done/"},
+        "language": {"in": ["python", "go"]},
+    })
+
+    assert "(source_metadata ? 'symbol')" in rendered
+    assert "jsonb_typeof(source_metadata->'start_line') = 'number'" in rendered
+    assert "source_metadata->'start_line' >= %s::jsonb" in rendered
+    assert "source_metadata->>'relative_path' LIKE %s" in rendered
+    assert "(source_metadata @> %s::jsonb OR source_metadata @> %s::jsonb)" in rendered
+    assert [getattr(v, "obj", v) for v in values] == [
+        10, 50, "src/100\\%\\_done/%", {"language": "python"}, {"language": "go"},
+    ]
+
+
+def test_metadata_comparisons_are_typed():
+    rendered, values = _compile({"start_line": "10", "symbol": {"ne": 10}})
+
+    # "10" only matches the JSON string, 10 only the number
+    assert values[0].obj == {"symbol": 10}
+    assert values[1].obj == {"start_line": "10"}
+    # ne still matches rows without the key or without any metadata
+    assert rendered == (
+        "WHERE (source_metadata IS NULL OR NOT (source_metadata @> %s::jsonb))"
+        " AND source_metadata @> %s::jsonb"
+    )
+
+
+def test_scope_columns_keep_btree_comparisons():
+    rendered, values = _compile(
+        {"doc_type": {"in": ["file", "pdf"]}, "source_type": {"exists": False}},
+        repo_id="00000000-0000-0000-0000-0000000000aa",
+    )
+
+    assert rendered == (
+        'WHERE repo_id = %s::uuid AND "doc_type" = ANY(%s::text[])'
+        ' AND "source_type" IS NULL'
+    )
+    assert values == ["00000000-0000-0000-0000-0000000000aa", ["file", "pdf"]]
+
+
+def test_prefix_on_repo_id_matches_its_text_form():
+    rendered, values = _compile({"repo_id": {"prefix": "00000000-"}})
+
+    assert rendered == 'WHERE "repo_id"::text LIKE %s'
+    assert values == ["00000000-%"]
+
+
+def test_glob_on_repo_id_matches_its_text_form():
+    rendered, values = _compile({"repo_id": {"glob": "0000*"}})
+
+    assert rendered == 'WHERE "repo_id"::text ~ %s'
+    assert values == [FilterCompiler.glob_regex("0000*")]
+
+
+@pytest.mark.parametrize("path, matches", [
+    ("src/a.py", True),
+    ("src/core/deep/b.py", True),
+    ("src/a.pyc", False),
+    ("lib/src/a.py", False),
+])
+def test_glob_regex(path, matches):
+    pattern = FilterCompiler.glob_regex("src/**/*.py")
+    assert bool(re.search(pattern, path)) is matches
+
+
+@pytest.mark.parametrize("bad_filter", [
+    {"symbol": {"like": "x"}},
+    {"symbol": {"eq": 1, "ne": 2}},
+    {"start_line": {"range": {"between": [1, 2]}}},
+    {"start_line": {"range": {"gte": 1, "lt": "z"}}},
+])
+def test_rejects_malformed_filters(bad_filter):
+    with pytest.raises(ValueError):
+        FilterCompiler.compile(bad_filter)
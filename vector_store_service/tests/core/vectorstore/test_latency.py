@@ -0,0 +1,49 @@
+# tests/core/vectorstore/test_latency.py
+import pytest
+
+from src.core.vectorstore.latency import (
+    LatencyHistogram,
+    LatencyRecorder,
+    filter_shape,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):          # 1 ms .. 1 s, uniform
+        histogram.record(ms / 1000.0)
+
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["min_ms"] == 1.0 and summary["max_ms"] == 1000.0
+    for pct, expected in ((50, 500.0), (95, 950.0), (99, 990.0)):
+        assert expected <= summary[f"p{pct}_ms"] <= expected * 1.01
+
+
+def test_recorder_skips_failed_calls_and_caps_shapes():
+    recorder = LatencyRecorder()
+    recorder.MAX_SHAPES = 2
+
+    with recorder.time("similarity_search") as timing:
+        timing.shape = "repo_id [prefilter]"
+    with pytest.raises(RuntimeError):
+        with recorder.time("similarity_search"):
+            raise RuntimeError("boom")
+    for shape in ("a", "b", "c"):
+        recorder.record("add", shape, 0.001)
+
+    snapshot = recorder.snapshot()
+    assert list(snapshot["similarity_search"]) == ["repo_id [prefilter]"]
+    assert set(snapshot["add"]) == {"a", "b", "other"}
+
+
+def test_filter_shape_keeps_keys_and_operators_only():
+    assert filter_shape(None) == "unfiltered"
+    assert filter_shape(None, plan="postfilter") == "unfiltered"
+    assert filter_shape(
+        {"symbol": "main", "start_line": {"range": {"gte": 1}}},
+        repo_id="r1",
+        plan="prefilter",
+    ) == "repo_id,start_line:range,symbol:eq [prefilter]"
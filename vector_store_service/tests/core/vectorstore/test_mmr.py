@@ -0,0 +1,67 @@
+# tests/core/vectorstore/test_mmr.py
+import numpy as np
+import pytest
+
+from src.core.vectorstore.base import Projection
+from src.core.vectorstore.mmr import mmr_select
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from shared.models.vector import VectorRecord, VectorMetadata
+
+pytestmark = pytest.mark.unit
+
+# Two near-duplicates of the best match, then a distinct, slightly worse one
+CANDIDATES = np.array([
+    [1.0, 0.0, 0.0],
+    [0.99, 0.01, 0.0],
+    [0.98, 0.02, 0.0],
+    [0.7, 0.0, 0.7],
+], dtype=np.float32)
+QUERY = [1.0, 0.0, 0.3]
+
+
+def test_lambda_one_is_relevance_order():
+    query = np.asarray(QUERY, dtype=np.float32)
+    relevance = CANDIDATES @ query / np.linalg.norm(CANDIDATES, axis=1)
+    ranked = list(np.argsort(-relevance))
+    assert mmr_select(QUERY, CANDIDATES, k=4, lambda_mult=1.0) == ranked
+
+
+def test_diversity_skips_near_duplicates():
+    assert mmr_select(QUERY, CANDIDATES, k=2, lambda_mult=0.5) == [0, 3]
+    # k beyond the candidate count returns every candidate once
+    assert sorted(mmr_select(QUERY, CANDIDATES, k=10)) == [0, 1, 2, 3]
+    assert mmr_select(QUERY, CANDIDATES[:0], k=3) == []
+    with pytest.raises(ValueError):
+        mmr_select(QUERY, CANDIDATES, k=2, lambda_mult=1.5)
+
+
+def test_store_mmr_search_overfetches_and_keeps_scores(tmp_path):
+    store = NumpyVectorStore(path=str(tmp_path), dimension=3)
+    store.add([
+        VectorRecord(
+            vector=vector.tolist(),
+            metadata=VectorMetadata(
+                ingestion_id="00000000-0000-0000-0000-00000000000a",
+                chunk_id=f"c{i}", chunk_index=i, chunk_strategy="markdown",
+                chunk_text=f"section {i}",
+            ),
+        )
+        for i, vector in enumerate(CANDIDATES)
+    ])
+
+    plain = store.similarity_search(QUERY, k=2)
+    diverse = store.similarity_search_mmr(
+        QUERY, k=2, fanout=2, projection=Projection.METADATA
+    )
+
+    assert [r.metadata.chunk_id for r in plain] == ["c0", "c1"]
+    assert [r.metadata.chunk_id for r in diverse] == ["c0", "c3"]
+    assert diverse[1].metadata.score == pytest.approx(
+        float(
+            CANDIDATES[3] @ QUERY
+            / np.linalg.norm(CANDIDATES[3])
+            / np.linalg.norm(QUERY)
+        ),
+        rel=1e-5,
+    )
+    assert all(r.vector is None for r in diverse)
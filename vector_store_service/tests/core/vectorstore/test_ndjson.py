@@ -0,0 +1,61 @@
+# tests/core/vectorstore/test_ndjson.py
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.core.vectorstore.ndjson import decode_record, decode_stream, encode_record
+from shared.models.vector import VectorRecord, VectorMetadata
+
+pytestmark = pytest.mark.unit
+
+
+def _record(i):
+    return VectorRecord(
+        vector=np.array([0.5, -0.25], dtype=np.float32),
+        metadata=VectorMetadata(
+            ingestion_id="00000000-0000-0000-0000-000000000001",
+            chunk_id=f"c{i}", chunk_index=i, chunk_strategy="simple",
+            chunk_text=f"text {i}\nwith a newline", source_metadata={"repo_id": "r"},
+            document_id="00000000-0000-0000-0000-0000000000d0", score=0.9,
+        ),
+    )
+
+
+def _collect(chunks, batch_size):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [batch async for batch in decode_stream(stream(), batch_size)]
+
+    return asyncio.run(run())
+
+
+def test_round_trip_is_one_line_per_record():
+    line = encode_record(_record(3))
+
+    assert line.endswith("\n") and line.count("\n") == 1
+    decoded = decode_record(line)
+    assert decoded.vector == [0.5, -0.25]
+    assert decoded.metadata.chunk_text == "text 3\nwith a newline"
+    assert decoded.metadata.score == 0.0   # scores are not exported
+
+
+def test_decode_stream_batches_across_chunk_boundaries():
+    body = "".join(encode_record(_record(i)) for i in range(5)).encode()
+    # Split mid-line, and drop the final newline
+    chunks = [body[:7], body[7:300], body[300:-1]]
+
+    batches = _collect(chunks, batch_size=2)
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [r.metadata.chunk_index for b in batches for r in b] == [0, 1, 2, 3, 4]
+
+
+def test_decode_stream_reports_bad_line():
+    body = encode_record(_record(0)).encode() + b"\n" + b'{"vector": [1.0]}\n'
+
+    with pytest.raises(ValueError, match="line 3"):
+        _collect([body], batch_size=10)
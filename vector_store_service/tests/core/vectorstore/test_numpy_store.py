@@ -0,0 +1,209 @@
+# tests/core/vectorstore/test_numpy_store.py
+import numpy as np
+import pytest
+
+from src.core.vectorstore.base import Projection
+from src.core.vectorstore.numpy_store import NumpyVectorStore
+from shared.models.vector import VectorRecord, VectorMetadata, VectorQuery, WriteCounts
+
+pytestmark = pytest.mark.unit
+
+ING_A = "00000000-0000-0000-0000-00000000000a"
+ING_B = "00000000-0000-0000-0000-00000000000b"
+
+
+def _record(vector, i, ingestion_id=ING_A, document_id=None, **source_metadata):
+    return VectorRecord(
+        vector=vector,
+        metadata=VectorMetadata(
+            ingestion_id=ingestion_id,
+            chunk_id=f"c{i}",
+            chunk_index=i,
+            chunk_strategy="simple",
+            chunk_text=f"text {i}",
+            source_metadata=source_metadata,
+            document_id=document_id,
+        ),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    s.add([
+        _record([1.0, 0.0], 0, source_type="code", doc_type="file"),
+        _record([0.9, 0.1], 1, source_type="code", doc_type="pdf"),
+        _record([0.0, 1.0], 2, ingestion_id=ING_B, source_type="text", doc_type="file"),
+        _record([-1.0, 0.0], 3, ingestion_id=ING_B),
+    ])
+    return s
+
+
+def test_exact_top_k_by_cosine(store):
+    results = store.similarity_search([1.0, 0.0], k=3)
+
+    assert [r.metadata.chunk_id for r in results] == ["c0", "c1", "c2"]
+    assert results[0].metadata.score == pytest.approx(1.0)
+    assert results[2].metadata.score == pytest.approx(0.0)
+    assert results[0].vector == [1.0, 0.0]
+
+
+def test_metadata_filter_semantics(store):
+    def ids(**kwargs):
+        hits = store.similarity_search([1.0, 0.0], k=10, **kwargs)
+        return [r.metadata.chunk_id for r in hits]
+
+    assert ids(metadata_filter={"source_type": "code"}) == ["c0", "c1"]
+    # ne also matches rows without the key
+    assert ids(metadata_filter={"source_type": {"ne": "code"}}) == ["c2", "c3"]
+    in_filter = {"doc_type": {"in": ["pdf", "file"]}}
+    assert ids(metadata_filter=in_filter) == ["c0", "c1", "c2"]
+    assert ids(ingestion_ids=[ING_B]) == ["c2", "c3"]
+
+
+def test_projection_drops_vector_or_payload(store):
+    meta = store.similarity_search([1.0, 0.0], k=1, projection=Projection.METADATA)[0]
+    assert meta.vector is None
+    assert meta.metadata.chunk_text == "text 0"
+
+    vec = store.similarity_search([1.0, 0.0], k=1, projection=Projection.VECTOR)[0]
+    assert vec.vector == [1.0, 0.0]
+    assert vec.metadata.chunk_text == ""
+    assert vec.metadata.source_metadata is None
+
+
+def test_rich_filter_operators_match_pgvector_semantics(tmp_path):
+    s = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    s.add([
+        _record([1.0, 0.0], 0, relative_path="src/core/a.py", start_line=5),
+        _record([0.9, 0.1], 1, relative_path="src/b.py", start_line=40, symbol="f"),
+        _record([0.0, 1.0], 2, relative_path="docs/c.md", start_line="12"),
+    ])
+
+    def ids(metadata_filter):
+        hits = s.similarity_search([1.0, 0.0], k=10, metadata_filter=metadata_filter)
+        return [r.metadata.chunk_id for r in hits]
+
+    assert ids({"symbol": {"exists": True}}) == ["c1"]
+    assert ids({"symbol": {"exists": False}}) == ["c0", "c2"]
+    # string "12" is not a number, as with the jsonb_typeof guard
+    assert ids({"start_line": {"range": {"gte": 1, "lt": 50}}}) == ["c0", "c1"]
+    assert ids({"relative_path": {"prefix": "src/"}}) == ["c0", "c1"]
+    assert ids({"relative_path": {"glob": "src/*.py"}}) == ["c1"]
+    assert ids({"relative_path": {"glob": "**/*.py"}}) == ["c0", "c1"]
+    # eq / ne / in compare typed values, like jsonb containment
+    assert ids({"start_line": "12"}) == ["c2"]
+    assert ids({"start_line": "5"}) == []
+    assert ids({"start_line": {"ne": "5"}}) == ["c0", "c1", "c2"]
+    assert ids({"start_line": {"in": [5, "12"]}}) == ["c0", "c2"]
+    with pytest.raises(ValueError):
+        ids({"relative_path": {"regex": ".*"}})
+
+
+def test_delete_and_reopen_replays_log(store, tmp_path):
+    store.delete_by_ingestion_id(ING_A)
+    store.close()
+
+    reopened = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    assert len(reopened) == 2
+    hits = reopened.similarity_search([1.0, 0.0], k=10)
+    assert [r.metadata.chunk_id for r in hits] == ["c2", "c3"]
+
+    assert reopened.compact() == 2
+    assert len(NumpyVectorStore(path=str(tmp_path), dimension=2)) == 2
+
+
+def test_export_skips_deleted_rows_and_stops_on_compaction(store):
+    export = store.export_chunks(batch_size=1)
+    assert [r.metadata.chunk_id for r in next(export)] == ["c0"]
+
+    store.delete_by_ingestion_id(ING_B)
+    assert [r.metadata.chunk_id for r in next(export)] == ["c1"]
+    assert next(export, None) is None                 # c2 / c3 were deleted
+
+    export = store.export_chunks(batch_size=1)
+    next(export)
+    store.compact()                                   # renumbers the rows
+    with pytest.raises(RuntimeError, match="compacted"):
+        next(export)
+
+
+def test_segment_grows_past_initial_capacity(tmp_path):
+    store = NumpyVectorStore(path=str(tmp_path), dimension=4)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((NumpyVectorStore.MIN_CAPACITY + 10, 4)).tolist()
+    store.add(_record(v, i) for i, v in enumerate(vectors))
+
+    target = len(vectors) - 1
+    best = store.similarity_search(vectors[target], k=1)[0]
+    assert best.metadata.chunk_id == f"c{target}"
+    assert len(store) == len(vectors)
+
+
+def test_batch_and_document_lookups(store, tmp_path):
+    doc = "00000000-0000-0000-0000-0000000000d0"
+    store.add([
+        _record([0.5, 0.5], 5, document_id=doc),
+        _record([0.5, 0.5], 4, document_id=doc),
+    ])
+
+    batch = store.similarity_search_batch([
+        VectorQuery(query_vector=[1.0, 0.0], k=1),
+        VectorQuery(query_vector=[0.0, 1.0], k=1, ingestion_ids=[ING_B]),
+    ])
+    assert [[r.metadata.chunk_id for r in hits] for hits in batch] == [["c0"], ["c2"]]
+
+    chunks = store.get_chunks_by_document_ids([doc], k=1)
+    assert [r.metadata.chunk_id for r in chunks[doc]] == ["c4"]
+
+
+def test_rejects_wrong_dimension(store, tmp_path):
+    with pytest.raises(ValueError):
+        store.add([_record([1.0, 0.0, 0.0], 9)])
+    with pytest.raises(ValueError):
+        NumpyVectorStore(path=str(tmp_path), dimension=3)
+
+
+def test_re_adding_chunks_is_idempotent(tmp_path):
+    store = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    repo = "00000000-0000-0000-0000-0000000000e0"
+    doc = "00000000-0000-0000-0000-0000000000d0"
+    source = {"repo_id": repo, "canonical_id": "pkg/mod.py#f"}
+    first = [_record([1.0, 0.0], i, document_id=doc, **source) for i in range(3)]
+
+    assert store.add(first) == WriteCounts(new=3)
+    assert store.add(first) == WriteCounts(unchanged=3)
+
+    # A later ingestion re-creates the document node: same source, new ids
+    doc_2 = "00000000-0000-0000-0000-0000000000d1"
+    again = [
+        _record([1.0, 0.0], i, ingestion_id=ING_B, document_id=doc_2, **source)
+        for i in range(3)
+    ]
+    changed = again[1]
+    changed.metadata.chunk_text = "rewritten"
+    assert store.add(again + [_record([0.5, 0.5], 3)]) == WriteCounts(
+        new=1, unchanged=2, replaced=1
+    )
+
+    assert len(store) == 4
+    assert store.get_chunks_by_document_id(doc, k=10) == []
+    texts = sorted(
+        r.metadata.chunk_text for r in store.get_chunks_by_document_id(doc_2, k=10)
+    )
+    assert texts == ["rewritten", "text 0", "text 2"]
+    scoped = store.similarity_search([1.0, 0.0], k=10, ingestion_ids=[ING_B])
+    assert len(scoped) == 3
+
+    # The re-pointing survives a reopen (replayed from the log)
+    reopened = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    assert len(reopened.get_chunks_by_document_id(doc_2, k=10)) == 3
+
+
+def test_chunks_without_a_source_are_always_new(tmp_path):
+    store = NumpyVectorStore(path=str(tmp_path), dimension=2)
+    doc = "00000000-0000-0000-0000-0000000000d0"
+    records = [_record([1.0, 0.0], i, document_id=doc) for i in range(2)]
+
+    assert store.add(records) == WriteCounts(new=2)
+    assert store.add(records) == WriteCounts(new=2)
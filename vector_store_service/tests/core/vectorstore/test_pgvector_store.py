@@ -1,25 +1,29 @@
 # tests/core/vectorstore/test_pgvector_store.py
+import hashlib
 from unittest.mock import patch, MagicMock
 import pytest
 
+from src.core.vectorstore.base import Projection
+from src.core.vectorstore.collections import Collection
 from src.core.vectorstore.pgvector_store import PgVectorStore
-from shared.models.vector import VectorRecord, VectorMetadata
+from shared.models.vector import VectorRecord, VectorMetadata, VectorQuery, WriteCounts
 
 
-class TestPgVectorStore:
-    @patch("src.core.vectorstore.pgvector_store.psycopg.connect")
-    def test_add_vectors_calls_execute(self, mock_connect):
-        """Ensure add() calls cursor.execute once per record."""
+def _mock_pool():
+    """A MagicMock ConnectionPool whose connection() yields a mock conn/cursor."""
+    mock_cursor = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_pool = MagicMock()
+    mock_pool.connection.return_value.__enter__.return_value = mock_conn
+    return mock_pool, mock_conn, mock_cursor
 
-        # Setup mocks
-        mock_cursor = MagicMock()
-        mock_conn = MagicMock()
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connect.return_value.__enter__.return_value = mock_conn
 
-        # Patch _validate_table at instantiation to avoid RuntimeError
-        with patch.object(PgVectorStore, "_validate_table", lambda self: None):
-            store = PgVectorStore(dsn="mock_dsn", dimension=1024)
+class TestPgVectorStore:
+    def test_add_vectors_calls_execute(self):
+        """Ensure add() calls cursor.execute once per record."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=1024, pool=mock_pool)
 
         records = [
             VectorRecord(
@@ -45,24 +49,834 @@ class TestPgVectorStore:
         ]
         assert len(insert_calls) == len(records)
 
-    @patch("src.core.vectorstore.pgvector_store.psycopg.connect")
-    def test_delete_by_ingestion_id_calls_execute(self, mock_connect):
-        """Ensure delete_by_ingestion_id executes DELETE SQL."""
+    def test_delete_by_ingestion_id_calls_execute(self):
+        """Ensure delete_by_ingestion_id clears both tables on one connection."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=1024, pool=mock_pool)
+
+        store.delete_by_ingestion_id("ing_123")
 
+        delete_calls = [
+            call for call in mock_cursor.execute.call_args_list
+            if "DELETE FROM" in str(call)
+        ]
+        assert len(delete_calls) == 2
+        assert mock_pool.connection.call_count == 1
+
+    @patch("src.core.vectorstore.pgvector_store.psycopg.connect")
+    def test_without_pool_opens_direct_connection(self, mock_connect):
+        """Stores built without a pool fall back to psycopg.connect."""
         mock_cursor = MagicMock()
         mock_conn = MagicMock()
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value.__enter__.return_value = mock_conn
 
-        with patch.object(PgVectorStore, "_validate_table", lambda self: None):
-            store = PgVectorStore(dsn="mock_dsn", dimension=1024)
+        store = PgVectorStore(dsn="mock_dsn", dimension=1024)
+        store.get_chunks_by_document_id("doc-1", k=2)
 
-        store.delete_by_ingestion_id("ing_123")
+        mock_connect.assert_called_once_with("mock_dsn")
+        mock_cursor.execute.assert_called_once()
 
-        # Only count DELETE statements
-        delete_calls = [
-            call for call in mock_cursor.execute.call_args_list
-            if "DELETE FROM" in str(call)
+    def test_search_borrows_pooled_connection(self):
+        """similarity_search must go through the pool, not psycopg.connect."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        with patch(
+            "src.core.vectorstore.pgvector_store.psycopg.connect"
+        ) as mock_connect:
+            store.similarity_search([0.1, 0.2, 0.3], k=2)
+
+        mock_connect.assert_not_called()
+        mock_pool.connection.assert_called_once()
+
+    def test_pool_stats_reports_usage(self):
+        mock_pool, _, _ = _mock_pool()
+        mock_pool.name = "vector_store"
+        mock_pool.min_size = 2
+        mock_pool.max_size = 10
+        mock_pool.get_stats.return_value = {
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_queued": 2,
+            "requests_wait_ms": 30,
+            "requests_errors": 1,
+        }
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        stats = store.pool_stats()
+
+        assert stats["in_use"] == 3
+        assert stats["wait_ms_avg"] == 15
+        assert stats["timeouts"] == 1
+
+    def test_pool_stats_without_pool(self):
+        store = PgVectorStore(dsn="mock_dsn", dimension=3)
+        assert store.pool_stats() == {"enabled": False}
+
+    def test_add_bulk_copies_both_tables_in_one_transaction(self):
+        """
+        add_bulk streams COPY rows; vector_chunks only gets rows with a document_id.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_copy = MagicMock()
+        mock_cursor.copy.return_value.__enter__.return_value = mock_copy
+        mock_cursor.fetchone.return_value = (0, 0, 2)
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        records = [
+            VectorRecord(
+                vector=[0.1, 0.2],
+                metadata=VectorMetadata(
+                    ingestion_id="00000000-0000-0000-0000-000000000001",
+                    chunk_id=f"c{i}",
+                    chunk_index=i,
+                    chunk_strategy="simple",
+                    chunk_text="text",
+                    document_id=(
+                        "00000000-0000-0000-0000-0000000000d0" if i % 2 else None
+                    ),
+                ),
+            )
+            for i in range(4)
+        ]
+
+        # 2 vectors-only records + 2 merged chunks, all new
+        assert store.add_bulk(records) == WriteCounts(new=4)
+
+        copy_sql = [str(call.args[0]) for call in mock_cursor.copy.call_args_list]
+        assert len(copy_sql) == 2
+        assert all("FORMAT BINARY" in q for q in copy_sql)
+        # 4 rows into vectors + 2 rows (with document_id) into vector_chunks
+        assert mock_copy.write_row.call_count == 6
+        assert mock_pool.connection.call_count == 1
+
+    def test_chunks_only_mode_skips_legacy_vectors_table(self):
+        """
+        chunks_only writes every record to vector_chunks and never touches vectors.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_copy = MagicMock()
+        mock_cursor.copy.return_value.__enter__.return_value = mock_copy
+        mock_cursor.fetchone.return_value = (1, 1, 3)
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, write_mode="chunks_only"
+        )
+
+        records = [
+            VectorRecord(
+                vector=[0.1, 0.2],
+                metadata=VectorMetadata(
+                    ingestion_id="00000000-0000-0000-0000-000000000001",
+                    chunk_id=f"c{i}",
+                    chunk_index=i,
+                    chunk_strategy="simple",
+                    chunk_text="text",
+                    document_id=(
+                        "00000000-0000-0000-0000-0000000000d0" if i % 2 else None
+                    ),
+                ),
+            )
+            for i in range(4)
+        ]
+
+        assert store.add_bulk(records) == WriteCounts(new=2, unchanged=1, replaced=1)
+        copy_sql = [
+            call.args[0].as_string(None) for call in mock_cursor.copy.call_args_list
+        ]
+        assert len(copy_sql) == 1
+        assert '"vector_chunks_incoming"' in copy_sql[0]
+        assert mock_copy.write_row.call_count == 4
+        # No document node → NULL document_id
+        assert mock_copy.write_row.call_args_list[0].args[0][8] is None
+
+        mock_cursor.reset_mock()
+        store.delete_by_ingestion_id("00000000-0000-0000-0000-000000000001")
+        deletes = [
+            call.args[0].as_string(None) for call in mock_cursor.execute.call_args_list
         ]
-        assert len(delete_calls) == 1
+        assert len(deletes) == 1
+        assert '"vector_chunks"' in deletes[0]
+
+    def test_chunk_writes_merge_on_content_key(self):
+        """
+        Chunks are staged, then merged on their source key after stale rows
+        go; a re-sent chunk is re-pointed at the new ingestion / document.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = (1, 0, 0)
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, write_mode="chunks_only"
+        )
+        record = VectorRecord(
+            vector=[0.1, 0.2],
+            metadata=VectorMetadata(
+                ingestion_id="00000000-0000-0000-0000-000000000001",
+                chunk_id="c0", chunk_index=0, chunk_strategy="simple",
+                chunk_text="text", document_id="00000000-0000-0000-0000-0000000000d0",
+                source_metadata={
+                    "repo_id": "00000000-0000-0000-0000-0000000000e0",
+                    "canonical_id": "pkg/mod.py#f",
+                },
+            ),
+        )
+
+        assert store.add([record]) == WriteCounts(unchanged=1)
+
+        statements = [
+            c.args[0].as_string(None) for c in mock_cursor.execute.call_args_list
+        ]
+        assert any(
+            'CREATE TEMP TABLE IF NOT EXISTS "vector_chunks_incoming"'
+            " ON COMMIT DROP" in q
+            for q in statements
+        )
+        merge = " ".join(statements[-1].split())
+        assert "vc.canonical_id = i.canonical_id" in merge
+        assert "vc.content_hash IS DISTINCT FROM i.content_hash" in merge
+        assert (
+            'ON CONFLICT ("repo_id", "canonical_id", "chunk_index", "content_hash") '
+            "DO UPDATE SET ingestion_id = EXCLUDED.ingestion_id" in merge
+        )
+        staged = mock_cursor.executemany.call_args.args[1][0]
+        assert staged[-2] == hashlib.sha256(b"text").hexdigest()
+        assert staged[-1] == "pkg/mod.py#f"
+
+        partitioned = PgVectorStore(dsn="mock_dsn", dimension=2, partitioned=True)
+        assert partitioned._content_key()[0] == "repo_id"
+
+    def test_merge_without_counts_row_raises(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = None
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, write_mode="chunks_only"
+        )
+        record = VectorRecord(
+            vector=[0.1, 0.2],
+            metadata=VectorMetadata(
+                ingestion_id="00000000-0000-0000-0000-000000000001",
+                chunk_id="c0",
+                chunk_index=0,
+                chunk_strategy="simple",
+                chunk_text="text",
+            ),
+        )
+
+        with pytest.raises(RuntimeError):
+            store.add([record])
+
+    def test_export_streams_through_server_side_cursor(self):
+        mock_pool, mock_conn, mock_cursor = _mock_pool()
+        row = (
+            [0.1, 0.2], "00000000-0000-0000-0000-000000000001", "c0", 0, "simple",
+            "text", {}, "mock", None,
+        )
+        mock_cursor.fetchmany.side_effect = [[row, row], [row], []]
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        batches = list(store.export_chunks(
+            repo_id="00000000-0000-0000-0000-0000000000aa", batch_size=2
+        ))
+
+        assert [len(b) for b in batches] == [2, 1]
+        assert mock_conn.cursor.call_args.kwargs == {"name": "vector_chunks_export"}
+        query, params = mock_cursor.execute.call_args.args
+        assert "WHERE repo_id = %s::uuid" in query.as_string(None)
+        assert params == ["00000000-0000-0000-0000-0000000000aa"]
+        mock_cursor.fetchmany.assert_called_with(2)
+
+    def test_rejects_unknown_write_mode(self):
+        with pytest.raises(ValueError, match="write mode"):
+            PgVectorStore(dsn="mock_dsn", dimension=2, write_mode="vectors_only")
+
+    def test_add_bulk_empty_is_noop(self):
+        mock_pool, _, _ = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        assert store.add_bulk([]) == WriteCounts()
+        mock_pool.connection.assert_not_called()
+
+    def test_search_applies_recall_knobs_transaction_locally(self):
+        """ef_search / probes are set with set_config(..., true) before the search."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        store.similarity_search([0.1, 0.2, 0.3], k=2, ef_search=80, probes=5)
+
+        first_sql = mock_cursor.execute.call_args_list[0].args[0].as_string(None)
+        assert "set_config('hnsw.ef_search', '80', true)" in first_sql
+        assert "set_config('ivfflat.probes', '5', true)" in first_sql
+        assert mock_cursor.execute.call_count == 2
+
+    def test_search_without_knobs_runs_single_statement(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        store.similarity_search([0.1, 0.2, 0.3], k=2)
+
+        assert mock_cursor.execute.call_count == 1
+
+    @patch("src.core.vectorstore.pgvector_store.psycopg.connect")
+    def test_build_index_skips_existing_valid_index(self, mock_connect):
+        store = PgVectorStore(dsn="mock_dsn", dimension=3)
+        with patch.object(
+            store, "list_indexes",
+            return_value=[{"name": "vector_chunks_vector_hnsw_idx", "valid": True}],
+        ):
+            result = store.build_index("hnsw")
+
+        assert result["status"] == "exists"
+        mock_connect.assert_not_called()
+
+    @patch("src.core.vectorstore.pgvector_store.psycopg.connect")
+    def test_build_index_rebuild_swaps_in_new_index(self, mock_connect):
+        mock_conn = MagicMock()
+        mock_connect.return_value.__enter__.return_value = mock_conn
+        store = PgVectorStore(dsn="mock_dsn", dimension=3)
+        with patch.object(
+            store, "list_indexes",
+            return_value=[{"name": "vector_chunks_vector_hnsw_idx", "valid": True}],
+        ):
+            result = store.build_index("hnsw", m=32, rebuild=True)
+
+        assert result["status"] == "rebuilt"
+        mock_connect.assert_called_once_with("mock_dsn", autocommit=True)
+        statements = [
+            c.args[0].as_string(None) for c in mock_conn.execute.call_args_list
+        ]
+        assert any(
+            "CREATE INDEX CONCURRENTLY" in q
+            and "vector_chunks_vector_hnsw_idx_new" in q
+            and "m = 32" in q
+            for q in statements
+        )
+        assert "RENAME TO" in statements[-1]
+
+    def test_build_index_rejects_unknown_method(self):
+        store = PgVectorStore(dsn="mock_dsn", dimension=3)
+        with pytest.raises(ValueError):
+            store.build_index("diskann")
+
+    def test_similarity_search_batch_single_round_trip(self):
+        """
+        Queries are grouped by filter into one UNION ALL statement;
+        rows route by query_index.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+
+        def row(query_index, chunk_id, score):
+            return (
+                query_index, None, "ing", chunk_id, 0, "simple", "text",
+                {}, "mock", "doc", score,
+            )
+
+        mock_cursor.fetchall.return_value = [
+            row(0, "a", 0.9), row(1, "b", 0.8), row(2, "c", 0.7), row(2, "d", 0.6),
+        ]
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        results = store.similarity_search_batch([
+            VectorQuery([0.1, 0.2], k=1, metadata_filter={"doc_type": "code"}),
+            VectorQuery([0.1, 0.2], k=1),
+            VectorQuery([0.3, 0.4], k=2),
+        ])
+
+        # the filtered query turns on iterative index scans, then one search
+        assert mock_cursor.execute.call_count == 2
+        first_sql = mock_cursor.execute.call_args_list[0].args[0].as_string(None)
+        assert "set_config('hnsw.iterative_scan', 'strict_order', true)" in first_sql
+        batch_sql, params = mock_cursor.execute.call_args.args
+        rendered = batch_sql.as_string(None)
+        assert rendered.count("CROSS JOIN LATERAL") == 2
+        assert "UNION ALL" in rendered
+        # filtered group: one query; unfiltered group: two queries
+        assert params[0] == [0]
+        assert params[3] == "code"
+        assert params[4] == [1, 2]
+        assert params[5] == ["[0.1,0.2]", "[0.3,0.4]"]
+
+        assert [[r.metadata.chunk_id for r in hits] for hits in results] == [
+            ["a"], ["b"], ["c", "d"],
+        ]
+
+    def test_similarity_search_batch_empty(self):
+        mock_pool, _, _ = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        assert store.similarity_search_batch([]) == []
+        mock_pool.connection.assert_not_called()
+
+    def test_get_chunks_by_document_ids_single_query(self):
+        """
+        Many document_ids are fetched with one ANY() query and grouped by document.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+
+        def row(chunk_id, document_id):
+            return (None, "ing", chunk_id, 0, "simple", "text", {}, "mock", document_id)
+
+        mock_cursor.fetchall.return_value = [
+            row("a1", "doc-a"), row("a2", "doc-a"), row("b1", "doc-b"),
+        ]
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        by_doc = store.get_chunks_by_document_ids(["doc-a", "doc-b", "doc-c"], k=2)
+
+        assert mock_cursor.execute.call_count == 1
+        query, params = mock_cursor.execute.call_args.args
+        rendered = query.as_string(None)
+        assert "ANY(" in rendered and "row_number()" in rendered
+        assert params == (["doc-a", "doc-b", "doc-c"], 2)
+        assert {d: [r.metadata.chunk_id for r in rs] for d, rs in by_doc.items()} == {
+            "doc-a": ["a1", "a2"],
+            "doc-b": ["b1"],
+        }
+
+    def test_hybrid_search_fuses_both_rankings_in_one_statement(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = [
+            (
+                None, "ing", "c1", 0, "simple", "def _resolve_in_scope", {}, "mock",
+                None, 0.032,
+            ),
+        ]
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        results = store.hybrid_search(
+            [0.1, 0.2], "_resolve_in_scope", k=5, lexical_k=20,
+            metadata_filter={"source_type": "code"},
+            projection=Projection.METADATA,
+        )
+
+        # planner estimate for the filter, plan settings, then the search
+        assert mock_cursor.execute.call_count == 3
+        query, params = mock_cursor.execute.call_args.args
+        rendered = query.as_string(None)
+        assert "websearch_to_tsquery('simple'" in rendered
+        assert "vc.chunk_tsv @@ query.tsq" in rendered
+        assert "1.0 / (60 + rank)" in rendered
+        # vector side, then lexical side, each with its own filter values
+        assert params == [
+            [0.1, 0.2], "_resolve_in_scope", "code", 5, "code", 20, 5,
+        ]
+        assert results[0].metadata.score == 0.032
+
+    def test_lexical_search_matches_chunk_tsv(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        store.lexical_search(
+            "PgVectorStore", k=3, repo_id="00000000-0000-0000-0000-0000000000aa"
+        )
+
+        query, params = mock_cursor.execute.call_args.args
+        rendered = query.as_string(None)
+        assert "WHERE vc.chunk_tsv @@ query.tsq AND repo_id = %s::uuid" in rendered
+        assert "ts_rank_cd" in rendered and "<=>" not in rendered
+        assert params == ["PgVectorStore", "00000000-0000-0000-0000-0000000000aa", 3]
+
+    def test_metadata_projection_skips_vector_column(self):
+        """Projection.METADATA selects NULL in place of the embedding."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = [
+            (None, "ing", "c1", 0, "simple", "text", {}, "mock", "doc", 0.9),
+        ]
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        results = store.similarity_search(
+            [0.1, 0.2, 0.3], k=1, projection=Projection.METADATA
+        )
+
+        rendered = mock_cursor.execute.call_args.args[0].as_string(None)
+        assert 'NULL AS "vector"' in rendered
+        assert '"vc"."vector",' not in rendered
+        assert results[0].vector is None
+        assert results[0].metadata.score == 0.9
+
+    def test_vector_projection_skips_payload_columns(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, pool=mock_pool)
+
+        store.get_chunks_by_document_id("doc-1", k=2, projection=Projection.VECTOR)
+
+        rendered = mock_cursor.execute.call_args.args[0].as_string(None)
+        assert '"vector"' in rendered
+        assert 'NULL AS "source_metadata"' in rendered
+        assert '\'\' AS "chunk_text"' in rendered
+
+    def test_scoped_search_uses_indexed_columns(self):
+        """
+        repo_id / ingestion_ids / doc_type filter on real columns, not source_metadata.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        repo_id = "00000000-0000-0000-0000-0000000000aa"
+
+        store.similarity_search(
+            [0.1, 0.2], k=3,
+            metadata_filter={"doc_type": "code", "relative_path": "a.py"},
+            repo_id=repo_id,
+            ingestion_ids=["00000000-0000-0000-0000-000000000001"],
+        )
+
+        query, params = mock_cursor.execute.call_args.args
+        rendered = query.as_string(None)
+        assert 'repo_id = %s::uuid' in rendered
+        assert 'ingestion_id = ANY(%s::uuid[])' in rendered
+        assert '"doc_type" = %s::text' in rendered
+        # other keys go through the GIN-indexed containment operator
+        assert "source_metadata @> %s::jsonb" in rendered
+        assert "source_metadata->>'doc_type'" not in rendered
+        assert params[1:4] == [
+            repo_id, ["00000000-0000-0000-0000-000000000001"], "code",
+        ]
+        assert params[4].obj == {"relative_path": "a.py"}
+
+    def test_add_resolves_repo_id_from_document_nodes(self):
+        """
+        Chunks without source_metadata["repo_id"] take their document node's repo_id.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        repo_id = "00000000-0000-0000-0000-0000000000aa"
+        doc_id = "00000000-0000-0000-0000-0000000000d0"
+        mock_cursor.fetchall.return_value = [(doc_id, repo_id)]
+        mock_cursor.fetchone.return_value = (0, 0, 1)
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        store.add([
+            VectorRecord(
+                vector=[0.1, 0.2],
+                metadata=VectorMetadata(
+                    ingestion_id="ing_1", chunk_id="c1", chunk_index=0,
+                    chunk_strategy="simple", chunk_text="text",
+                    source_metadata={"doc_type": "file"}, document_id=doc_id,
+                ),
+            )
+        ])
+
+        calls = mock_cursor.execute.call_args_list
+        assert "document_nodes" in str(calls[0].args[0])
+        assert calls[0].args[1] == ([doc_id],)
+        chunk_params = mock_cursor.executemany.call_args.args[1][0]
+        assert str(chunk_params[-3]) == repo_id
+
+    def test_partitioned_add_creates_repo_partition_before_write(self):
+        """
+        Partitioned layout: missing repo partitions are created in their own
+        transaction.
+        """
+        mock_pool, _, mock_cursor = _mock_pool()
+        repo_id = "00000000-0000-0000-0000-0000000000aa"
+        mock_cursor.fetchone.return_value = (0, 0, 1)
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, partitioned=True
+        )
+
+        store.add([
+            VectorRecord(
+                vector=[0.1, 0.2],
+                metadata=VectorMetadata(
+                    ingestion_id="ing_1", chunk_id="c1", chunk_index=0,
+                    chunk_strategy="simple", chunk_text="text",
+                    source_metadata={"repo_id": repo_id},
+                    document_id="00000000-0000-0000-0000-0000000000d0",
+                ),
+            )
+        ])
+
+        first = mock_cursor.execute.call_args_list[0].args[0].as_string(None)
+        assert "PARTITION OF" in first
+        assert "vector_chunks_r_000000000000000000000000000000aa" in first
+        assert mock_pool.connection.call_count == 2
+
+    def test_delete_by_repo_id_drops_partition_when_partitioned(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        repo_id = "00000000-0000-0000-0000-0000000000aa"
+
+        partitioned = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, partitioned=True
+        )
+        assert partitioned.delete_by_repo_id(repo_id)["mode"] == "drop_partition"
+        dropped = mock_cursor.execute.call_args.args[0].as_string(None)
+        assert "DROP TABLE IF EXISTS" in dropped
+
+        plain = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+        assert plain.delete_by_repo_id(repo_id)["mode"] == "delete"
+        query, params = mock_cursor.execute.call_args.args
+        assert "DELETE FROM" in query.as_string(None)
+        assert params == (repo_id,)
+
+    def test_partitioned_index_plan_builds_per_partition(self):
+        store = PgVectorStore(dsn="mock_dsn", dimension=3, partitioned=True)
+        status, statements = store._index_build_plan(
+            "hnsw", None, m=16, ef_construction=64, lists=100, rebuild=False,
+            maintenance_work_mem=None, partitions=["vector_chunks_default"],
+        )
+        rendered = [s.as_string(None) for s in statements]
+
+        assert status == "created"
+        assert "ON ONLY" in rendered[0]
+        assert any(
+            "CREATE INDEX CONCURRENTLY" in q and '"vector_chunks_default_hnsw_idx"' in q
+            for q in rendered
+        )
+        assert "ATTACH PARTITION" in rendered[-1]
+
+    def test_halfvec_search_reranks_quantized_candidates(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=3, pool=mock_pool,
+            quantization="halfvec", rerank_factor=5,
+        )
+
+        store.similarity_search(
+            [0.1, 0.2, 0.3], k=10, metadata_filter={"source_type": "code"}
+        )
+
+        query, params = mock_cursor.execute.call_args.args
+        rendered = " ".join(query.as_string(None).split())
+        # candidates: filtered, ordered on the expression index, k * factor
+        assert (
+            'ORDER BY (c.vector::halfvec(3)) <=> (query.qvec::halfvec(3)) LIMIT 10 * 5'
+            in rendered
+        )
+        # rerank: exact float32 distance over those candidates
+        assert rendered.endswith("ORDER BY vc.vector <=> query.qvec LIMIT %s")
+        assert params == [[0.1, 0.2, 0.3], "code", 10]
+
+    def test_binary_quantization_index_and_batch_candidates(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=3, pool=mock_pool, quantization="binary"
+        )
+
+        status, statements = store._index_build_plan(
+            "hnsw", None, m=16, ef_construction=64, lists=100, rebuild=False,
+            maintenance_work_mem=None,
+        )
+        rendered = statements[0].as_string(None)
+        assert store.ann_index_name("hnsw") == "vector_chunks_binary_hnsw_idx"
+        assert (
+            "USING hnsw ((binary_quantize(vector)::bit(3)) bit_hamming_ops)" in rendered
+        )
+
+        store.similarity_search_batch([VectorQuery(query_vector=[1.0, 0.0, 0.0], k=2)])
+        batch = mock_cursor.execute.call_args.args[0].as_string(None)
+        assert "<~> (binary_quantize(q.qvec)::bit(3))" in batch
+        assert "LIMIT q.k * 4" in batch
+
+    @pytest.mark.parametrize("plan_rows, expected", [
+        (500, "set_config('hnsw.ef_search', '1000', true)"),
+        (50000, "set_config('hnsw.iterative_scan', 'strict_order', true)"),
+    ])
+    def test_auto_filter_strategy_follows_planner_estimate(self, plan_rows, expected):
+        """Selective filters are applied first; broad ones during the ANN scan."""
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = ([{"Plan": {"Plan Rows": plan_rows}}],)
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, prefilter_max_rows=1000
+        )
+
+        store.similarity_search(
+            [0.1, 0.2], k=3, metadata_filter={"relative_path": {"prefix": "src/"}}
+        )
+
+        statements = [
+            c.args[0].as_string(None) for c in mock_cursor.execute.call_args_list
+        ]
+        assert statements[0].startswith("EXPLAIN (FORMAT JSON) SELECT 1 FROM")
+        assert "source_metadata->>'relative_path' LIKE %s" in statements[0]
+        assert expected in statements[1]
+        assert len(statements) == 3
+
+    def test_auto_filter_plan_kept_per_filter_shape(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = ([{"Plan": {"Plan Rows": 50}}],)
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "main"})
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "other"})
+        store.similarity_search(
+            [0.1, 0.2], k=3, metadata_filter={"symbol": {"ne": "x"}}
+        )
+
+        statements = [
+            c.args[0].as_string(None) for c in mock_cursor.execute.call_args_list
+        ]
+        explains = [s for s in statements if s.startswith("EXPLAIN")]
+        # symbol:eq is estimated once, symbol:ne is a new shape
+        assert len(explains) == 2
+        assert "source_metadata IS NULL OR NOT" in explains[1]
+
+    def test_query_cache_is_off_by_default(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(dsn="mock_dsn", dimension=2, pool=mock_pool)
+
+        store.similarity_search([0.1, 0.2], k=3)
+        store.similarity_search([0.1, 0.2], k=3)
+
+        assert mock_cursor.execute.call_count == 2
+        assert store.query_cache_stats()["enabled"] is False
+
+    def test_fixed_filter_strategy_skips_estimate(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, filter_strategy="prefilter"
+        )
+
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "main"})
+
+        statements = [
+            c.args[0].as_string(None) for c in mock_cursor.execute.call_args_list
+        ]
+        assert len(statements) == 2
+        assert (
+            "set_config('hnsw.iterative_scan', 'strict_order', true)" in statements[0]
+        )
+        assert "enable_indexscan" not in statements[0]
+        with pytest.raises(ValueError, match="filter strategy"):
+            PgVectorStore(dsn="mock_dsn", dimension=2, filter_strategy="sometimes")
+
+    def test_similarity_search_latency_by_filter_shape(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, filter_strategy="prefilter"
+        )
+
+        store.similarity_search([0.1, 0.2], k=3)
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "main"})
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "other"})
+
+        latency = store.latency_stats()["similarity_search"]
+        assert latency["unfiltered"]["count"] == 1
+        assert latency["symbol:eq [prefilter]"]["count"] == 2
+        assert set(latency["unfiltered"]) >= {"p50_ms", "p95_ms", "p99_ms"}
+
+    def test_repeated_search_served_from_cache_until_write(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.return_value = []
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, query_cache_size=16
+        )
+
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "main"})
+        calls = mock_cursor.execute.call_count
+        store.similarity_search([0.2, 0.4], k=3, metadata_filter={"symbol": "main"})
+        assert mock_cursor.execute.call_count == calls
+
+        store.delete_by_ingestion_id("ing_1")
+        mock_cursor.execute.reset_mock()
+        store.similarity_search([0.1, 0.2], k=3, metadata_filter={"symbol": "main"})
+        # searched again, without a new EXPLAIN: the shape's plan is kept
+        assert mock_cursor.execute.call_count == calls - 1
+
+        stats = store.query_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["generation"]) == (1, 2, 1)
+
+    def test_table_stats_reports_tables_indexes_and_repos(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.side_effect = [
+            [("vector_chunks", 90, 10, 8192, 3, 300, 40, None)],
+            [(
+                "vector_chunks_vector_hnsw_idx", "vector_chunks", "hnsw", True, 4096, 40
+            )],
+            [("00000000-0000-0000-0000-0000000000aa", 60), (None, 30)],
+        ]
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, write_mode="chunks_only"
+        )
+
+        stats = store.table_stats()
+
+        assert stats["tables"][0]["dead_ratio"] == 0.1
+        assert stats["tables"][0]["seq_scans"] == 3
+        assert stats["indexes"][0]["method"] == "hnsw"
+        assert stats["repos"] == [
+            {"repo_id": "00000000-0000-0000-0000-0000000000aa", "rows": 60},
+            {"repo_id": None, "rows": 30},
+        ]
+        assert stats["repo_counts"] == "estimate"
+        calls = mock_cursor.execute.call_args_list
+        assert calls[0].args[1]["tables"] == ["vector_chunks"]
+        # per-repo rows come from the planner statistics, not a count(*)
+        assert "pg_stats" in calls[2].args[0]
+        assert "count(*)" not in calls[2].args[0]
+
+    def test_table_stats_counts_repos_exactly_on_request(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchall.side_effect = [[], [], [(None, 30)]]
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=2, pool=mock_pool, write_mode="chunks_only"
+        )
+
+        stats = store.table_stats(exact_repo_counts=True)
+
+        assert stats["repos"] == [{"repo_id": None, "rows": 30}]
+        assert stats["repo_counts"] == "exact"
+        query = mock_cursor.execute.call_args_list[2].args[0].as_string(None)
+        assert "count(*)" in query and "GROUP BY repo_id" in query
+
+    def test_collection_store_uses_its_own_table(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=384, pool=mock_pool, write_mode="chunks_only",
+            collection=Collection("minilm", "ollama", "all-minilm", 384),
+        )
+
+        store.similarity_search([0.1] * 384, k=3)
+
+        query = mock_cursor.execute.call_args_list[-1].args[0].as_string(None)
+        assert '"ingestion_service"."vector_chunks_c_minilm"' in query
+        assert store.ann_index_name("hnsw") == "vector_chunks_c_minilm_vector_hnsw_idx"
+
+    def test_ensure_collection_creates_and_registers_table(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = (False,)
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=384, pool=mock_pool, write_mode="chunks_only",
+            collection=Collection("minilm", "ollama", "all-minilm", 384),
+        )
+
+        assert store.ensure_collection() is True
+
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        ddl = [s.as_string(None) for s in statements if not isinstance(s, str)]
+        assert any(
+            'CREATE TABLE IF NOT EXISTS "ingestion_service".'
+            '"vector_chunks_c_minilm"' in q
+            and "LIKE" in q for q in ddl
+        )
+        assert any("ALTER COLUMN vector TYPE vector(384)" in q for q in ddl)
+        assert any(
+            '"uq_vector_chunks_c_minilm_content"' in q
+            and '("repo_id", "canonical_id", "chunk_index", "content_hash")' in q
+            for q in ddl
+        )
+        assert mock_cursor.execute.call_args_list[-1].args[1] == (
+            "minilm", "ollama", "all-minilm", 384, "vector_chunks_c_minilm"
+        )
+
+    def test_ensure_collection_skips_existing_and_default(self):
+        mock_pool, _, mock_cursor = _mock_pool()
+        mock_cursor.fetchone.return_value = (True,)
+        store = PgVectorStore(
+            dsn="mock_dsn", dimension=384, pool=mock_pool,
+            collection=Collection("minilm", "ollama", "all-minilm", 384),
+        )
+        default = PgVectorStore(dsn="mock_dsn", dimension=1024, pool=mock_pool)
+
+        assert store.ensure_collection() is False
+        assert default.ensure_collection() is False
+        assert mock_cursor.execute.call_count == 1   # the existence check only
 
+    def test_rejects_unknown_quantization(self):
+        with pytest.raises(ValueError, match="quantization"):
+            PgVectorStore(dsn="mock_dsn", dimension=3, quantization="int8")
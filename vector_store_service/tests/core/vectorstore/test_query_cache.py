@@ -0,0 +1,64 @@
+# tests/core/vectorstore/test_query_cache.py
+from unittest.mock import patch
+
+import pytest
+
+from src.core.vectorstore.query_cache import QueryCache
+from shared.models.vector import VectorMetadata, VectorRecord
+
+pytestmark = pytest.mark.unit
+
+
+def _record(chunk_id="c1"):
+    return VectorRecord(
+        vector=[0.6, 0.8],
+        metadata=VectorMetadata(
+            ingestion_id="ing_1",
+            chunk_id=chunk_id,
+            chunk_index=0,
+            chunk_strategy="paragraph",
+            chunk_text="text",
+            source_metadata={},
+            provider="mock",
+            score=0.9,
+        ),
+    )
+
+
+def test_key_ignores_norm_and_filter_key_order():
+    key = QueryCache.key([0.3, 0.4], 5, metadata_filter={"a": 1, "b": 2})
+
+    assert QueryCache.key([0.6, 0.8], 5, metadata_filter={"b": 2, "a": 1}) == key
+    assert QueryCache.key([0.6, 0.8], 6, metadata_filter={"a": 1, "b": 2}) != key
+    assert QueryCache.key([0.8, 0.6], 5, metadata_filter={"a": 1, "b": 2}) != key
+
+
+def test_lru_eviction_ttl_expiry_and_copies():
+    cache = QueryCache(max_entries=2, ttl_seconds=10.0)
+    with patch("src.core.vectorstore.query_cache.time.monotonic", return_value=0.0):
+        cache.put("a", [_record()], cache.generation)
+        cache.put("b", [_record()], cache.generation)
+        cache.get("a")[0].vector = None        # callers may modify results
+        cache.put("c", [_record()], cache.generation)   # evicts b
+
+        assert cache.get("a")[0].vector == [0.6, 0.8]
+        assert cache.get("b") is None
+    with patch("src.core.vectorstore.query_cache.time.monotonic", return_value=11.0):
+        assert cache.get("c") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert (stats["evictions"], stats["expired"], stats["entries"]) == (1, 1, 1)
+
+
+def test_invalidate_drops_entries_and_stale_puts():
+    cache = QueryCache()
+    generation = cache.generation
+    cache.put("a", [_record()], generation)
+
+    cache.invalidate()
+    cache.put("b", [_record()], generation)     # search started before the write
+
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.stats()["generation"] == generation + 1
+    assert QueryCache(max_entries=0).stats()["enabled"] is False